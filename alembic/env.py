@@ -4,6 +4,7 @@ from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 from src.database.config import settings
+from src.database.migration_helpers import set_lock_timeout
 from src.database.models import Base
 
 # this is the Alembic Config object, which provides
@@ -68,7 +69,19 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # Миграция не должна ждать блокировку таблицы дольше лимита, иначе за ней
+        # выстраиваются запросы приложения
+        set_lock_timeout(connection, settings.MIGRATION_LOCK_TIMEOUT_MS)
+        connection.commit()
+
+        # Каждая миграция - своя транзакция, чтобы блокировки не копились, а
+        # операции вне транзакции (CREATE INDEX CONCURRENTLY) не фиксировали
+        # половину следующей миграции
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,45 @@
+"""Rebuild students with AUTOINCREMENT on SQLite
+
+Revision ID: f2a6c8d4b1e7
+Revises: d7b3f0a9e214
+Create Date: 2026-10-20 16:05:12.904417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a6c8d4b1e7"
+down_revision: Union[str, None] = "d7b3f0a9e214"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Без AUTOINCREMENT SQLite выдает MAX(id) + 1 и повторно использует ID
+    # студентов, перенесенных в архив. Postgres выдает ID последовательностью,
+    # которая значения не повторяет, поэтому миграция нужна только для SQLite
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "students",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": True},
+    ):
+        pass
+    # Счетчик AUTOINCREMENT начинается после всех занятых ID, включая архив
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'students'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'students', MAX("
+        "(SELECT COALESCE(MAX(id), 0) FROM students), "
+        "(SELECT COALESCE(MAX(id), 0) FROM students_archive))"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table("students", recreate="always"):
+        pass
@@ -0,0 +1,127 @@
+"""
+Сравнение форматов ответа списка студентов.
+
+Строит страницу синтетических студентов (тем же генератором, что и src.seed) в
+виде строк запроса и измеряет размер ответа (без сжатия и в gzip) и время
+кодирования для обычного JSON (ResponseStudentsWithPaginationSchema),
+колоночного JSON и MessagePack (если установлен пакет msgpack).
+
+Пример запуска:
+
+    python -m benchmarks.formats --students 50000
+"""
+
+import argparse
+import gzip
+import time
+from datetime import date
+from statistics import median
+from typing import Callable, Dict, List
+
+from src.database.models import StudentStatus
+from src.database.repository import STUDENT_LIST_COLUMNS
+from src.formats import (
+    COLUMNAR_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    StudentRows,
+    available_media_types,
+    encode_students,
+)
+from src.schemas.student_schemas import (
+    GetStudentSchema,
+    ResponseStudentsWithPaginationSchema,
+)
+from src.seed import SeedPlan, faculty_names, generate_chunk
+
+
+def build(students: int, faculties: int, seed: int) -> StudentRows:
+    """Строит страницу синтетических студентов в виде строк запроса."""
+    plan = SeedPlan(
+        seed=seed,
+        students=students,
+        chunk_size=100_000,
+        first_id=1,
+        faculty_ids=tuple(range(1, faculties + 1)),
+        zipf_exponent=1.1,
+        reference_date=date(2026, 9, 1),
+    )
+    titles = dict(zip(plan.faculty_ids, faculty_names(faculties, seed)))
+    rows = [
+        (
+            first_name,
+            last_name,
+            date_of_birth,
+            StudentStatus(status),
+            faculty_id,
+            student_id,
+            titles.get(faculty_id) if faculty_id is not None else None,
+        )
+        for chunk in range(plan.chunks)
+        for student_id, first_name, last_name, date_of_birth, status, faculty_id, _ in (
+            generate_chunk(plan, chunk)
+        )
+    ]
+    return StudentRows(
+        total=students,
+        page=1,
+        limit=students,
+        fields=STUDENT_LIST_COLUMNS,
+        rows=rows,
+    )
+
+
+def encode_schema(page: StudentRows) -> bytes:
+    """Текущий путь: модели pydantic из строк и model_dump_json."""
+    return (
+        ResponseStudentsWithPaginationSchema(
+            total=page.total,
+            page=page.page,
+            limit=page.limit,
+            students=[
+                GetStudentSchema.model_validate(dict(zip(page.fields, row)))
+                for row in page.rows
+            ],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def measure(encode: Callable[[], bytes], repeat: int) -> float:
+    """Медианное время кодирования в миллисекундах."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        timings.append((time.perf_counter() - started) * 1000)
+    return median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--faculties", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    page = build(args.students, args.faculties, args.seed)
+    encoders: Dict[str, Callable[[], bytes]] = {
+        "JSON (схема)": lambda: encode_schema(page),
+        "колоночный JSON": lambda: encode_students(page, COLUMNAR_MEDIA_TYPE),
+    }
+    if MSGPACK_MEDIA_TYPE in available_media_types():
+        encoders["MessagePack"] = lambda: encode_students(page, MSGPACK_MEDIA_TYPE)
+
+    print(f"Студентов: {len(page.rows)}")
+    for name, encode in encoders.items():
+        body = encode()
+        print(
+            f"{name}: {len(body) / 1024:.0f} КиБ, "
+            f"gzip {len(gzip.compress(body)) / 1024:.0f} КиБ, "
+            f"{measure(encode, args.repeat):.1f} мс"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Замер памяти и скорости колоночного хранилища студентов.
+
+Заполняет хранилище синтетическими студентами (тем же генератором, что и
+src.seed) и измеряет объем памяти на строку и время подсчета с выбором
+страницы для типичных фильтров.
+
+Пример запуска:
+
+    python -m benchmarks.read_model --students 1000000
+"""
+
+import argparse
+import time
+from datetime import date
+from statistics import median
+from typing import Any, Dict, List
+
+from src.database.read_model import StudentReadModel
+from src.schemas.student_schemas import StudentStatusEnum
+from src.seed import SeedPlan, generate_chunk
+
+# Фильтры, для которых измеряется время
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "без фильтров": {},
+    "факультет": {"faculty_id": 3},
+    "статус": {"study_status": StudentStatusEnum.academic_leave},
+    "фамилия": {"last_name": "Орлов"},
+    "факультет + статус + дата": {
+        "faculty_id": 1,
+        "study_status": StudentStatusEnum.active,
+        "date_of_birth": date(2005, 1, 1),
+    },
+    "глубокая страница": {"page": 5000},
+}
+
+
+def build(students: int, faculties: int, seed: int) -> StudentReadModel:
+    """Заполняет хранилище синтетическими студентами."""
+    plan = SeedPlan(
+        seed=seed,
+        students=students,
+        chunk_size=100_000,
+        first_id=1,
+        faculty_ids=tuple(range(1, faculties + 1)),
+        zipf_exponent=1.1,
+        reference_date=date(2026, 9, 1),
+    )
+    model = StudentReadModel()
+    model.set_faculties(
+        {faculty_id: f"Факультет {faculty_id}" for faculty_id in plan.faculty_ids}
+    )
+    for chunk in range(plan.chunks):
+        model.extend(
+            {
+                "id": row[0],
+                "first_name": row[1],
+                "last_name": row[2],
+                "date_of_birth": row[3],
+                "study_status": row[4],
+                "faculty_id": row[5],
+            }
+            for row in generate_chunk(plan, chunk)
+        )
+    model.ready = True
+    return model
+
+
+def measure(model: StudentReadModel, filters: Dict[str, Any], repeat: int) -> float:
+    """Медианное время подсчета и выбора страницы в миллисекундах."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        page = model.get_students({"page": 1, "limit": 10, **filters})
+        assert page is not None
+        timings.append((time.perf_counter() - started) * 1000)
+    return median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--faculties", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    model = build(args.students, args.faculties, args.seed)
+    print(f"Загрузка: {time.perf_counter() - started:.2f} с, {len(model)} строк")
+    print(
+        f"Память: {model.nbytes() / 2**20:.1f} МиБ, "
+        f"{model.nbytes() / len(model):.1f} байт на строку"
+    )
+    for name, filters in SCENARIOS.items():
+        print(f"{name}: {measure(model, filters, args.repeat):.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
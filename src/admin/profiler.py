@@ -0,0 +1,243 @@
+import asyncio
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Optional, Set
+
+from src.log_config import log_folder_path
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProfileCapture:
+    """
+    Сеанс профилирования: какие запросы профилируются и накопленные стеки.
+
+    Сеанс завершается, когда отработали requests запросов или истекло время
+    until, и в этот момент не осталось профилируемых запросов в обработке.
+    """
+
+    route: Optional[str]
+    requests: Optional[int]
+    until: float
+    interval: float
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    claimed: int = 0
+    completed: int = 0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    output: Optional[Path] = None
+
+    def accepts(self, route: Optional[str]) -> bool:
+        """
+        Проверяет, нужно ли профилировать очередной запрос маршрута.
+
+        :param route: Ключ маршрута вида "GET /api/v1/students/".
+        :return: True, если запрос входит в сеанс.
+        """
+        if self.route is not None and route != self.route:
+            return False
+        if self.requests is not None and self.claimed >= self.requests:
+            return False
+        return time.monotonic() < self.until
+
+    def exhausted(self) -> bool:
+        """Больше ни один запрос не будет принят в сеанс."""
+        return time.monotonic() >= self.until or (
+            self.requests is not None and self.claimed >= self.requests
+        )
+
+
+class SamplingProfiler:
+    """
+    Выборочный профилировщик запросов для работающего приложения.
+
+    Пока идет сеанс, отдельный поток с заданным интервалом снимает стек потока
+    цикла событий. Стек учитывается, только если цикл в этот момент выполняет
+    задачу профилируемого запроса, поэтому время ожидания ответа БД и работа
+    других запросов в результат не попадают. Результат сохраняется в папку logs
+    в формате collapsed stacks, который открывают speedscope и flamegraph.pl.
+    Пока цикл занят вычислениями, поток профилировщика получает GIL не чаще
+    sys.getswitchinterval() (5 мс по умолчанию), поэтому меньший интервал
+    снимков не дает большей точности.
+
+    Вне сеанса профилировщик не делает ничего, а middleware проверяет только
+    наличие сеанса.
+    """
+
+    def __init__(self, output_dir: Path = log_folder_path) -> None:
+        self.output_dir = output_dir
+        self.capture: Optional[ProfileCapture] = None
+        self.last_capture: Optional[ProfileCapture] = None
+        self._tasks: Set["asyncio.Task[object]"] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def start(
+        self,
+        route: Optional[str],
+        requests: Optional[int],
+        seconds: float,
+        interval_ms: float,
+    ) -> ProfileCapture:
+        """
+        Начинает сеанс профилирования. Текущий сеанс, если он есть, завершается.
+
+        :param route: Ключ маршрута или None для всех маршрутов.
+        :param requests: Количество профилируемых запросов или None.
+        :param seconds: Максимальная длительность сеанса в секундах.
+        :param interval_ms: Интервал между снимками стека в миллисекундах.
+        :return: Новый сеанс.
+        """
+        self.stop()
+        capture = ProfileCapture(
+            route=route,
+            requests=requests,
+            until=time.monotonic() + seconds,
+            interval=interval_ms / 1000,
+        )
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self.capture = capture
+        self._thread = threading.Thread(
+            target=self._sample, args=(capture,), name="profiler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Профилирование запущено: %s", route or "все маршруты")
+        return capture
+
+    def stop(self) -> Optional[ProfileCapture]:
+        """
+        Завершает текущий сеанс и сохраняет результат.
+
+        :return: Завершенный сеанс или None, если сеанса не было.
+        """
+        capture = self.capture
+        if capture is None:
+            return None
+        capture.until = 0
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        return capture
+
+    def enter(self, route: Optional[str]) -> bool:
+        """
+        Принимает запрос в сеанс, если он подходит. Вызывается из задачи запроса.
+
+        :param route: Ключ маршрута запроса.
+        :return: True, если запрос профилируется и нужно вызвать leave.
+        """
+        capture = self.capture
+        if capture is None:
+            return False
+        with self._lock:
+            if not capture.accepts(route):
+                return False
+            capture.claimed += 1
+            task = asyncio.current_task()
+            if task is not None:
+                self._tasks.add(task)
+        return True
+
+    def leave(self) -> None:
+        """
+        Отмечает завершение профилируемого запроса.
+        """
+        capture = self.capture
+        with self._lock:
+            self._tasks.discard(asyncio.current_task())  # type: ignore[arg-type]
+            if capture is not None:
+                capture.completed += 1
+
+    def _sample(self, capture: ProfileCapture) -> None:
+        """Цикл потока профилировщика: снимает стеки до конца сеанса."""
+        loop, thread_id = self._loop, self._loop_thread_id
+        assert loop is not None and thread_id is not None
+        while True:
+            time.sleep(capture.interval)
+            with self._lock:
+                if capture.until == 0 or (capture.exhausted() and not self._tasks):
+                    break
+                task = asyncio.current_task(loop)
+                frame = sys._current_frames().get(thread_id)
+                if task is None or task not in self._tasks or frame is None:
+                    continue
+            capture.stacks[_collapse(frame)] += 1
+            capture.samples += 1
+        self._finish(capture)
+
+    def _finish(self, capture: ProfileCapture) -> None:
+        """Сохраняет результат сеанса и освобождает профилировщик."""
+        capture.output = self._write(capture)
+        with self._lock:
+            self._tasks.clear()
+            if self.capture is capture:
+                self.capture = None
+            self.last_capture = capture
+        logger.info(
+            "Профилирование завершено: %s запросов, %s снимков, %s",
+            capture.completed,
+            capture.samples,
+            capture.output,
+        )
+
+    def _write(self, capture: ProfileCapture) -> Path:
+        """Записывает стеки в формате collapsed stacks."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", capture.route or "all").strip("_")
+        stamp = capture.started_at.strftime("%Y%m%dT%H%M%S")
+        path = self.output_dir / f"profile_{stamp}_{slug}.collapsed"
+        with path.open("w") as output:
+            for stack, count in capture.stacks.most_common():
+                output.write(f"{stack} {count}\n")
+        return path
+
+    def status(self) -> Dict[str, object]:
+        """
+        Возвращает состояние текущего или последнего сеанса.
+        """
+        capture = self.capture or self.last_capture
+        if capture is None:
+            return {"active": False}
+        return {
+            "active": capture is self.capture,
+            "route": capture.route,
+            "requests": capture.requests,
+            "started_at": capture.started_at,
+            "profiled_requests": capture.completed,
+            "samples": capture.samples,
+            "output": str(capture.output) if capture.output else None,
+        }
+
+
+def _collapse(frame: FrameType) -> str:
+    """
+    Сворачивает стек в строку "корень;...;вершина" формата collapsed stacks.
+    Кадр обозначается функцией и строкой ее начала, чтобы вызовы из разных
+    строк одной функции объединялись в flamegraph.
+
+    :param frame: Верхний кадр стека.
+    :return: Кадры от корня к вершине через точку с запятой.
+    """
+    names = []
+    current: Optional[FrameType] = frame
+    while current is not None:
+        code = current.f_code
+        filename = code.co_filename.rsplit("/", 1)[-1]
+        names.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+        current = current.f_back
+    return ";".join(reversed(names))
+
+
+# Профилировщик приложения (сеансы запускаются через API администратора)
+profiler = SamplingProfiler()
@@ -0,0 +1,195 @@
+import hmac
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, status
+
+from src.admin.profiler import profiler
+from src.database.config import settings
+from src.database.fragment_cache import fragment_cache
+from src.database.slow_queries import slow_query_log
+from src.database.statement_cache import statement_cache
+from src.database.student_cache import student_cache
+from src.handlers.custom_exceptions import (
+    AdminAccessDeniedException,
+    RowNotFoundException,
+)
+from src.schemas.admin_schemas import (
+    ProfilingStatusSchema,
+    SlowQuerySchema,
+    StartProfilingSchema,
+)
+
+
+async def require_admin_token(
+    x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token")
+) -> None:
+    """Проверка токена администратора"""
+    if not settings.ADMIN_TOKEN or not hmac.compare_digest(
+        (x_admin_token or "").encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise AdminAccessDeniedException()
+
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["Администрирование"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+@router.post(
+    "/profiling",
+    response_model=ProfilingStatusSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Запустить профилирование запросов",
+    description=(
+        "Включает выборочное профилирование следующих запросов маршрута или всех "
+        "запросов в течение заданного времени. Результат сохраняется в папку logs "
+        "в формате collapsed stacks (speedscope, flamegraph)."
+    ),
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Профилирование запущено",
+            "model": ProfilingStatusSchema,
+        },
+        status.HTTP_403_FORBIDDEN: {"description": "Доступ запрещен!"},
+        status.HTTP_404_NOT_FOUND: {"description": "Маршрут не найден!"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+    },
+)
+async def start_profiling(
+    request: Request, params: StartProfilingSchema
+) -> ProfilingStatusSchema:
+    """Запуск профилирования"""
+    if params.route is not None:
+        routes = {
+            f"{method} {route.path}"
+            for route in request.app.router.routes
+            for method in getattr(route, "methods", None) or ()
+        }
+        if params.route not in routes:
+            raise RowNotFoundException("Маршрут не найден!")
+    profiler.start(params.route, params.requests, params.seconds, params.interval_ms)
+    return ProfilingStatusSchema.model_validate(profiler.status())
+
+
+@router.get(
+    "/profiling",
+    response_model=ProfilingStatusSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Получить состояние профилирования",
+    description="Возвращает состояние текущего или последнего сеанса профилирования.",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Состояние профилирования",
+            "model": ProfilingStatusSchema,
+        },
+        status.HTTP_403_FORBIDDEN: {"description": "Доступ запрещен!"},
+    },
+)
+async def get_profiling_status() -> ProfilingStatusSchema:
+    """Состояние профилирования"""
+    return ProfilingStatusSchema.model_validate(profiler.status())
+
+
+@router.delete(
+    "/profiling",
+    response_model=ProfilingStatusSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Остановить профилирование",
+    description="Завершает текущий сеанс профилирования и сохраняет результат.",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Профилирование остановлено",
+            "model": ProfilingStatusSchema,
+        },
+        status.HTTP_403_FORBIDDEN: {"description": "Доступ запрещен!"},
+    },
+)
+async def stop_profiling() -> ProfilingStatusSchema:
+    """Остановка профилирования"""
+    profiler.stop()
+    return ProfilingStatusSchema.model_validate(profiler.status())
+
+
+@router.get(
+    "/slow-queries",
+    response_model=List[SlowQuerySchema],
+    status_code=status.HTTP_200_OK,
+    summary="Получить самые медленные запросы к БД",
+    description=(
+        "Возвращает отпечатки запросов, выполнявшихся дольше SLOW_QUERY_MS, "
+        "по убыванию максимальной длительности."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Статистика медленных запросов",
+            "model": List[SlowQuerySchema],
+        },
+        status.HTTP_403_FORBIDDEN: {"description": "Доступ запрещен!"},
+    },
+)
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=500, description="Количество запросов"),
+) -> List[SlowQuerySchema]:
+    """Самые медленные запросы"""
+    return [
+        SlowQuerySchema.model_validate(query.to_dict())
+        for query in slow_query_log.top(limit)
+    ]
+
+
+@router.post(
+    "/slow-queries/{fingerprint}/explain",
+    response_model=SlowQuerySchema,
+    status_code=status.HTTP_200_OK,
+    summary="Получить план медленного запроса",
+    description=(
+        "Выполняет EXPLAIN для запроса с параметрами самого медленного выполнения. "
+        "С analyze=true запрос SELECT выполняется (EXPLAIN ANALYZE в PostgreSQL), "
+        "транзакция откатывается."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "План запроса получен",
+            "model": SlowQuerySchema,
+        },
+        status.HTTP_403_FORBIDDEN: {"description": "Доступ запрещен!"},
+        status.HTTP_404_NOT_FOUND: {"description": "Запрашиваемая запись не найдена!"},
+    },
+)
+async def explain_slow_query(
+    fingerprint: str = Path(..., description="Отпечаток запроса"),
+    analyze: bool = Query(False, description="Выполнить запрос (EXPLAIN ANALYZE)"),
+) -> SlowQuerySchema:
+    """План медленного запроса"""
+    query = slow_query_log.get(fingerprint)
+    if query is None:
+        raise RowNotFoundException()
+    await slow_query_log.explain(query, analyze)
+    return SlowQuerySchema.model_validate(query.to_dict())
+
+
+@router.get(
+    "/caches",
+    response_model=Dict[str, Dict[str, float]],
+    status_code=status.HTTP_200_OK,
+    summary="Получить статистику кэшей",
+    description=(
+        "Возвращает размер и счетчики попаданий и промахов кэша студентов, "
+        "кэша фрагментов JSON списка студентов и кэша запросов репозитория."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "Статистика кэшей"},
+        status.HTTP_403_FORBIDDEN: {"description": "Доступ запрещен!"},
+    },
+)
+async def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Статистика кэшей"""
+    return {
+        "students": student_cache.stats(),
+        "fragments": fragment_cache.stats(),
+        "statements": statement_cache.stats(),
+    }
@@ -0,0 +1,457 @@
+import asyncio
+import json
+from collections import deque
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from src.database.config import settings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Ключ в session.info, под которым копятся события до commit
+PENDING_EVENTS_KEY = "change_feed_events"
+
+# Служебные события переноса студента между основной таблицей и архивом:
+# передаются обработчикам (кэши, хранилище в памяти), но не подписчикам,
+# поскольку данные студента для клиентов не меняются
+INTERNAL_ACTIONS = frozenset({"archive", "restore"})
+
+# Максимальный размер payload в NOTIFY (ограничение Postgres - 8000 байт)
+NOTIFY_PAYLOAD_LIMIT = 7500
+
+
+@dataclass
+class ChangeEvent:
+    """
+    Событие изменения студента.
+
+    Для create и restore в data передаются все поля студента, для update -
+    измененные поля (или все поля), для delete и archive data не передается.
+    ID - номер события в порядке commit из счетчика change_sequence, общий для
+    всех процессов; присваивается перед commit (0 до этого).
+    """
+
+    action: str
+    student_id: int
+    data: Optional[Dict[str, Any]]
+    origin: str
+    id: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class FeedOverflow(Exception):
+    """
+    Подписчик не успевает читать события, его буфер переполнен.
+    """
+
+
+class FeedGap(Exception):
+    """
+    Запрошенное событие уже вытеснено из истории, продолжить поток невозможно.
+    """
+
+
+class Subscription:
+    """
+    Подписка на события с ограниченным буфером.
+    Если буфер переполнен, подписка закрывается, а клиент переподключается
+    с ID последнего полученного события.
+    """
+
+    def __init__(self, buffer_size: int, backlog: List[ChangeEvent]) -> None:
+        self._queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=buffer_size)
+        # События из истории отдаются до новых и не занимают место в буфере
+        self._backlog: Deque[ChangeEvent] = deque(backlog)
+        self.overflowed = False
+
+    def push(self, event: ChangeEvent) -> None:
+        """Кладет событие в буфер подписчика, не блокируя публикацию."""
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ChangeEvent]:
+        """
+        Ожидает очередное событие.
+
+        :param timeout: Максимальное время ожидания в секундах.
+        :return: Событие или None, если за timeout событий не было.
+        """
+        if self._backlog:
+            return self._backlog.popleft()
+        if self.overflowed and self._queue.empty():
+            raise FeedOverflow()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            if self.overflowed:
+                raise FeedOverflow()
+            return None
+
+
+class ChangeFeed:
+    """
+    Лента изменений студентов.
+
+    Репозиторий накапливает события в сессии и публикует их только после commit.
+    Внутри процесса события раздаются подписчикам из памяти. При работе с Postgres
+    события дополнительно отправляются через NOTIFY в той же транзакции, и каждый
+    процесс приложения получает события всех процессов через LISTEN.
+
+    ID событий выдает счетчик change_sequence в БД непосредственно перед commit
+    (блокировка его строки держится до конца транзакции), поэтому порядок ID
+    совпадает с порядком commit, а ID одного события одинаков во всех процессах.
+    Клиент может продолжить поток с Last-Event-ID в любом процессе: событие
+    транзакции, которая началась раньше, а завершилась позже, не пропускается.
+    События, выданные до запуска процесса, в его истории отсутствуют, поэтому
+    продолжение с более раннего ID невозможно (FeedGap).
+    """
+
+    def __init__(self, channel: str, history_size: int, buffer_size: int) -> None:
+        self.channel = channel
+        self.buffer_size = buffer_size
+        self.origin = uuid4().hex
+        self._history: Deque[ChangeEvent] = deque(maxlen=history_size)
+        self._subscribers: Set[Subscription] = set()
+        self._hooks: List[Callable[[ChangeEvent], None]] = []
+        self._last_id = 0
+        self._evicted_id = 0
+        # Соединения LISTEN по адресу БД: NOTIFY доставляется только слушателям
+        # той же БД, поэтому при шардировании слушается каждый шард
+        self._listen_connections: Dict[str, AsyncConnection] = {}
+        self._reconnect_hooks: List[Callable[[], Awaitable[None]]] = []
+        self._reconnect_tasks: Set[asyncio.Task[None]] = set()
+        self._stopped = False
+
+    @property
+    def listening(self) -> bool:
+        """Получает ли процесс события через LISTEN."""
+        return bool(self._listen_connections)
+
+    def listens_to(self, engine: Union[Engine, AsyncEngine]) -> bool:
+        """
+        Проверяет, получает ли процесс через LISTEN события commit в этой БД.
+
+        :param engine: Движок SQLAlchemy.
+        :return: True, если БД слушается.
+        """
+        return str(engine.url) in self._listen_connections
+
+    def add_hook(self, hook: Callable[[ChangeEvent], None]) -> None:
+        """
+        Регистрирует синхронный обработчик событий (например, сброс кэшей).
+        Обработчик вызывается сразу после commit в этом процессе и при получении
+        событий других процессов.
+
+        :param hook: Функция, принимающая событие.
+        """
+        self._hooks.append(hook)
+
+    def add_reconnect_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """
+        Регистрирует асинхронный обработчик восстановления LISTEN после разрыва
+        соединения. События других процессов за время разрыва потеряны, поэтому
+        обработчик сбрасывает или перезагружает данные, которые обновляются
+        событиями (кэши, хранилище в памяти).
+
+        :param hook: Функция без аргументов.
+        """
+        self._reconnect_hooks.append(hook)
+
+    def stage(
+        self,
+        session: AsyncSession,
+        action: str,
+        student_id: int,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Добавляет событие в сессию. Событие будет опубликовано после commit.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param action: Тип изменения: create, update, delete, archive или restore.
+        :param student_id: ID студента.
+        :param data: Данные студента.
+        """
+        event = ChangeEvent(
+            action=action,
+            student_id=student_id,
+            data=data,
+            origin=self.origin,
+        )
+        session.info.setdefault(PENDING_EVENTS_KEY, []).append(event)
+
+    def number(self, session: AsyncSession, first_id: int) -> None:
+        """
+        Присваивает накопленным в сессии событиям ID подряд, начиная с first_id.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param first_id: ID первого события транзакции.
+        """
+        for offset, event in enumerate(self.pending(session)):
+            event.id = first_id + offset
+
+    def pending(self, session: AsyncSession) -> List[ChangeEvent]:
+        """
+        Возвращает события, накопленные в сессии до commit.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :return: События текущей транзакции.
+        """
+        return session.info.get(PENDING_EVENTS_KEY, [])
+
+    async def before_commit(self, session: AsyncSession) -> None:
+        """
+        Отправляет накопленные события через NOTIFY в текущей транзакции.
+        Postgres доставит их слушателям только после успешного commit.
+        """
+        events: List[ChangeEvent] = session.info.get(PENDING_EVENTS_KEY, [])
+        if not events or session.get_bind().dialect.name != "postgresql":
+            return
+        for payload in self._notify_payloads(events):
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+    def after_commit(self, session: AsyncSession) -> None:
+        """
+        Публикует накопленные события после успешного commit.
+        """
+        events: List[ChangeEvent] = session.info.pop(PENDING_EVENTS_KEY, [])
+        listened = bool(events) and self.listens_to(session.get_bind().engine)
+        for event in events:
+            self._run_hooks(event)
+            if not listened and event.action not in INTERNAL_ACTIONS:
+                # Без LISTEN этой БД события раздаются подписчикам этого процесса
+                # напрямую
+                self._deliver(event)
+
+    def discard(self, session: AsyncSession) -> None:
+        """
+        Отбрасывает накопленные события при откате транзакции.
+        """
+        session.info.pop(PENDING_EVENTS_KEY, None)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Создает подписку на события.
+
+        :param last_event_id: ID последнего полученного клиентом события.
+            События после него будут повторно отправлены из истории.
+        :return: Подписка.
+        """
+        if last_event_id is not None and last_event_id < self._evicted_id:
+            raise FeedGap()
+
+        backlog = []
+        if last_event_id is not None:
+            backlog = [event for event in self._history if event.id > last_event_id]
+        subscription = Subscription(self.buffer_size, backlog)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Удаляет подписку.
+        """
+        self._subscribers.discard(subscription)
+
+    async def stream(
+        self, subscription: Subscription, keepalive: float
+    ) -> AsyncIterator[Optional[ChangeEvent]]:
+        """
+        Итерирует события подписки. При отсутствии событий в течение keepalive
+        секунд возвращает None, чтобы соединение можно было поддержать.
+        """
+        try:
+            while True:
+                yield await subscription.get(timeout=keepalive)
+        finally:
+            self.unsubscribe(subscription)
+
+    async def start_listener(self, engine: AsyncEngine) -> None:
+        """
+        Подписывается на события других процессов через LISTEN (только Postgres).
+        Вызывается для каждой БД, в которую пишет приложение (основная БД и
+        шарды); повторный вызов для той же БД ничего не делает. События с ID не
+        больше текущего значения счетчика в историю процесса уже не попадут,
+        поэтому продолжение с такого ID отклоняется (FeedGap).
+
+        :param engine: Асинхронный движок SQLAlchemy.
+        """
+        if self.listens_to(engine):
+            return
+        if engine.dialect.name == "postgresql":
+            self._stopped = False
+            await self._listen(engine)
+            logger.info(
+                "Лента изменений слушает канал %s в %s", self.channel, engine.url
+            )
+        # Начало истории отмечается после LISTEN, чтобы между ними не потерять
+        # событий
+        await self._mark_history_start(engine)
+
+    async def stop_listener(self) -> None:
+        """
+        Отписывается от событий других процессов во всех БД.
+        """
+        self._stopped = True
+        for task in list(self._reconnect_tasks):
+            task.cancel()
+        connections = list(self._listen_connections.values())
+        self._listen_connections.clear()
+        for connection in connections:
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.remove_listener(  # type: ignore[union-attr]
+                self.channel, self._on_notify
+            )
+            await connection.close()
+
+    async def _listen(self, engine: AsyncEngine) -> None:
+        """Открывает соединение LISTEN и следит за его разрывом."""
+        connection = await engine.connect()
+        try:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection: Any = raw_connection.driver_connection
+            await driver_connection.add_listener(self.channel, self._on_notify)
+            driver_connection.add_termination_listener(
+                partial(self._on_terminated, engine)
+            )
+        except BaseException:
+            await connection.close()
+            raise
+        self._listen_connections[str(engine.url)] = connection
+
+    def _on_terminated(self, engine: AsyncEngine, driver_connection: Any) -> None:
+        """Запускает переподключение после разрыва соединения LISTEN."""
+        connection = self._listen_connections.get(str(engine.url))
+        if self._stopped or connection is None:
+            # Соединение закрыто при остановке
+            return
+        del self._listen_connections[str(engine.url)]
+        logger.warning(
+            "Соединение LISTEN с %s разорвано, события других процессов не приходят",
+            engine.url,
+        )
+        task = asyncio.get_running_loop().create_task(
+            self._relisten(engine, connection)
+        )
+        self._reconnect_tasks.add(task)
+        task.add_done_callback(self._reconnect_tasks.discard)
+
+    async def _relisten(self, engine: AsyncEngine, connection: AsyncConnection) -> None:
+        """
+        Восстанавливает LISTEN с растущей паузой между попытками, затем сдвигает
+        начало истории (события за время разрыва в нее не попали) и вызывает
+        обработчики восстановления.
+        """
+        try:
+            await connection.invalidate()
+        except Exception:
+            logger.debug("Не удалось закрыть разорванное соединение LISTEN")
+        delay = settings.CHANGE_FEED_RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                if not self.listens_to(engine):
+                    await self._listen(engine)
+                await self._mark_history_start(engine)
+                break
+            except Exception:
+                logger.warning(
+                    "Не удалось восстановить LISTEN с %s, повтор через %s с",
+                    engine.url,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.CHANGE_FEED_RECONNECT_MAX_SECONDS)
+        logger.info("LISTEN с %s восстановлен", engine.url)
+        for hook in self._reconnect_hooks:
+            try:
+                await hook()
+            except Exception:
+                logger.exception("Ошибка в обработчике восстановления LISTEN")
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """Обрабатывает NOTIFY с пачкой событий."""
+        for raw_event in json.loads(payload):
+            event = ChangeEvent(**raw_event)
+            if event.origin != self.origin:
+                self._run_hooks(event)
+            if event.action not in INTERNAL_ACTIONS:
+                self._deliver(event)
+
+    async def _mark_history_start(self, engine: AsyncEngine) -> None:
+        """Запоминает номер последнего события, выданного до начала истории."""
+        async with engine.connect() as connection:
+            last_id = await connection.scalar(
+                text("SELECT MAX(value) FROM change_sequence")
+            )
+        self._evicted_id = max(self._evicted_id, last_id or 0)
+
+    def _deliver(self, event: ChangeEvent) -> None:
+        """Сохраняет событие в истории и раздает подписчикам."""
+        if not event.id:
+            # Событие, не прошедшее через счетчик (например, в тестах)
+            event.id = self._last_id + 1
+        self._last_id = max(self._last_id, event.id)
+        if len(self._history) == self._history.maxlen:
+            self._evicted_id = self._history[0].id
+        self._history.append(event)
+        for subscription in self._subscribers:
+            subscription.push(event)
+
+    def _run_hooks(self, event: ChangeEvent) -> None:
+        """Вызывает обработчики события, не давая их ошибкам сорвать публикацию."""
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Ошибка в обработчике события %s", event.id)
+
+    def _notify_payloads(self, events: List[ChangeEvent]) -> List[str]:
+        """Разбивает события на пачки, укладывающиеся в ограничение NOTIFY."""
+        payloads: List[str] = []
+        chunk: List[str] = []
+        size = 2
+        for event in events:
+            encoded = json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+            if chunk and size + len(encoded.encode()) + 1 > NOTIFY_PAYLOAD_LIMIT:
+                payloads.append("[" + ",".join(chunk) + "]")
+                chunk, size = [], 2
+            chunk.append(encoded)
+            size += len(encoded.encode()) + 1
+        if chunk:
+            payloads.append("[" + ",".join(chunk) + "]")
+        return payloads
+
+
+# Лента изменений студентов приложения
+change_feed = ChangeFeed(
+    channel=settings.CHANGE_FEED_CHANNEL,
+    history_size=settings.CHANGE_FEED_HISTORY_SIZE,
+    buffer_size=settings.CHANGE_FEED_BUFFER_SIZE,
+)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -7,13 +7,163 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     MODE: str
 
-    DB_HOST: str
-    DB_PORT: int
-    DB_USER: str
-    DB_PASSWORD: str
-    DB_NAME: str
+    # СУБД приложения: postgresql или sqlite (файл DB_SQLITE_PATH)
+    DB_BACKEND: Literal["postgresql", "sqlite"] = "postgresql"
+    DB_SQLITE_PATH: str = "students.db"
+
+    # Подключение к Postgres (не используется при DB_BACKEND=sqlite)
+    DB_HOST: str = "localhost"
+    DB_PORT: int = 5432
+    DB_USER: str = ""
+    DB_PASSWORD: str = ""
+    DB_NAME: str = ""
+
+    # Размер кэша подготовленных запросов asyncpg на одно соединение.
+    # Должен вмещать все комбинации фильтров из кэша запросов репозитория.
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+
+    # SQLite: размер файла БД, отображаемого в память, кэш страниц одного
+    # соединения в килобайтах, ожидание блокировки другого процесса, количество
+    # соединений для чтения и максимальное ожидание очереди записи (запись
+    # выполняется через одно соединение)
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30
+
+    # Шардирование студентов по факультетам: URL баз данных шардов (пустой
+    # список - шардирование выключено) и явное соответствие факультет -> номер
+    # шарда. Факультеты без явного соответствия распределяются по остатку от
+    # деления ID, студенты без факультета хранятся в шарде 0
+    DB_SHARD_URLS: List[str] = []
+    DB_SHARD_MAP: Dict[int, int] = {}
+    # Перенос студента между шардами: количество попыток удаления из прежнего
+    # шарда и пауза перед повтором
+    SHARD_MOVE_DELETE_RETRIES: int = 3
+    SHARD_MOVE_DELETE_BACKOFF_MS: float = 200
+
+    # Миграции: максимальное ожидание блокировки, количество попыток и пауза
+    # между ними, размер пакета и пауза между пакетами при заполнении данных
+    MIGRATION_LOCK_TIMEOUT_MS: float = 5000
+    MIGRATION_LOCK_RETRIES: int = 5
+    MIGRATION_LOCK_BACKOFF_MS: float = 1000
+    MIGRATION_BACKFILL_BATCH_SIZE: int = 5000
+    MIGRATION_BACKFILL_PAUSE_MS: float = 50
+
+    # Токен администратора для служебных маршрутов /api/v1/admin (заголовок
+    # X-Admin-Token). Пустой токен - служебные маршруты недоступны
+    ADMIN_TOKEN: str = ""
+
+    # Профилирование запросов: интервал между снимками стека по умолчанию и
+    # максимальная длительность сеанса
+    PROFILER_INTERVAL_MS: float = 5
+    PROFILER_MAX_SECONDS: float = 600
+
+    # Журнал медленных запросов: порог длительности в миллисекундах (0 - все
+    # запросы), количество хранимых отпечатков запросов и автоматическое
+    # получение плана EXPLAIN для новых медленных запросов
+    SLOW_QUERY_MS: float = 200
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 500
+    SLOW_QUERY_EXPLAIN: bool = False
+
+    # Объединять одновременные одинаковые запросы списка студентов
+    LIST_COALESCING: bool = True
+
+    # Строить JSON ответа списка студентов запросом к БД (Postgres и SQLite)
+    # вместо объектов ORM и моделей pydantic
+    LIST_DB_JSON: bool = False
+
+    # Кэш готовых фрагментов JSON студентов для сборки ответа списка студентов:
+    # максимальный объем памяти в мегабайтах (0 - выключен)
+    LIST_FRAGMENT_CACHE_MB: float = 64
+
+    # Отдавать список студентов из колоночного хранилища в памяти, которое
+    # загружается при запуске и обновляется лентой изменений (не используется
+    # вместе с шардированием)
+    READ_MODEL: bool = False
+
+    # Кэш студентов по ID: максимальное количество записей (0 - выключен) и
+    # время жизни записи. Максимальное количество ID в одном запросе студентов
+    STUDENT_CACHE_SIZE: int = 10000
+    STUDENT_CACHE_TTL_SECONDS: float = 60
+    STUDENT_BATCH_MAX_IDS: int = 5000
+
+    # Массовое изменение студентов: максимальное количество изменений в одном
+    # запросе и количество строк в одном UPDATE
+    STUDENT_BULK_MAX_ITEMS: int = 10000
+    STUDENT_BULK_CHUNK_SIZE: int = 1000
+
+    # Архив студентов: выпускники и отчисленные, не изменявшиеся указанное
+    # количество дней, переносятся в архив фоновой задачей
+    ARCHIVE_AFTER_DAYS: float = 365
+
+    # Групповая запись добавлений студентов: окно сбора пакета (0 - выключено,
+    # не задано - SQLITE_CREATE_BATCH_WINDOW_MS для SQLite, где все записи идут
+    # через одно соединение, и выключено для Postgres) и максимальный размер
+    # пакета
+    CREATE_BATCH_WINDOW_MS: Optional[float] = None
+    SQLITE_CREATE_BATCH_WINDOW_MS: float = 2
+    CREATE_BATCH_MAX_SIZE: int = 100
+
+    # Фоновые задачи: количество одновременно выполняемых задач, размер порции,
+    # время без сохранения прогресса, после которого задачу можно перехватить, и
+    # максимальное количество студентов в задаче импорта (данные импорта
+    # хранятся в параметрах задачи и читаются при каждой порции)
+    JOB_CONCURRENCY: int = 2
+    JOB_CHUNK_SIZE: int = 1000
+    JOB_STALE_SECONDS: float = 60
+    JOB_IMPORT_MAX_ITEMS: int = 50000
+
+    # Лента изменений: канал LISTEN/NOTIFY, размер истории для продолжения
+    # потока после переподключения и размер буфера одного подписчика
+    CHANGE_FEED_CHANNEL: str = "student_changes"
+    CHANGE_FEED_HISTORY_SIZE: int = 10000
+    CHANGE_FEED_BUFFER_SIZE: int = 1000
+    CHANGE_FEED_KEEPALIVE_SECONDS: float = 15
+    # Восстановление соединения LISTEN после разрыва: начальная и максимальная
+    # пауза между попытками
+    CHANGE_FEED_RECONNECT_MIN_SECONDS: float = 1
+    CHANGE_FEED_RECONNECT_MAX_SECONDS: float = 30
+
+    # Контроль допуска запросов: отдельные лимиты одновременных запросов, длины
+    # очереди и максимального ожидания в очереди для чтения и записи. Сумма
+    # лимитов не должна превышать размер пула соединений с БД
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_READ_CONCURRENCY: int = 8
+    ADMISSION_READ_QUEUE_SIZE: int = 64
+    ADMISSION_READ_BUDGET_MS: float = 2000
+    ADMISSION_WRITE_CONCURRENCY: int = 4
+    ADMISSION_WRITE_QUEUE_SIZE: int = 64
+    ADMISSION_WRITE_BUDGET_MS: float = 5000
+    # Дополнительные лимиты отдельных маршрутов, например
+    # {"GET /api/v1/students/": 4}
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {}
+
+    # Срок выполнения запроса в миллисекундах для чтения и записи, отдельные
+    # сроки маршрутов (ключи как в ADMISSION_ROUTE_LIMITS) и максимальный срок,
+    # который клиент может запросить заголовком X-Request-Timeout-Ms
+    DEADLINES: bool = True
+    DEADLINE_READ_MS: float = 10000
+    DEADLINE_WRITE_MS: float = 15000
+    DEADLINE_ROUTE_MS: Dict[str, float] = {}
+    DEADLINE_MAX_MS: float = 60000
+
+    # Сжатие ответов: минимальный размер ответа в байтах, уровни сжатия gzip,
+    # zstd и brotli и размер фрагмента, начиная с которого сжатие выполняется
+    # в пуле потоков
+    COMPRESSION: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_THREAD_MIN_SIZE: int = 256 * 1024
 
     def db_url(self, driver: Optional[str] = None) -> str:
+        if self.DB_BACKEND == "sqlite":
+            return "sqlite{driver}:///{path}".format(
+                driver=f"+{driver}" if driver else "", path=self.DB_SQLITE_PATH
+            )
         return "postgresql{driver}://{user}:{password}@{host}:{port}/{name}".format(
             driver=f"+{driver}" if driver else "",
             user=self.DB_USER,
@@ -23,6 +173,13 @@ class Settings(BaseSettings):
             name=self.DB_NAME,
         )
 
+    def create_batch_window_ms(self) -> float:
+        if self.CREATE_BATCH_WINDOW_MS is not None:
+            return self.CREATE_BATCH_WINDOW_MS
+        if self.DB_BACKEND == "sqlite":
+            return self.SQLITE_CREATE_BATCH_WINDOW_MS
+        return 0
+
     model_config = SettingsConfigDict(
         env_file=Path(__file__).resolve().parent.parent.parent / ".env"
     )
@@ -0,0 +1,115 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.util import await_only
+
+# Момент (по time.monotonic), к которому должна завершиться обработка запроса
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+# Ключ в connection.info, под которым хранится срок, установленный для SQLite
+SQLITE_DEADLINE_KEY = "statement_deadline"
+
+# Количество инструкций виртуальной машины SQLite между проверками срока
+SQLITE_PROGRESS_STEPS = 1000
+
+# Погрешность, в пределах которой ошибка БД считается вызванной истечением срока
+DEADLINE_SLACK = 0.1
+
+
+@contextmanager
+def deadline_scope(timeout: float) -> Iterator[float]:
+    """
+    Устанавливает срок выполнения для текущего контекста. Вложенный срок не может
+    быть позже внешнего.
+
+    :param timeout: Время на выполнение в секундах.
+    :return: Момент истечения срока по time.monotonic.
+    """
+    deadline = time.monotonic() + timeout
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Возвращает оставшееся до истечения срока время.
+
+    :return: Время в секундах (не меньше 0) или None, если срок не установлен.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def is_deadline_error(exc: BaseException) -> bool:
+    """
+    Проверяет, что ошибка БД вызвана прерыванием запроса по истечении срока.
+
+    :param exc: Исключение.
+    :return: True, если срок истек и исключение - ошибка БД.
+    """
+    left = remaining()
+    return isinstance(exc, DBAPIError) and left is not None and left <= DEADLINE_SLACK
+
+
+def _sqlite_progress_handler(deadline: float) -> Callable[[], int]:
+    """Обработчик прогресса SQLite, прерывающий запрос после истечения срока."""
+
+    def handler() -> int:
+        return int(time.monotonic() > deadline)
+
+    return handler
+
+
+def _apply_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    """
+    Ограничивает время выполнения запросов транзакции оставшимся сроком запроса:
+    SET LOCAL statement_timeout в Postgres, обработчик прогресса в SQLite.
+    """
+    deadline = _deadline.get()
+    dialect = connection.dialect.name
+
+    if dialect == "postgresql":
+        if deadline is not None:
+            timeout_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+    elif dialect == "sqlite":
+        if deadline is None and SQLITE_DEADLINE_KEY not in connection.info:
+            return
+        handler = _sqlite_progress_handler(deadline) if deadline is not None else None
+        driver_connection: Any = connection.connection.driver_connection
+        if isinstance(driver_connection, sqlite3.Connection):
+            driver_connection.set_progress_handler(handler, SQLITE_PROGRESS_STEPS)
+        else:
+            # aiosqlite выполняет запросы в своем потоке
+            await_only(
+                driver_connection.set_progress_handler(handler, SQLITE_PROGRESS_STEPS)
+            )
+        if deadline is None:
+            connection.info.pop(SQLITE_DEADLINE_KEY, None)
+        else:
+            connection.info[SQLITE_DEADLINE_KEY] = deadline
+
+
+def install_statement_timeouts() -> None:
+    """
+    Подключает ограничение времени запросов ко всем сессиям SQLAlchemy.
+    """
+    if not event.contains(Session, "after_begin", _apply_statement_timeout):
+        event.listen(Session, "after_begin", _apply_statement_timeout)
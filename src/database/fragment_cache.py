@@ -0,0 +1,130 @@
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+from src.database.change_feed import ChangeEvent
+from src.database.config import settings
+
+# Примерный расход памяти на запись кэша помимо самого фрагмента: элемент
+# OrderedDict, кортеж записи, ключ и время изменения
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class FragmentCache:
+    """
+    Кэш готовых фрагментов JSON студентов (GetStudentSchema) в памяти процесса
+    для сборки ответов списка студентов без повторной сериализации.
+
+    Фрагмент хранится вместе с версией строки (updated_at) и выдается, только
+    если версия совпадает с версией из запроса страницы, поэтому фрагмент,
+    прочитанный до конкурентного изменения, не попадет в ответ. Кроме того,
+    фрагмент удаляется при любом событии ленты изменений. Записи вытесняются по
+    давности использования (LRU), когда суммарный размер превышает max_bytes.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, Tuple[datetime, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кэш."""
+        return self.max_bytes > 0
+
+    def get_many(
+        self, versions: Sequence[Tuple[int, datetime]]
+    ) -> Tuple[Dict[int, bytes], List[int]]:
+        """
+        Находит фрагменты студентов с заданными версиями.
+
+        :param versions: Пары ID студента и время его изменения.
+        :return: Найденные фрагменты по ID и ID студентов, которых нет в кэше.
+        """
+        found: Dict[int, bytes] = {}
+        missing: List[int] = []
+        for student_id, updated_at in versions:
+            entry = self._entries.get(student_id)
+            if entry is not None and entry[0] == updated_at:
+                self._entries.move_to_end(student_id)
+                found[student_id] = entry[1]
+            else:
+                missing.append(student_id)
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put(self, student_id: int, updated_at: datetime, fragment: bytes) -> None:
+        """
+        Сохраняет фрагмент студента и вытесняет давно не использованные записи,
+        если превышен размер кэша.
+
+        :param student_id: ID студента.
+        :param updated_at: Время изменения студента, по которому строился фрагмент.
+        :param fragment: JSON студента.
+        """
+        if not self.enabled:
+            return
+        self.invalidate(student_id)
+        self._entries[student_id] = (updated_at, fragment)
+        self._bytes += self._entry_size(fragment)
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(evicted)
+            self.evictions += 1
+
+    def invalidate(self, student_id: int) -> None:
+        """
+        Удаляет фрагмент студента.
+
+        :param student_id: ID студента.
+        """
+        entry = self._entries.pop(student_id, None)
+        if entry is not None:
+            self._bytes -= self._entry_size(entry[1])
+
+    def apply(self, event: ChangeEvent) -> None:
+        """
+        Обработчик ленты изменений: удаляет фрагмент измененного студента.
+
+        :param event: Событие изменения студента.
+        """
+        self.invalidate(event.student_id)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает размер кэша, счетчики попаданий, промахов и вытеснений.
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """
+        Очищает кэш и сбрасывает счетчики.
+        """
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(fragment: bytes) -> int:
+        """Оценка памяти, которую занимает запись с фрагментом."""
+        return sys.getsizeof(fragment) + ENTRY_OVERHEAD_BYTES
+
+
+# Общий кэш фрагментов JSON студентов
+fragment_cache = FragmentCache(max_bytes=int(settings.LIST_FRAGMENT_CACHE_MB * 2**20))
@@ -0,0 +1,248 @@
+"""
+Помощники для миграций Alembic, которые можно выполнять под нагрузкой.
+
+Все функции вызываются внутри upgrade/downgrade миграции. Для Postgres они
+используют неблокирующие приемы (CREATE INDEX CONCURRENTLY, ограничения
+NOT VALID, пакетное обновление отдельными транзакциями), для остальных СУБД
+выполняют обычные операции.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from alembic import op
+from src.database.config import settings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+# Код ошибки Postgres при истечении lock_timeout
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def set_lock_timeout(connection: Connection, timeout_ms: float) -> None:
+    """
+    Ограничивает ожидание блокировок для всех запросов соединения. Миграция,
+    которая не смогла получить блокировку таблицы, завершается ошибкой, а не
+    выстраивает за собой очередь из запросов приложения.
+
+    :param connection: Соединение, в котором выполняются миграции.
+    :param timeout_ms: Максимальное ожидание блокировки в миллисекундах.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET lock_timeout = {int(timeout_ms)}")
+
+
+def is_lock_timeout(exc: BaseException) -> bool:
+    """
+    Проверяет, что ошибка вызвана истечением lock_timeout.
+
+    :param exc: Исключение.
+    :return: True, если блокировку не удалось получить.
+    """
+    return (
+        isinstance(exc, DBAPIError)
+        and getattr(exc.orig, "pgcode", None) == LOCK_NOT_AVAILABLE
+    )
+
+
+def with_lock_retries(
+    operation: Callable[[], ResultT],
+    attempts: int = settings.MIGRATION_LOCK_RETRIES,
+    backoff_ms: float = settings.MIGRATION_LOCK_BACKOFF_MS,
+) -> ResultT:
+    """
+    Выполняет DDL-операцию, повторяя ее, если не удалось получить блокировку.
+    Каждая попытка выполняется в точке сохранения, поэтому неудачная попытка не
+    отменяет предыдущие операции миграции.
+
+    :param operation: Операция миграции, например lambda: op.add_column(...).
+    :param attempts: Количество попыток.
+    :param backoff_ms: Пауза перед повтором, растущая с каждой попыткой.
+    :return: Результат операции.
+    """
+    connection = op.get_bind()
+    # В autocommit_block каждая операция выполняется своей транзакцией
+    autocommit = connection.get_isolation_level() == "AUTOCOMMIT"
+    for attempt in range(1, attempts + 1):
+        savepoint = None if autocommit else connection.begin_nested()
+        try:
+            result = operation()
+        except DBAPIError as exc:
+            if savepoint is not None:
+                savepoint.rollback()
+            if not is_lock_timeout(exc) or attempt == attempts:
+                raise
+            logger.warning(
+                "Блокировка не получена, попытка %s из %s", attempt, attempts
+            )
+            time.sleep(backoff_ms * attempt / 1000)
+        else:
+            if savepoint is not None:
+                savepoint.commit()
+            return result
+    raise AssertionError("unreachable")
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: List[str],
+    unique: bool = False,
+    **kwargs: Any,
+) -> None:
+    """
+    Создает индекс без блокировки записи (CREATE INDEX CONCURRENTLY) вне
+    транзакции миграции. Невалидный индекс, оставшийся после прерванной
+    попытки, предварительно удаляется, поэтому миграцию можно перезапустить.
+
+    :param index_name: Имя индекса.
+    :param table_name: Имя таблицы.
+    :param columns: Колонки индекса.
+    :param unique: Уникальный ли индекс.
+    :param kwargs: Дополнительные параметры op.create_index.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        op.create_index(index_name, table_name, columns, unique=unique, **kwargs)
+        return
+
+    with op.get_context().autocommit_block():
+        if _is_invalid_index(index_name):
+            logger.warning("Удаляется невалидный индекс %s", index_name)
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            unique=unique,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kwargs,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """
+    Удаляет индекс без блокировки записи (DROP INDEX CONCURRENTLY).
+
+    :param index_name: Имя индекса.
+    :param table_name: Имя таблицы.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index(index_name, table_name=table_name)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def backfill(
+    table_name: str,
+    set_clause: str,
+    where: str,
+    params: Optional[Dict[str, Any]] = None,
+    key: str = "id",
+    batch_size: int = settings.MIGRATION_BACKFILL_BATCH_SIZE,
+    pause_ms: float = settings.MIGRATION_BACKFILL_PAUSE_MS,
+) -> int:
+    """
+    Заполняет данные пакетами по batch_size строк, каждый пакет - отдельной
+    транзакцией, с паузой между пакетами. Условие where должно отбирать только
+    еще не заполненные строки (например, "new_column IS NULL"), тогда
+    прерванное заполнение продолжается с места остановки при повторном запуске.
+
+    :param table_name: Имя таблицы.
+    :param set_clause: SQL-выражение SET, например "full_name = first_name".
+    :param where: SQL-условие отбора незаполненных строк.
+    :param params: Значения параметров set_clause и where.
+    :param key: Уникальная упорядоченная колонка для обхода таблицы.
+    :param batch_size: Количество строк в пакете.
+    :param pause_ms: Пауза между пакетами, чтобы не загружать БД и реплики.
+    :return: Количество обновленных строк.
+    """
+    statement = text(
+        f"UPDATE {table_name} SET {set_clause} "
+        f"WHERE {key} IN ("
+        f"SELECT {key} FROM {table_name} "
+        f"WHERE ({where}) AND {key} > :last_key "
+        f"ORDER BY {key} LIMIT :batch_size"
+        f") RETURNING {key}"
+    )
+    updated = 0
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_key = connection.scalar(
+            text(f"SELECT MIN({key}) - 1 FROM {table_name} WHERE ({where})"),
+            params or {},
+        )
+        while last_key is not None:
+            keys = connection.execute(
+                statement,
+                {**(params or {}), "last_key": last_key, "batch_size": batch_size},
+            ).scalars()
+            batch = list(keys)
+            if not batch:
+                break
+            updated += len(batch)
+            last_key = max(batch)
+            logger.info("%s: обновлено %s строк", table_name, updated)
+            time.sleep(pause_ms / 1000)
+    return updated
+
+
+def set_not_null(table_name: str, column_name: str) -> None:
+    """
+    Делает колонку NOT NULL без долгой блокировки таблицы: ограничение CHECK
+    добавляется как NOT VALID, проверяется без блокировки записи, после чего
+    Postgres использует его вместо полного сканирования при SET NOT NULL.
+
+    :param table_name: Имя таблицы.
+    :param column_name: Имя колонки.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(column_name, nullable=False)
+        return
+
+    constraint = f"{table_name}_{column_name}_not_null"
+    with op.get_context().autocommit_block():
+        with_lock_retries(
+            lambda: op.execute(
+                f"ALTER TABLE {table_name} ADD CONSTRAINT {constraint} "
+                f"CHECK ({column_name} IS NOT NULL) NOT VALID"
+            )
+        )
+        op.execute(f"ALTER TABLE {table_name} VALIDATE CONSTRAINT {constraint}")
+        with_lock_retries(
+            lambda: op.alter_column(table_name, column_name, nullable=False)
+        )
+        with_lock_retries(lambda: op.drop_constraint(constraint, table_name))
+
+
+def _is_invalid_index(index_name: str) -> bool:
+    """Проверяет, что индекс существует и невалиден (прерванная сборка)."""
+    return bool(
+        op.get_bind().scalar(
+            text(
+                "SELECT NOT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+            ),
+            {"name": index_name},
+        )
+    )
@@ -1,12 +1,27 @@
 import enum
-from datetime import date
-from typing import Annotated, List, Optional
-
-from sqlalchemy import Date, Enum, ForeignKey, String
+from datetime import date, datetime, timezone
+from typing import Annotated, Any, Dict, List, Optional
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+)
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
+def utc_now() -> datetime:
+    """Текущее время в UTC."""
+    return datetime.now(timezone.utc)
+
+
 class Base(DeclarativeBase):
     """Базовый класс для всех моделей SQLAlchemy."""
 
@@ -40,6 +55,16 @@ class Student(Base):
     faculty_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("faculties.id", ondelete="SET NULL"), nullable=True
     )
+    # Время последнего изменения
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, onupdate=utc_now
+    )
+    # Номер commit последнего изменения (ChangeSequence), используется для
+    # инкрементальной синхронизации
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    # Идентификатор студента во внешней системе (учебном отделе) для загрузки
+    # списков студентов с добавлением или изменением
+    external_id: Mapped[Optional[str]] = mapped_column(String(length=64))
 
     faculty: Mapped[Optional["Faculty"]] = relationship(
         back_populates="students", passive_deletes=True
@@ -49,10 +74,98 @@ class Student(Base):
         "faculty", "name"
     )
 
+    # В SQLite ID не переиспользуются (AUTOINCREMENT), иначе новый студент мог
+    # бы получить ID студента, перенесенного в архив
+    __table_args__ = (
+        Index("ix_students_updated_at_id", "updated_at", "id"),
+        Index("ix_students_change_seq_id", "change_seq", "id"),
+        Index("ix_students_external_id", "external_id", unique=True),
+        {"sqlite_autoincrement": True},
+    )
+
     def __repr__(self) -> str:
         return f"<Student(id={self.id}, name={self.first_name} {self.last_name}, status={self.study_status})>"
 
 
+# Статусы, в которых студент может быть перенесен в архив
+ARCHIVED_STATUSES = frozenset({StudentStatus.graduated, StudentStatus.expelled})
+
+
+class StudentArchive(Base):
+    """
+    Модель студента в архиве. Выпускники и отчисленные студенты, которые давно
+    не изменялись, переносятся сюда фоновой задачей с сохранением ID.
+    """
+
+    __tablename__ = "students_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    first_name: Mapped[Annotated[str, 30]] = mapped_column(String(length=30))
+    last_name: Mapped[Annotated[str, 30]] = mapped_column(String(length=30))
+    date_of_birth: Mapped[date] = mapped_column(Date)
+    study_status: Mapped[StudentStatus] = mapped_column(Enum(StudentStatus))
+    faculty_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("faculties.id", ondelete="SET NULL"), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, onupdate=utc_now
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now
+    )
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    external_id: Mapped[Optional[str]] = mapped_column(String(length=64))
+
+    faculty: Mapped[Optional["Faculty"]] = relationship(passive_deletes=True)
+
+    faculty_title: AssociationProxy[Optional[str]] = association_proxy(
+        "faculty", "name"
+    )
+
+    __table_args__ = (
+        Index("ix_students_archive_updated_at_id", "updated_at", "id"),
+        Index("ix_students_archive_change_seq_id", "change_seq", "id"),
+        Index("ix_students_archive_external_id", "external_id", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StudentArchive(id={self.id}, name={self.first_name} {self.last_name}, status={self.study_status})>"
+
+
+class StudentTombstone(Base):
+    """Запись об удаленном студенте для инкрементальной синхронизации."""
+
+    __tablename__ = "student_tombstones"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    student_id: Mapped[int]
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now
+    )
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_student_tombstones_deleted_at_id", "deleted_at", "id"),
+        Index("ix_student_tombstones_change_seq_id", "change_seq", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StudentTombstone(student_id={self.student_id}, deleted_at={self.deleted_at})>"
+
+
+class ChangeSequence(Base):
+    """
+    Счетчик commit, изменяющих студентов. Транзакция увеличивает его перед
+    самым commit и держит блокировку строки до завершения, поэтому номера
+    выдаются в порядке commit.
+    """
+
+    __tablename__ = "change_sequence"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    value: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
 class Faculty(Base):
     """Модель факультета."""
 
@@ -65,3 +178,42 @@ class Faculty(Base):
 
     def __repr__(self) -> str:
         return f"<Faculty(id={self.id}, name={self.name})>"
+
+
+class JobStatus(enum.Enum):
+    """Перечисление возможных статусов фоновой задачи."""
+
+    pending = "pending"  # Ожидает выполнения
+    running = "running"  # Выполняется
+    completed = "completed"  # Завершена
+    failed = "failed"  # Завершена с ошибкой
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Job(Base):
+    """Модель фоновой задачи."""
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50))
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus), default=JobStatus.pending, index=True
+    )
+    params: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    checkpoint: Mapped[int] = mapped_column(default=0)
+    processed: Mapped[int] = mapped_column(default=0)
+    total: Mapped[Optional[int]] = mapped_column(nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now
+    )
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, onupdate=utc_now
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
@@ -0,0 +1,424 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.change_feed import ChangeEvent
+from src.database.models import Faculty, Student
+from src.logger import get_logger
+from src.schemas.student_schemas import (
+    GetStudentSchema,
+    ResponseStudentsWithPaginationSchema,
+    StudentStatusEnum,
+)
+
+logger = get_logger(__name__)
+
+# Колонки хранилища и их типы. Имена и статусы хранятся кодами словарей,
+# дата рождения - порядковым номером дня, отсутствие факультета - нулем.
+# Строка занимает 26 байт без учета словарей имен
+COLUMNS: Dict[str, npt.DTypeLike] = {
+    "id": np.int64,
+    "first_name": np.int32,
+    "last_name": np.int32,
+    "date_of_birth": np.int32,
+    "study_status": np.int8,
+    "faculty_id": np.int32,
+    "alive": np.bool_,
+}
+
+# Фильтры, которые поддерживает хранилище (остальные выполняются в БД)
+SUPPORTED_FILTERS = frozenset(
+    {"first_name", "last_name", "date_of_birth", "study_status", "faculty_id"}
+)
+
+# Статусы обучения в порядке их кодов
+STATUSES = list(StudentStatusEnum)
+
+# Доля удаленных строк, после которой хранилище уплотняется
+COMPACT_THRESHOLD = 0.25
+
+# Размер блока маски при поиске строк страницы
+PAGE_SCAN_BLOCK = 65536
+
+# Размер порции строк при загрузке из БД
+LOAD_CHUNK_SIZE = 10000
+
+
+class StringDictionary:
+    """
+    Словарь строк: каждое уникальное значение хранится один раз, а в колонке -
+    его код.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        """Возвращает код строки, добавляя ее в словарь при необходимости."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        """Возвращает код строки или None, если строки нет в словаре."""
+        return self._codes.get(value)
+
+    def nbytes(self) -> int:
+        """Приблизительный объем памяти строк словаря в байтах."""
+        return sum(len(value.encode()) for value in self.values)
+
+
+class StudentReadModel:
+    """
+    Колоночное хранилище студентов в памяти для быстрого получения списка.
+
+    Таблица студентов загружается при запуске приложения, а затем обновляется
+    событиями ленты изменений после каждого commit. Строки упорядочены по ID,
+    поэтому фильтрация, подсчет и выбор страницы выполняются векторными
+    операциями NumPy без обращения к БД. Удаленные строки помечаются и
+    периодически вычищаются.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.ready = False
+        self.missing_faculties: Set[int] = set()
+        self._faculty_titles: Dict[int, str] = {}
+        self._pending: Optional[List[ChangeEvent]] = None
+        self._clear(capacity)
+
+    def _clear(self, capacity: int) -> None:
+        """Удаляет все строки и словари имен."""
+        self._size = 0
+        self._deleted = 0
+        self._columns = {
+            name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()
+        }
+        self._first_names = StringDictionary()
+        self._last_names = StringDictionary()
+
+    def __len__(self) -> int:
+        return self._size - self._deleted
+
+    async def load(self, session: AsyncSession) -> None:
+        """
+        Загружает студентов и факультеты из БД. События, пришедшие во время
+        загрузки, применяются после нее.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        """
+        self.ready = False
+        self._pending = []
+        self._clear(len(self._columns["id"]))
+
+        await self.load_faculties(session)
+        result = await session.stream(
+            select(
+                Student.id,
+                Student.first_name,
+                Student.last_name,
+                Student.date_of_birth,
+                Student.study_status,
+                Student.faculty_id,
+            )
+            .order_by(Student.id)
+            .execution_options(yield_per=LOAD_CHUNK_SIZE)
+        )
+        async for rows in result.partitions():
+            self.extend(row._asdict() for row in rows)
+
+        pending, self._pending = self._pending, None
+        for event in pending:
+            self.apply(event)
+        self.ready = True
+        logger.info(
+            "Хранилище студентов загружено: %s строк, %s байт",
+            len(self),
+            self.nbytes(),
+        )
+
+    async def load_faculties(self, session: AsyncSession) -> None:
+        """
+        Загружает названия факультетов.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        """
+        rows = await session.execute(select(Faculty.id, Faculty.name))
+        self.set_faculties({faculty_id: name for faculty_id, name in rows})
+
+    def set_faculties(self, titles: Dict[int, str]) -> None:
+        """
+        Заменяет справочник названий факультетов.
+
+        :param titles: Названия факультетов по ID.
+        """
+        self._faculty_titles = titles
+        self.missing_faculties.clear()
+
+    def apply(self, event: ChangeEvent) -> None:
+        """
+        Применяет событие ленты изменений.
+
+        :param event: Событие.
+        """
+        if self._pending is not None:
+            self._pending.append(event)
+            return
+        if event.action in ("delete", "archive"):
+            # Хранилище содержит только основную таблицу без архива
+            self._remove(event.student_id)
+        elif event.data is not None:
+            self._upsert(event.student_id, event.data)
+
+    def extend(self, students: Iterable[Dict[str, Any]]) -> None:
+        """
+        Добавляет студентов в конец хранилища. Студенты должны быть упорядочены
+        по ID и иметь ID больше уже загруженных.
+
+        :param students: Данные студентов (id, first_name, last_name,
+            date_of_birth, study_status, faculty_id).
+        """
+        self._append([self._encode(student) for student in students])
+
+    def get_students(
+        self, filters: Dict[str, Optional[Any]]
+    ) -> Optional[ResponseStudentsWithPaginationSchema]:
+        """
+        Получает список студентов с фильтрацией и пагинацией.
+
+        :param filters: Словарь с фильтрами (например, limit, page, date_of_birth и др.).
+        :return: Объект с информацией о студентах и пагинацией или None, если
+            запрос нужно выполнить в БД.
+        """
+        limit_value = filters.get("limit") or 10
+        page_value = filters.get("page") or 1
+        offset_value = (page_value - 1) * limit_value
+
+        conditions = self._conditions(filters)
+        if conditions is None:
+            return None
+        if not conditions and not self._deleted:
+            # Без фильтров и удаленных строк страница - это диапазон позиций
+            total = self._size
+            positions = list(
+                range(offset_value, min(offset_value + limit_value, self._size))
+            )
+        else:
+            mask = self._mask(conditions)
+            total = int(np.count_nonzero(mask))
+            positions = _page_positions(mask, offset_value, limit_value)
+
+        students: List[GetStudentSchema] = []
+        for position in positions:
+            student = self._decode(position)
+            if student.faculty_id and student.faculty_title is None:
+                # Факультет появился после загрузки - обновим справочник
+                self.missing_faculties.add(student.faculty_id)
+                return None
+            students.append(student)
+
+        return ResponseStudentsWithPaginationSchema(
+            total=total,
+            page=page_value,
+            limit=limit_value,
+            students=students,
+        )
+
+    def nbytes(self) -> int:
+        """
+        Объем памяти колонок и словарей имен в байтах.
+        """
+        columns = sum(column[: self._size].nbytes for column in self._columns.values())
+        return columns + self._first_names.nbytes() + self._last_names.nbytes()
+
+    def _conditions(
+        self, filters: Dict[str, Optional[Any]]
+    ) -> Optional[List[Tuple[str, Any, Any]]]:
+        """
+        Переводит фильтры в условия над колонками: (колонка, функция сравнения,
+        закодированное значение). Возвращает None, если фильтр не поддерживается.
+        """
+        conditions: List[Tuple[str, Any, Any]] = []
+        for key, value in filters.items():
+            if value is None or key in ("page", "limit"):
+                continue
+            if key not in SUPPORTED_FILTERS:
+                return None
+            if key == "date_of_birth":
+                conditions.append((key, np.greater_equal, value.toordinal()))
+                continue
+            if key == "first_name":
+                code = self._first_names.find(value)
+            elif key == "last_name":
+                code = self._last_names.find(value)
+            elif key == "study_status":
+                code = _status_code(value)
+            else:
+                code = value
+            # Значения нет в словаре - условию не соответствует ни одна строка
+            conditions.append((key, np.equal, -1 if code is None else code))
+        return conditions
+
+    def _mask(self, conditions: List[Tuple[str, Any, Any]]) -> npt.NDArray[Any]:
+        """Строит маску строк, подходящих под условия, без лишних копий."""
+        if self._deleted:
+            conditions = [*conditions, ("alive", np.equal, True)]
+        mask = np.empty(self._size, np.bool_)
+        scratch = np.empty(self._size, np.bool_) if len(conditions) > 1 else mask
+        for index, (key, compare, value) in enumerate(conditions):
+            column = self._columns[key][: self._size]
+            if index == 0:
+                compare(column, value, out=mask)
+            else:
+                compare(column, value, out=scratch)
+                np.logical_and(mask, scratch, out=mask)
+        return mask
+
+    def _encode(self, data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Кодирует студента в значения колонок."""
+        return (
+            data["id"],
+            self._first_names.encode(data["first_name"]),
+            self._last_names.encode(data["last_name"]),
+            _to_date(data["date_of_birth"]).toordinal(),
+            _status_code(data["study_status"]),
+            data["faculty_id"] or 0,
+            True,
+        )
+
+    def _decode(self, position: int) -> GetStudentSchema:
+        """Декодирует строку хранилища в схему студента."""
+        columns = self._columns
+        faculty_id = int(columns["faculty_id"][position]) or None
+        return GetStudentSchema(
+            id=int(columns["id"][position]),
+            first_name=self._first_names.values[columns["first_name"][position]],
+            last_name=self._last_names.values[columns["last_name"][position]],
+            date_of_birth=date.fromordinal(int(columns["date_of_birth"][position])),
+            study_status=STATUSES[columns["study_status"][position]],
+            faculty_id=faculty_id,
+            faculty_title=self._faculty_titles.get(faculty_id) if faculty_id else None,
+        )
+
+    def _find(self, student_id: int) -> Optional[int]:
+        """Находит позицию студента по ID."""
+        ids = self._columns["id"][: self._size]
+        position = int(np.searchsorted(ids, student_id))
+        if position < self._size and ids[position] == student_id:
+            return position
+        return None
+
+    def _upsert(self, student_id: int, data: Dict[str, Any]) -> None:
+        """Добавляет или обновляет студента (событие может содержать часть полей)."""
+        position = self._find(student_id)
+        if position is None or not self._columns["alive"][position]:
+            if not set(COLUMNS) - {"alive"} <= {*data, "id"}:
+                # Неполное событие о студенте, которого нет в хранилище
+                return
+            row = self._encode({**data, "id": student_id})
+            if position is None:
+                self._insert(row)
+            else:
+                self._set(position, row)
+                self._deleted -= 1
+            return
+
+        current = self._decode(position).model_dump()
+        self._set(position, self._encode({**current, **data, "id": student_id}))
+
+    def _remove(self, student_id: int) -> None:
+        """Помечает студента удаленным."""
+        position = self._find(student_id)
+        if position is None or not self._columns["alive"][position]:
+            return
+        self._columns["alive"][position] = False
+        self._deleted += 1
+        if self._deleted > COMPACT_THRESHOLD * self._size:
+            self._compact()
+
+    def _set(self, position: int, row: Tuple[Any, ...]) -> None:
+        """Записывает значения колонок в позицию."""
+        for column, value in zip(self._columns.values(), row):
+            column[position] = value
+
+    def _insert(self, row: Tuple[Any, ...]) -> None:
+        """Вставляет строку, сохраняя порядок по ID."""
+        if self._size == 0 or row[0] > self._columns["id"][self._size - 1]:
+            self._append([row])
+            return
+        position = int(np.searchsorted(self._columns["id"][: self._size], row[0]))
+        self._reserve(self._size + 1)
+        for column in self._columns.values():
+            column[position + 1 : self._size + 1] = column[position : self._size]
+        self._set(position, row)
+        self._size += 1
+
+    def _append(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Добавляет строки в конец хранилища."""
+        if not rows:
+            return
+        self._reserve(self._size + len(rows))
+        end = self._size + len(rows)
+        for column, values in zip(self._columns.values(), zip(*rows)):
+            column[self._size : end] = values
+        self._size = end
+
+    def _reserve(self, size: int) -> None:
+        """Увеличивает емкость колонок минимум до size строк."""
+        capacity = len(self._columns["id"])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def _compact(self) -> None:
+        """Удаляет помеченные строки."""
+        alive = self._columns["alive"][: self._size].copy()
+        size = int(np.count_nonzero(alive))
+        for name, column in self._columns.items():
+            column[:size] = column[: self._size][alive]
+        self._size = size
+        self._deleted = 0
+
+
+def _page_positions(mask: npt.NDArray[Any], offset: int, limit: int) -> List[int]:
+    """
+    Находит позиции строк страницы. Маска просматривается блоками, чтобы не
+    вычислять позиции всех подходящих строк ради первых страниц.
+    """
+    positions: List[int] = []
+    for start in range(0, len(mask), PAGE_SCAN_BLOCK):
+        block = mask[start : start + PAGE_SCAN_BLOCK]
+        count = int(np.count_nonzero(block))
+        if count <= offset:
+            offset -= count
+            continue
+        hits = np.flatnonzero(block)[offset : offset + limit - len(positions)]
+        positions.extend((hits + start).tolist())
+        offset = 0
+        if len(positions) == limit:
+            break
+    return positions
+
+
+def _status_code(value: Any) -> int:
+    """Возвращает код статуса обучения (из БД, схемы или события)."""
+    return STATUSES.index(StudentStatusEnum(getattr(value, "value", value)))
+
+
+def _to_date(value: Any) -> date:
+    """Приводит дату из БД или из события (строка ISO) к date."""
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+# Колоночное хранилище студентов приложения (загружается, если READ_MODEL включен)
+read_model = StudentReadModel()
@@ -1,25 +1,133 @@
-from typing import Any, Dict, Optional, Sequence
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-from sqlalchemy import asc, delete, exists, func, select
+from sqlalchemy import (
+    ARRAY,
+    DateTime,
+    Integer,
+    Row,
+    Select,
+    Table,
+    Text,
+    and_,
+    any_,
+    asc,
+    bindparam,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql.dml import ReturningDelete
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Subquery
 
-from src.database.models import Faculty, Student
+from src.database.change_feed import change_feed
+from src.database.config import settings
+from src.database.fragment_cache import fragment_cache
+from src.database.models import (
+    ARCHIVED_STATUSES,
+    ChangeSequence,
+    Faculty,
+    Job,
+    JobStatus,
+    Student,
+    StudentArchive,
+    StudentStatus,
+    StudentTombstone,
+    utc_now,
+)
+from src.database.read_model import read_model
+from src.database.statement_cache import statement_cache
+from src.database.student_cache import student_cache
+from src.database.sync_token import SyncToken
+from src.database.write_batcher import WriteBatcher
+from src.formats import StudentRows
 from src.handlers.custom_exceptions import (
     IntegrityViolationException,
+    JobClaimLostException,
     RowNotFoundException,
 )
 from src.schemas.base_schemas import SuccessResponse
 from src.schemas.student_schemas import (
     BodyStudentSchema,
+    BulkUpdateErrorSchema,
+    BulkUpdateStudentSchema,
+    BulkUpdateStudentsResultSchema,
     GetStudentSchema,
     ResponseStudentSchema,
     ResponseStudentsWithPaginationSchema,
+    StudentChangeSchema,
+    StudentChangesSchema,
+    StudentStatusEnum,
     UpdateStudentSchema,
+    UpsertErrorSchema,
+    UpsertStudentSchema,
+    UpsertStudentsResultSchema,
+)
+
+# Параметры пагинации, которые не являются фильтрами
+PAGINATION_KEYS = ("page", "limit")
+
+# Колонки, общие для основной таблицы студентов и архива
+STUDENT_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "study_status",
+    "faculty_id",
+    "updated_at",
+    "external_id",
+)
+
+# Колонки студента в ответе списка в порядке полей ResponseStudentSchema
+STUDENT_RESPONSE_COLUMNS = (
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "study_status",
+    "faculty_id",
+    "id",
 )
 
+# Поля студента в ответе списка студентов
+STUDENT_LIST_COLUMNS = (*STUDENT_RESPONSE_COLUMNS, "faculty_title")
+
+# СУБД, которые умеют строить JSON ответа списка студентов
+JSON_DIALECTS = ("postgresql", "sqlite")
+
+# Модель основной таблицы студентов или архива
+StudentModel = Union[Type[Student], Type[StudentArchive]]
+
 
 class StudentRepository:
     """
@@ -33,6 +141,25 @@ class StudentRepository:
         """
         Добавляет нового студента в базу данных.
 
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_data: Данные нового студента.
+        :return: Ответ с информацией о созданном студенте.
+        """
+        if create_batcher.enabled:
+            return await create_batcher.submit(
+                session,
+                student_data,
+                fallback=lambda: cls._insert_student(session, student_data),
+            )
+        return await cls._insert_student(session, student_data)
+
+    @classmethod
+    async def _insert_student(
+        cls, session: AsyncSession, student_data: BodyStudentSchema
+    ) -> ResponseStudentSchema:
+        """
+        Добавляет одного студента отдельной транзакцией.
+
         :param session: Асинхронная сессия SQLAlchemy.
         :param student_data: Данные нового студента.
         :return: Ответ с информацией о созданном студенте.
@@ -41,9 +168,67 @@ class StudentRepository:
         new_student = Student(**student_data.model_dump())
 
         session.add(new_student)
+        await cls._secure_flush(session)
+        cls._stage_students(session, "create", [new_student])
         await cls._secure_commit(session)
         return ResponseStudentSchema.model_validate(new_student)
 
+    @classmethod
+    async def _insert_students_batch(
+        cls, session: AsyncSession, batch: List[BodyStudentSchema]
+    ) -> List[Union[ResponseStudentSchema, BaseException]]:
+        """
+        Добавляет пакет студентов одним INSERT и одним commit.
+        Ошибки отдельных записей не влияют на остальные записи пакета.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param batch: Данные новых студентов.
+        :return: Результат или исключение для каждой записи пакета.
+        """
+        existing_faculties = await cls._get_existing_faculties(
+            session, {item.faculty_id for item in batch if item.faculty_id}
+        )
+
+        results: List[Optional[Union[ResponseStudentSchema, BaseException]]] = [
+            None
+        ] * len(batch)
+        valid: List[int] = []
+        for index, item in enumerate(batch):
+            if item.faculty_id and item.faculty_id not in existing_faculties:
+                results[index] = RowNotFoundException(
+                    "Факультет не найден! Сначала создайте факультет!"
+                )
+            else:
+                valid.append(index)
+
+        students: Optional[Sequence[Student]] = None
+        if valid:
+            try:
+                inserted = await session.scalars(
+                    insert(Student).returning(Student, sort_by_parameter_order=True),
+                    [batch[index].model_dump() for index in valid],
+                )
+                students = inserted.all()
+                cls._stage_students(session, "create", students)
+                await cls._secure_commit(session)
+            except (IntegrityError, IntegrityViolationException):
+                await session.rollback()
+                students = None
+
+        if students is None:
+            # Пакет отклонен целиком: повторяем записи по одной,
+            # чтобы ошибка досталась только вызову с некорректными данными
+            for index in valid:
+                try:
+                    results[index] = await cls._insert_student(session, batch[index])
+                except (IntegrityViolationException, RowNotFoundException) as exc:
+                    results[index] = exc
+        else:
+            for index, student in zip(valid, students):
+                results[index] = ResponseStudentSchema.model_validate(student)
+
+        return [result for result in results if result is not None]
+
     @classmethod
     async def get_students(
         cls, session: AsyncSession, filters: Dict[str, Optional[Any]]
@@ -55,72 +240,534 @@ class StudentRepository:
         :param filters: Словарь с фильтрами (например, limit, page, date_of_birth и др.).
         :return: Объект с информацией о студентах и пагинацией.
         """
-        conditions = cls._build_conditions(filters)
+        # Архив просматривается, только если запрошены выпускники или отчисленные
+        with_archive = cls._is_archived_status(filters.get("study_status"))
+        if read_model.ready and not with_archive:
+            in_memory = read_model.get_students(filters)
+            if in_memory is not None:
+                return in_memory
+            if read_model.missing_faculties:
+                await read_model.load_faculties(session)
 
-        total_count = await cls._get_total_count(session, conditions)
+        filter_keys = cls._filter_keys(filters)
+        params = cls._filter_params(filters, filter_keys)
+
+        total_count = await cls._get_total_count(
+            session, filter_keys, params, with_archive
+        )
 
         limit_value = filters.get("limit") or 10
         page_value = filters.get("page") or 1
         offset_value = (page_value - 1) * limit_value
+        page_params = {**params, "limit": limit_value, "offset": offset_value}
+        students: List[GetStudentSchema]
 
-        students_query = (
-            select(Student)
-            .options(joinedload(Student.faculty))
-            .where(*conditions)
-            .order_by(asc(Student.id))
-            .limit(limit_value)
-            .offset(offset_value)
+        if with_archive:
+            # ID страницы выбираются из объединения таблиц, затем студенты
+            # загружаются по ID из основной таблицы и архива
+            ids_query = statement_cache.get_or_build(
+                ("archive_page_ids", filter_keys),
+                lambda: cls._build_archive_page_ids_query(filter_keys),
+            )
+            page_ids = list(await session.scalars(ids_query, page_params))
+            found = {
+                student.id: student
+                for student in await cls.load_students_by_ids(session, page_ids)
+            }
+            students = [
+                found[student_id] for student_id in page_ids if student_id in found
+            ]
+        else:
+            students_query = statement_cache.get_or_build(
+                ("page", filter_keys), lambda: cls._build_page_query(filter_keys)
+            )
+            students = [
+                GetStudentSchema.model_validate(student)
+                for student in await session.scalars(students_query, page_params)
+            ]
+
+        return ResponseStudentsWithPaginationSchema(
+            total=total_count,
+            page=page_value,
+            limit=limit_value,
+            students=students,
         )
 
-        students_request = await session.scalars(students_query)
-        students = students_request.all()
+    @classmethod
+    async def get_students_json(
+        cls, session: AsyncSession, filters: Dict[str, Optional[Any]]
+    ) -> bytes:
+        """
+        Получает список студентов с фильтрацией и пагинацией в виде готового
+        JSON, который строит сама БД (json_agg и json_build_object в Postgres,
+        json_group_array и json_object в SQLite). Ответ совпадает с
+        ResponseStudentsWithPaginationSchema, но строки не превращаются в
+        объекты ORM и модели pydantic. Для остальных СУБД и запросов, которые
+        обслуживает хранилище в памяти, JSON строится в Python.
 
-        return ResponseStudentsWithPaginationSchema(
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param filters: Словарь с фильтрами (например, limit, page, date_of_birth и др.).
+        :return: Тело ответа в кодировке UTF-8.
+        """
+        dialect = session.get_bind().dialect.name
+        with_archive = cls._is_archived_status(filters.get("study_status"))
+        if dialect not in JSON_DIALECTS or (read_model.ready and not with_archive):
+            students = await cls.get_students(session, filters)
+            return students.model_dump_json().encode()
+
+        filter_keys = cls._filter_keys(filters)
+        limit_value = filters.get("limit") or 10
+        page_value = filters.get("page") or 1
+        json_query = statement_cache.get_or_build(
+            ("page_json", dialect, filter_keys, with_archive),
+            lambda: cls._build_page_json_query(dialect, filter_keys, with_archive),
+        )
+        body = await session.scalar(
+            json_query,
+            {
+                **cls._filter_params(filters, filter_keys),
+                "page": page_value,
+                "limit": limit_value,
+                "offset": (page_value - 1) * limit_value,
+            },
+        )
+        return str(body).encode()
+
+    @classmethod
+    async def get_students_rows(
+        cls, session: AsyncSession, filters: Dict[str, Optional[Any]]
+    ) -> StudentRows:
+        """
+        Получает список студентов с фильтрацией и пагинацией в виде строк
+        запроса (STUDENT_LIST_COLUMNS) без объектов ORM и моделей pydantic.
+        Используется колоночными форматами ответа. Запросы, которые
+        обслуживает хранилище в памяти, строятся из его ответа.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param filters: Словарь с фильтрами (например, limit, page, date_of_birth и др.).
+        :return: Страница студентов в виде строк.
+        """
+        with_archive = cls._is_archived_status(filters.get("study_status"))
+        if read_model.ready and not with_archive:
+            students = await cls.get_students(session, filters)
+            return StudentRows.from_schema(students, STUDENT_LIST_COLUMNS)
+
+        filter_keys = cls._filter_keys(filters)
+        params = cls._filter_params(filters, filter_keys)
+        total_count = await cls._get_total_count(
+            session, filter_keys, params, with_archive
+        )
+
+        limit_value = filters.get("limit") or 10
+        page_value = filters.get("page") or 1
+        rows_query = statement_cache.get_or_build(
+            ("page_rows", filter_keys, with_archive),
+            lambda: cls._build_page_rows_query(
+                cls._build_matched_subquery(filter_keys, with_archive)
+            ),
+        )
+        rows = await session.execute(
+            rows_query,
+            {**params, "limit": limit_value, "offset": (page_value - 1) * limit_value},
+        )
+        return StudentRows(
             total=total_count,
             page=page_value,
             limit=limit_value,
-            students=[GetStudentSchema.model_validate(student) for student in students],
+            fields=STUDENT_LIST_COLUMNS,
+            rows=rows.all(),
+        )
+
+    @classmethod
+    async def get_students_fragments(
+        cls, session: AsyncSession, filters: Dict[str, Optional[Any]]
+    ) -> bytes:
+        """
+        Получает список студентов с фильтрацией и пагинацией в виде готового
+        JSON, собранного из кэша фрагментов студентов. Запрос страницы выбирает
+        только ID и время изменения студентов, а загружаются и сериализуются
+        только студенты, которых нет в кэше или которые изменились. Ответ
+        совпадает с ResponseStudentsWithPaginationSchema. Запросы, которые
+        обслуживает хранилище в памяти, строятся в Python.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param filters: Словарь с фильтрами (например, limit, page, date_of_birth и др.).
+        :return: Тело ответа в кодировке UTF-8.
+        """
+        with_archive = cls._is_archived_status(filters.get("study_status"))
+        if read_model.ready and not with_archive:
+            students = await cls.get_students(session, filters)
+            return students.model_dump_json().encode()
+
+        filter_keys = cls._filter_keys(filters)
+        params = cls._filter_params(filters, filter_keys)
+        total_count = await cls._get_total_count(
+            session, filter_keys, params, with_archive
+        )
+
+        limit_value = filters.get("limit") or 10
+        page_value = filters.get("page") or 1
+        versions_query = statement_cache.get_or_build(
+            ("page_versions", filter_keys, with_archive),
+            lambda: cls._build_page_versions_query(filter_keys, with_archive),
+        )
+        versions: List[Tuple[int, datetime]] = [
+            (row.id, row.updated_at)
+            for row in await session.execute(
+                versions_query,
+                {
+                    **params,
+                    "limit": limit_value,
+                    "offset": (page_value - 1) * limit_value,
+                },
+            )
+        ]
+
+        fragments, missing = fragment_cache.get_many(versions)
+        if missing:
+            updated_at = dict(versions)
+            for student in await cls.load_students_by_ids(session, missing):
+                fragment = student.model_dump_json().encode()
+                fragment_cache.put(student.id, updated_at[student.id], fragment)
+                fragments[student.id] = fragment
+
+        return b"".join(
+            (
+                b'{"total":%d,"page":%d,"limit":%d,"students":['
+                % (total_count, page_value, limit_value),
+                b",".join(
+                    fragments[student_id]
+                    for student_id, _ in versions
+                    if student_id in fragments
+                ),
+                b"]}",
+            )
         )
 
+    @classmethod
+    async def get_student(
+        cls, session: AsyncSession, student_id: int
+    ) -> GetStudentSchema:
+        """
+        Получает студента по его ID.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_id: ID студента.
+        :return: Информация о студенте.
+        """
+        students = await cls.get_students_by_ids(session, [student_id])
+        if not students:
+            raise RowNotFoundException()
+        return students[0]
+
+    @classmethod
+    async def get_students_by_ids(
+        cls, session: AsyncSession, student_ids: Sequence[int]
+    ) -> List[GetStudentSchema]:
+        """
+        Получает студентов по списку ID через кэш студентов. Отсутствующие в кэше
+        студенты запрашиваются одним запросом.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: ID студентов.
+        :return: Найденные студенты в порядке запрошенных ID.
+        """
+        found = await student_cache.get_or_load(
+            student_ids, lambda missing: cls.load_students_by_ids(session, missing)
+        )
+        return [
+            found[student_id]
+            for student_id in dict.fromkeys(student_ids)
+            if student_id in found
+        ]
+
+    @classmethod
+    async def load_students_by_ids(
+        cls, session: AsyncSession, student_ids: List[int]
+    ) -> List[GetStudentSchema]:
+        """
+        Загружает студентов по списку ID одним запросом, минуя кэш. Студенты,
+        которых нет в основной таблице, ищутся вторым запросом в архиве.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: ID студентов.
+        :return: Найденные студенты.
+        """
+        dialect = session.get_bind().dialect.name
+        students_query = statement_cache.get_or_build(
+            ("by_ids", dialect), lambda: cls._build_by_ids_query(dialect, Student)
+        )
+        students = [
+            GetStudentSchema.model_validate(student)
+            for student in await session.scalars(
+                students_query, {"student_ids": student_ids}
+            )
+        ]
+
+        missing = set(student_ids).difference(student.id for student in students)
+        if missing:
+            archive_query = statement_cache.get_or_build(
+                ("archive_by_ids", dialect),
+                lambda: cls._build_by_ids_query(dialect, StudentArchive),
+            )
+            students.extend(
+                GetStudentSchema.model_validate(student)
+                for student in await session.scalars(
+                    archive_query, {"student_ids": list(missing)}
+                )
+            )
+        return students
+
     @classmethod
     async def update_student(
         cls, session: AsyncSession, student_id: int, student_data: UpdateStudentSchema
     ) -> ResponseStudentSchema:
         """
-        Обновляет информацию о студенте.
+        Обновляет информацию о студенте. Студент из архива при смене статуса на
+        неархивный (например, active) возвращается в основную таблицу, иначе
+        изменяется в архиве.
 
         :param session: Асинхронная сессия SQLAlchemy.
         :param student_id: ID студента, которого нужно обновить.
         :param student_data: Данные для обновления.
         :return: Обновленная информация о студенте.
         """
-        student = await session.get(Student, student_id)
+        changes = student_data.model_dump(exclude_unset=True)
+        student: Optional[Union[Student, StudentArchive]] = await session.get(
+            Student, student_id
+        )
+        archived = False
         if not student:
-            raise RowNotFoundException()
+            student = await session.get(StudentArchive, student_id)
+            if not student:
+                raise RowNotFoundException()
+            archived = cls._is_archived_status(
+                changes.get("study_status", student.study_status)
+            )
 
         await cls._check_faculty_exists(session, student_data.faculty_id)
 
-        for key, value in student_data.model_dump(exclude_unset=True).items():
+        if isinstance(student, StudentArchive) and not archived:
+            await cls._restore_students(session, [student_id])
+            student = await session.get(Student, student_id)
+            assert student is not None
+
+        for key, value in changes.items():
             setattr(student, key, value)
 
+        await cls._secure_flush(session)
+        cls._stage_students(session, "update", [student])
+        if archived:
+            cls._stage_archived(session, [student_id])
         await cls._secure_commit(session)
         return ResponseStudentSchema.model_validate(student)
 
+    @classmethod
+    async def bulk_update_students(
+        cls, session: AsyncSession, items: List[BulkUpdateStudentSchema]
+    ) -> BulkUpdateStudentsResultSchema:
+        """
+        Применяет изменения многих студентов одной транзакцией. Изменения
+        группируются по набору полей, и каждая группа применяется порциями по
+        STUDENT_BULK_CHUNK_SIZE строк одним UPDATE. Факультеты всех изменений
+        проверяются одним запросом. Несколько изменений одного студента
+        объединяются, более поздние поля имеют приоритет. Студенты, которых нет
+        в основной таблице, изменяются в архиве или, при смене статуса на
+        неархивный, возвращаются из архива.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param items: Изменения студентов.
+        :return: Количество измененных студентов и ошибки отдельных изменений.
+        """
+        changes: Dict[int, Dict[str, Any]] = {}
+        for item in items:
+            changes.setdefault(item.id, {}).update(
+                item.model_dump(exclude_unset=True, exclude={"id"})
+            )
+
+        existing_faculties = await cls._get_existing_faculties(
+            session,
+            {
+                fields["faculty_id"]
+                for fields in changes.values()
+                if fields.get("faculty_id")
+            },
+        )
+        failed: List[BulkUpdateErrorSchema] = []
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for student_id, fields in changes.items():
+            if (
+                fields.get("faculty_id")
+                and fields["faculty_id"] not in existing_faculties
+            ):
+                failed.append(
+                    BulkUpdateErrorSchema(
+                        id=student_id,
+                        detail="Факультет не найден! Сначала создайте факультет!",
+                    )
+                )
+                continue
+            groups.setdefault(tuple(sorted(fields)), []).append(student_id)
+
+        updated = 0
+        chunk_size = settings.STUDENT_BULK_CHUNK_SIZE
+        for field_names, student_ids in groups.items():
+            for start in range(0, len(student_ids), chunk_size):
+                chunk = student_ids[start : start + chunk_size]
+                found = set(
+                    await cls._update_rows(
+                        session,
+                        Student,
+                        field_names,
+                        [
+                            {"id": student_id, **changes[student_id]}
+                            for student_id in chunk
+                        ],
+                    )
+                )
+                missing = [
+                    student_id for student_id in chunk if student_id not in found
+                ]
+                archived: Set[int] = set()
+                if missing:
+                    restored = await cls._restore_students(
+                        session,
+                        [
+                            student_id
+                            for student_id in missing
+                            if "study_status" in changes[student_id]
+                            and not cls._is_archived_status(
+                                changes[student_id]["study_status"]
+                            )
+                        ],
+                    )
+                    found.update(
+                        await cls._update_rows(
+                            session,
+                            Student,
+                            field_names,
+                            [
+                                {"id": student_id, **changes[student_id]}
+                                for student_id in restored
+                            ],
+                        )
+                    )
+                    archived.update(
+                        await cls._update_rows(
+                            session,
+                            StudentArchive,
+                            field_names,
+                            [
+                                {"id": student_id, **changes[student_id]}
+                                for student_id in missing
+                                if student_id not in found
+                            ],
+                        )
+                    )
+                for student_id in chunk:
+                    if student_id not in found and student_id not in archived:
+                        failed.append(
+                            BulkUpdateErrorSchema(
+                                id=student_id,
+                                detail=RowNotFoundException.default_message,
+                            )
+                        )
+                        continue
+                    updated += 1
+                    change_feed.stage(
+                        session,
+                        "update",
+                        student_id,
+                        UpdateStudentSchema(**changes[student_id]).model_dump(
+                            mode="json", exclude_unset=True
+                        ),
+                    )
+                cls._stage_archived(session, archived)
+        await cls._secure_commit(session)
+        return BulkUpdateStudentsResultSchema(updated=updated, failed=failed)
+
+    @classmethod
+    async def upsert_students(
+        cls, session: AsyncSession, items: List[UpsertStudentSchema]
+    ) -> UpsertStudentsResultSchema:
+        """
+        Сохраняет список студентов из внешней системы одной транзакцией.
+        Студенты сопоставляются по внешнему ID: новые добавляются, существующие
+        изменяются. Список обрабатывается порциями по STUDENT_BULK_CHUNK_SIZE
+        строк одним INSERT ... ON CONFLICT DO UPDATE, студенты без изменений не
+        перезаписываются. Студенты в архиве изменяются в архиве или, при смене
+        статуса на неархивный, возвращаются из архива. При повторе внешнего ID
+        используются последние данные.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param items: Студенты из внешней системы.
+        :return: Количество добавленных, измененных и неизмененных студентов и
+            ошибки отдельных студентов.
+        """
+        students = {item.external_id: item.model_dump() for item in items}
+        existing_faculties = await cls._get_existing_faculties(
+            session,
+            {
+                fields["faculty_id"]
+                for fields in students.values()
+                if fields["faculty_id"]
+            },
+        )
+        failed: List[UpsertErrorSchema] = []
+        rows: List[Dict[str, Any]] = []
+        for external_id, fields in students.items():
+            if fields["faculty_id"] and fields["faculty_id"] not in existing_faculties:
+                failed.append(
+                    UpsertErrorSchema(
+                        external_id=external_id,
+                        detail="Факультет не найден! Сначала создайте факультет!",
+                    )
+                )
+            else:
+                rows.append(fields)
+
+        inserted = updated = 0
+        chunk_size = settings.STUDENT_BULK_CHUNK_SIZE
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk_inserted, chunk_updated = await cls._upsert_chunk(
+                    session, rows[start : start + chunk_size]
+                )
+                inserted += chunk_inserted
+                updated += chunk_updated
+        except IntegrityError as exc:
+            change_feed.discard(session)
+            await session.rollback()
+            raise IntegrityViolationException(str(exc))
+        await cls._secure_commit(session)
+        return UpsertStudentsResultSchema(
+            inserted=inserted,
+            updated=updated,
+            unchanged=len(rows) - inserted - updated,
+            failed=failed,
+        )
+
     @classmethod
     async def remove_student(
         cls, session: AsyncSession, student_id: int
     ) -> SuccessResponse:
         """
-        Удаляет студента по его ID.
+        Удаляет студента по его ID из основной таблицы или архива.
 
         :param session: Асинхронная сессия SQLAlchemy.
         :param student_id: ID студента для удаления.
         :return: Сообщение об успешном удалении.
         """
-        delete_query = (
-            delete(Student).returning(Student.id).where(Student.id == student_id)
-        )
-        await cls._execute_delete(session, delete_query)
+        delete_queries = [
+            statement_cache.get_or_build(
+                ("delete_by_id", model.__tablename__),
+                lambda: delete(model)
+                .returning(model.id)
+                .where(model.id == bindparam("student_id")),
+            )
+            for model in (Student, StudentArchive)
+        ]
+        await cls._execute_delete(session, delete_queries, {"student_id": student_id})
         return SuccessResponse(message="Студент успешно удален!")
 
     @classmethod
@@ -134,31 +781,424 @@ class StudentRepository:
         :param filters: Фильтры для удаления студентов.
         :return: Сообщение с количеством удаленных студентов.
         """
-        conditions = cls._build_conditions(filters)
-        delete_query = delete(Student).returning(Student.id).where(*conditions)
-
-        deleted_rows = await cls._execute_delete(session, delete_query)
+        deleted_rows = await cls.delete_students_with_params(session, filters)
         return SuccessResponse(message=f"Удалено {deleted_rows} студентов!")
 
+    @classmethod
+    async def delete_students_with_params(
+        cls, session: AsyncSession, filters: Dict[str, Optional[Any]]
+    ) -> int:
+        """
+        Удаляет студентов по переданным параметрам. Архив затрагивается, если
+        статус не задан или архивный.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param filters: Фильтры для удаления студентов.
+        :return: Количество удаленных студентов.
+        """
+        filter_keys = cls._filter_keys(filters)
+        delete_queries = [
+            statement_cache.get_or_build(
+                ("delete", model.__tablename__, filter_keys),
+                lambda: delete(model)
+                .returning(model.id)
+                .where(*cls._build_conditions(filter_keys, model)),
+            )
+            for model in cls._models_for_filters(filters)
+        ]
+        return await cls._execute_delete(
+            session, delete_queries, cls._filter_params(filters, filter_keys)
+        )
+
+    @classmethod
+    async def add_student_with_id(
+        cls, session: AsyncSession, student_data: ResponseStudentSchema
+    ) -> ResponseStudentSchema:
+        """
+        Добавляет студента с заранее известным ID (например, при переносе между
+        шардами). В ленту изменений публикуется событие update.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_data: Данные студента вместе с ID.
+        :return: Ответ с информацией о студенте.
+        """
+        await cls._check_faculty_exists(session, student_data.faculty_id)
+        student = Student(**student_data.model_dump())
+
+        session.add(student)
+        await cls._secure_flush(session)
+        cls._stage_students(session, "update", [student])
+        await cls._secure_commit(session)
+        return ResponseStudentSchema.model_validate(student)
+
+    @classmethod
+    async def remove_moved_student(cls, session: AsyncSession, student_id: int) -> int:
+        """
+        Удаляет копию студента, перенесенного в другой шард, из основной таблицы
+        или архива. Повторный вызов ничего не удаляет и не считается ошибкой.
+        Запись об удалении и событие удаления не создаются: студент продолжает
+        существовать в новом шарде.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_id: ID студента.
+        :return: Количество удаленных строк.
+        """
+        deleted_rows = 0
+        for model in (Student, StudentArchive):
+            result = await session.execute(
+                delete(model)
+                .where(model.id == student_id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted_rows += result.rowcount  # type: ignore[attr-defined]
+        await cls._secure_commit(session)
+        return deleted_rows
+
+    @classmethod
+    async def get_changes(
+        cls, session: AsyncSession, token: Optional[str], limit: int
+    ) -> StudentChangesSchema:
+        """
+        Получает изменения студентов после токена синхронизации.
+
+        Измененные и удаленные студенты читаются курсорами по индексам
+        (change_seq, id) основной таблицы, архива и записей об удалении без
+        OFFSET. Изменения основной таблицы и архива объединяются по курсору.
+        Номера change_seq выдаются в порядке commit (_stamp_changes), поэтому
+        транзакция, начатая раньше, но завершенная позже, получает больший номер
+        и не оказывается позади токена.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param token: Токен синхронизации из предыдущего ответа.
+        :param limit: Максимальное количество записей каждого вида.
+        :return: Изменения и токен для следующего запроса.
+        """
+        cursor = SyncToken.decode(token)
+
+        changed: List[Union[Student, StudentArchive]] = []
+        for model in (Student, StudentArchive):
+            students_query = (
+                select(model)
+                .options(joinedload(model.faculty))
+                .order_by(asc(model.change_seq), asc(model.id))
+                .limit(limit)
+            )
+            if cursor.students:
+                change_seq, student_id = cursor.students
+                students_query = students_query.where(
+                    or_(
+                        model.change_seq > change_seq,
+                        and_(model.change_seq == change_seq, model.id > student_id),
+                    )
+                )
+            changed.extend(
+                cast(
+                    Sequence[Union[Student, StudentArchive]],
+                    (await session.scalars(students_query)).all(),
+                )
+            )
+        students = sorted(
+            changed, key=lambda student: (student.change_seq, student.id)
+        )[:limit]
+
+        deleted_query = (
+            select(StudentTombstone)
+            .order_by(asc(StudentTombstone.change_seq), asc(StudentTombstone.id))
+            .limit(limit)
+        )
+        if cursor.deleted:
+            change_seq, tombstone_id = cursor.deleted
+            deleted_query = deleted_query.where(
+                or_(
+                    StudentTombstone.change_seq > change_seq,
+                    and_(
+                        StudentTombstone.change_seq == change_seq,
+                        StudentTombstone.id > tombstone_id,
+                    ),
+                )
+            )
+        tombstones = (await session.scalars(deleted_query)).all()
+
+        if students:
+            cursor.students = (students[-1].change_seq, students[-1].id)
+        if tombstones:
+            cursor.deleted = (tombstones[-1].change_seq, tombstones[-1].id)
+
+        return StudentChangesSchema(
+            students=[
+                StudentChangeSchema.model_validate(student) for student in students
+            ],
+            deleted=[tombstone.student_id for tombstone in tombstones],
+            next_token=cursor.encode(),
+            has_more=len(students) == limit or len(tombstones) == limit,
+        )
+
+    @classmethod
+    async def count_students(
+        cls, session: AsyncSession, filters: Dict[str, Optional[Any]]
+    ) -> int:
+        """
+        Подсчитывает количество студентов, соответствующих фильтрам, включая
+        архив, если статус не задан или архивный.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param filters: Словарь фильтров.
+        :return: Количество студентов.
+        """
+        filter_keys = cls._filter_keys(filters)
+        return await cls._get_total_count(
+            session,
+            filter_keys,
+            cls._filter_params(filters, filter_keys),
+            len(cls._models_for_filters(filters)) > 1,
+        )
+
+    @classmethod
+    async def get_ids_chunk(
+        cls,
+        session: AsyncSession,
+        filters: Dict[str, Optional[Any]],
+        after_id: int,
+        limit: int,
+    ) -> List[int]:
+        """
+        Возвращает очередную порцию ID студентов, соответствующих фильтрам.
+        Порции выбираются по возрастанию ID, начиная после after_id. Архив
+        учитывается, если статус не задан или архивный.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param filters: Словарь фильтров.
+        :param after_id: ID, после которого начинается порция.
+        :param limit: Размер порции.
+        :return: Список ID студентов.
+        """
+        filter_keys = cls._filter_keys(filters)
+        with_archive = len(cls._models_for_filters(filters)) > 1
+        ids_query = statement_cache.get_or_build(
+            ("ids_chunk", filter_keys, with_archive),
+            lambda: cls._build_ids_chunk_query(filter_keys, with_archive),
+        )
+        params = cls._filter_params(filters, filter_keys)
+        return list(
+            await session.scalars(
+                ids_query, {**params, "after_id": after_id, "limit": limit}
+            )
+        )
+
+    @classmethod
+    async def delete_students_by_ids(
+        cls, session: AsyncSession, student_ids: List[int]
+    ) -> int:
+        """
+        Удаляет студентов по списку ID из основной таблицы и архива без commit.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: Список ID студентов.
+        :return: Количество удаленных записей.
+        """
+        deleted_ids: List[int] = []
+        for model in (Student, StudentArchive):
+            deleted = await session.execute(
+                delete(model).returning(model.id).where(model.id.in_(student_ids))
+            )
+            deleted_ids.extend(deleted.scalars())
+        await cls._record_deleted(session, deleted_ids)
+        return len(deleted_ids)
+
+    @classmethod
+    async def update_status_by_ids(
+        cls,
+        session: AsyncSession,
+        student_ids: List[int],
+        study_status: StudentStatusEnum,
+    ) -> int:
+        """
+        Изменяет статус обучения студентов по списку ID без commit. Студенты из
+        архива при неархивном статусе возвращаются в основную таблицу, иначе
+        изменяются в архиве.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: Список ID студентов.
+        :param study_status: Новый статус обучения.
+        :return: Количество измененных записей.
+        """
+        archived = cls._is_archived_status(study_status)
+        if not archived:
+            await cls._restore_students(session, student_ids)
+
+        updated_ids: Dict[StudentModel, List[int]] = {}
+        for model in (Student, StudentArchive) if archived else (Student,):
+            updated = await session.execute(
+                update(model)
+                .returning(model.id)
+                .where(model.id.in_(student_ids))
+                .values(study_status=study_status)
+            )
+            updated_ids[model] = list(updated.scalars())
+            for student_id in updated_ids[model]:
+                change_feed.stage(
+                    session, "update", student_id, {"study_status": study_status.value}
+                )
+        cls._stage_archived(session, updated_ids.get(StudentArchive, []))
+        return sum(len(ids) for ids in updated_ids.values())
+
+    @classmethod
+    async def count_archivable(cls, session: AsyncSession, before: datetime) -> int:
+        """
+        Подсчитывает студентов основной таблицы, которых можно перенести в архив.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param before: Переносятся студенты, не изменявшиеся с этого момента.
+        :return: Количество студентов.
+        """
+        return (
+            await session.scalar(
+                select(func.count())
+                .select_from(Student)
+                .where(*cls._archivable_conditions(before))
+            )
+            or 0
+        )
+
+    @classmethod
+    async def archive_students(
+        cls, session: AsyncSession, before: datetime, after_id: int, limit: int
+    ) -> List[int]:
+        """
+        Переносит в архив очередную порцию выпускников и отчисленных студентов,
+        не изменявшихся с момента before, без commit. Порции выбираются по
+        возрастанию ID, начиная после after_id. Выбранные строки блокируются до
+        commit, а строки, заблокированные другими транзакциями, пропускаются.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param before: Переносятся студенты, не изменявшиеся с этого момента.
+        :param after_id: ID, после которого начинается порция.
+        :param limit: Размер порции.
+        :return: ID перенесенных студентов.
+        """
+        student_ids = list(
+            await session.scalars(
+                select(Student.id)
+                .where(*cls._archivable_conditions(before))
+                .where(Student.id > after_id)
+                .order_by(asc(Student.id))
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        if not student_ids:
+            return []
+
+        await session.execute(
+            insert(StudentArchive).from_select(
+                (*STUDENT_COLUMNS, "archived_at"),
+                select(
+                    *(getattr(Student, name) for name in STUDENT_COLUMNS),
+                    literal(utc_now(), DateTime(timezone=True)),
+                ).where(Student.id.in_(student_ids)),
+            )
+        )
+        await session.execute(
+            delete(Student)
+            .where(Student.id.in_(student_ids))
+            .execution_options(synchronize_session=False)
+        )
+        cls._stage_archived(session, student_ids)
+        return student_ids
+
+    @classmethod
+    async def insert_students(
+        cls, session: AsyncSession, students: List[BodyStudentSchema]
+    ) -> int:
+        """
+        Добавляет студентов одним INSERT без commit.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param students: Данные новых студентов.
+        :return: Количество добавленных записей.
+        """
+        if not students:
+            return 0
+        inserted = await session.scalars(
+            insert(Student).returning(Student, sort_by_parameter_order=True),
+            [student.model_dump() for student in students],
+        )
+        cls._stage_students(session, "create", inserted.all())
+        return len(students)
+
+    @classmethod
+    async def commit_job_chunk(
+        cls, session: AsyncSession, job: Job, worker_id: str
+    ) -> None:
+        """
+        Сохраняет изменения порции фоновой задачи вместе с ее контрольной точкой
+        одним commit. Контрольная точка записывается условным UPDATE, только
+        если задача все еще захвачена этим процессом, поэтому процесс, у
+        которого задачу перехватили как зависшую, не сохранит свою порцию.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param job: Выполняемая задача с новыми checkpoint и processed.
+        :param worker_id: ID процесса, захватившего задачу.
+        :raises JobClaimLostException: Если задачу захватил другой процесс.
+        """
+        job_id = job.id
+        fenced = await session.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.worker_id == worker_id,
+                Job.status == JobStatus.running,
+            )
+            .values(checkpoint=job.checkpoint, processed=job.processed)
+            .execution_options(synchronize_session=False)
+        )
+        if fenced.rowcount != 1:  # type: ignore[attr-defined]
+            change_feed.discard(session)
+            await session.rollback()
+            raise JobClaimLostException(job_id)
+        await cls._secure_commit(session)
+
+    @classmethod
+    async def check_faculties_exist(
+        cls, session: AsyncSession, faculty_ids: Set[int]
+    ) -> None:
+        """
+        Проверяет одним запросом, что все факультеты из набора существуют.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param faculty_ids: Набор ID факультетов.
+        """
+        if faculty_ids - await cls._get_existing_faculties(session, faculty_ids):
+            raise RowNotFoundException(
+                "Факультет не найден! Сначала создайте факультет!"
+            )
+
     @classmethod
     async def _execute_delete(
-        cls, session: AsyncSession, query: ReturningDelete
+        cls,
+        session: AsyncSession,
+        queries: Sequence[ReturningDelete],
+        params: Dict[str, Any],
     ) -> int:
         """
-        Выполняет запрос на удаление студентов.
+        Выполняет запросы на удаление студентов (из основной таблицы и архива).
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param query: Запрос на удаление.
+        :param queries: Запросы на удаление.
+        :param params: Значения параметров запросов.
         :return: Количество удаленных записей.
         """
-        request = await session.execute(query)
-        rows_deleted = len(request.fetchall())
+        deleted_ids: List[int] = []
+        for query in queries:
+            request = await session.execute(query, params)
+            deleted_ids.extend(request.scalars())
 
-        if rows_deleted == 0:
+        if not deleted_ids:
             raise RowNotFoundException()
 
+        await cls._record_deleted(session, deleted_ids)
         await cls._secure_commit(session)
-        return rows_deleted
+        return len(deleted_ids)
 
     @classmethod
     async def _check_faculty_exists(
@@ -178,42 +1218,747 @@ class StudentRepository:
             )
 
     @classmethod
-    def _build_conditions(cls, filters: Dict[str, Optional[Any]]) -> Sequence:
+    async def _get_existing_faculties(
+        cls, session: AsyncSession, faculty_ids: Set[int]
+    ) -> Set[int]:
+        """
+        Возвращает подмножество ID факультетов, которые существуют в БД.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param faculty_ids: Набор ID факультетов.
+        :return: Набор существующих ID факультетов.
+        """
+        if not faculty_ids:
+            return set()
+        return set(
+            await session.scalars(select(Faculty.id).where(Faculty.id.in_(faculty_ids)))
+        )
+
+    @classmethod
+    def _filter_keys(cls, filters: Dict[str, Optional[Any]]) -> Tuple[str, ...]:
+        """
+        Определяет набор присутствующих фильтров, который служит ключом кэша запросов.
+
+        :param filters: Словарь фильтров.
+        :return: Отсортированный кортеж имен заданных фильтров.
+        """
+        return tuple(
+            sorted(
+                key
+                for key, value in filters.items()
+                if value is not None and key not in PAGINATION_KEYS
+            )
+        )
+
+    @classmethod
+    def _filter_params(
+        cls, filters: Dict[str, Optional[Any]], filter_keys: Tuple[str, ...]
+    ) -> Dict[str, Any]:
+        """
+        Формирует значения параметров для условий, построенных _build_conditions.
+
+        :param filters: Словарь фильтров.
+        :param filter_keys: Набор присутствующих фильтров.
+        :return: Словарь значений параметров запроса.
+        """
+        return {f"filter_{key}": filters[key] for key in filter_keys}
+
+    @classmethod
+    def _is_archived_status(cls, study_status: Optional[Any]) -> bool:
+        """
+        Проверяет, может ли студент с таким статусом храниться в архиве.
+
+        :param study_status: Статус обучения (значение или элемент перечисления).
+        :return: True для выпускников и отчисленных.
+        """
+        return (
+            study_status is not None
+            and StudentStatus(study_status) in ARCHIVED_STATUSES
+        )
+
+    @classmethod
+    def _models_for_filters(
+        cls, filters: Dict[str, Optional[Any]]
+    ) -> Tuple[StudentModel, ...]:
         """
-        Формирует условия для SQL-запросов на основе переданных фильтров.
+        Определяет таблицы, которые затрагивает изменение студентов по фильтрам:
+        архив затрагивается, если статус не задан или архивный.
 
         :param filters: Словарь фильтров.
+        :return: Модели основной таблицы и, при необходимости, архива.
+        """
+        study_status = filters.get("study_status")
+        if study_status is None or cls._is_archived_status(study_status):
+            return Student, StudentArchive
+        return (Student,)
+
+    @classmethod
+    def _archivable_conditions(cls, before: datetime) -> List[ColumnElement[bool]]:
+        """
+        Формирует условия отбора студентов основной таблицы для переноса в архив.
+
+        :param before: Переносятся студенты, не изменявшиеся с этого момента.
+        :return: Список условий для SQLAlchemy.
+        """
+        return [
+            Student.study_status.in_(ARCHIVED_STATUSES),
+            Student.updated_at < before,
+        ]
+
+    @classmethod
+    def _build_conditions(
+        cls, filter_keys: Tuple[str, ...], model: StudentModel = Student
+    ) -> List[ColumnElement[bool]]:
+        """
+        Формирует условия для SQL-запросов на основе набора фильтров.
+        Значения фильтров не встраиваются в запрос, а передаются как параметры.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :param model: Модель основной таблицы или архива.
         :return: Список условий для SQLAlchemy.
         """
         return [
             (
-                getattr(Student, key) >= value
+                getattr(model, key) >= bindparam(f"filter_{key}")
                 if key == "date_of_birth"
-                else getattr(Student, key) == value
+                else getattr(model, key) == bindparam(f"filter_{key}")
             )
-            for key, value in filters.items()
-            if value is not None and key not in ("page", "limit")
+            for key in filter_keys
         ]
 
     @classmethod
-    async def _get_total_count(cls, session: AsyncSession, conditions: Sequence) -> int:
+    def _build_ids_union(cls, filter_keys: Tuple[str, ...]) -> Subquery:
+        """
+        Строит объединение ID студентов основной таблицы и архива,
+        соответствующих фильтрам.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :return: Подзапрос с колонкой id.
+        """
+        return union_all(
+            *(
+                select(model.id).where(*cls._build_conditions(filter_keys, model))
+                for model in (Student, StudentArchive)
+            )
+        ).subquery()
+
+    @classmethod
+    def _build_archive_page_ids_query(cls, filter_keys: Tuple[str, ...]) -> Select:
+        """
+        Строит запрос ID страницы студентов из основной таблицы и архива.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :return: Запрос с параметрами limit и offset.
+        """
+        ids = cls._build_ids_union(filter_keys)
+        return (
+            select(ids.c.id)
+            .order_by(asc(ids.c.id))
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset"))
+        )
+
+    @classmethod
+    def _build_ids_chunk_query(
+        cls, filter_keys: Tuple[str, ...], with_archive: bool
+    ) -> Select:
+        """
+        Строит запрос очередной порции ID студентов.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :param with_archive: Учитывать архив.
+        :return: Запрос с параметрами after_id и limit.
+        """
+        if with_archive:
+            ids = cls._build_ids_union(filter_keys)
+            return (
+                select(ids.c.id)
+                .where(ids.c.id > bindparam("after_id"))
+                .order_by(asc(ids.c.id))
+                .limit(bindparam("limit"))
+            )
+        return (
+            select(Student.id)
+            .where(*cls._build_conditions(filter_keys))
+            .where(Student.id > bindparam("after_id"))
+            .order_by(asc(Student.id))
+            .limit(bindparam("limit"))
+        )
+
+    @classmethod
+    def _build_page_versions_query(
+        cls, filter_keys: Tuple[str, ...], with_archive: bool
+    ) -> Select:
+        """
+        Строит запрос ID и времени изменения студентов страницы.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :param with_archive: Учитывать архив.
+        :return: Запрос с параметрами limit и offset.
+        """
+        models: Tuple[StudentModel, ...] = (
+            (Student, StudentArchive) if with_archive else (Student,)
+        )
+        rows = union_all(
+            *(
+                select(model.id, model.updated_at).where(
+                    *cls._build_conditions(filter_keys, model)
+                )
+                for model in models
+            )
+        ).subquery()
+        return (
+            select(rows.c.id, rows.c.updated_at)
+            .order_by(asc(rows.c.id))
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset"))
+        )
+
+    @classmethod
+    def _build_page_query(cls, filter_keys: Tuple[str, ...]) -> Select:
+        """
+        Строит запрос страницы студентов для заданного набора фильтров.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :return: Запрос с параметрами limit и offset.
+        """
+        return (
+            select(Student)
+            .options(joinedload(Student.faculty))
+            .where(*cls._build_conditions(filter_keys))
+            .order_by(asc(Student.id))
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset"))
+        )
+
+    @classmethod
+    def _build_matched_subquery(
+        cls, filter_keys: Tuple[str, ...], with_archive: bool
+    ) -> Subquery:
+        """
+        Строит подзапрос полей ответа всех студентов, подходящих под фильтры.
+
+        :param filter_keys: Набор присутствующих фильтров.
+        :param with_archive: Учитывать архив.
+        :return: Подзапрос со столбцами STUDENT_RESPONSE_COLUMNS.
+        """
+        models: Tuple[StudentModel, ...] = (
+            (Student, StudentArchive) if with_archive else (Student,)
+        )
+        return union_all(
+            *(
+                select(
+                    *(getattr(model, name) for name in STUDENT_RESPONSE_COLUMNS)
+                ).where(*cls._build_conditions(filter_keys, model))
+                for model in models
+            )
+        ).subquery("matched")
+
+    @classmethod
+    def _build_page_rows_query(cls, matched: Subquery) -> Select:
+        """
+        Строит запрос строк страницы студентов с названием факультета.
+
+        :param matched: Подзапрос _build_matched_subquery.
+        :return: Запрос со столбцами STUDENT_LIST_COLUMNS и параметрами limit
+            и offset.
+        """
+        return (
+            select(matched, Faculty.name.label("faculty_title"))
+            .outerjoin(Faculty, Faculty.id == matched.c.faculty_id)
+            .order_by(asc(matched.c.id))
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset"))
+        )
+
+    @classmethod
+    def _build_page_json_query(
+        cls, dialect: str, filter_keys: Tuple[str, ...], with_archive: bool
+    ) -> Select:
+        """
+        Строит запрос, который возвращает страницу студентов одной строкой JSON
+        в формате ResponseStudentsWithPaginationSchema.
+
+        :param dialect: Имя диалекта БД (postgresql или sqlite).
+        :param filter_keys: Набор присутствующих фильтров.
+        :param with_archive: Учитывать архив.
+        :return: Запрос с параметрами page, limit и offset.
+        """
+        matched = cls._build_matched_subquery(filter_keys, with_archive)
+        page = cls._build_page_rows_query(matched).subquery("page")
+
+        def json_object(*pairs: Tuple[str, Any]) -> ColumnElement[Any]:
+            # Ключи встраиваются в текст запроса: Postgres не выводит тип
+            # параметров json_build_object
+            function = (
+                func.json_build_object if dialect == "postgresql" else func.json_object
+            )
+            arguments: List[Any] = []
+            for key, value in pairs:
+                arguments.extend((literal_column(f"'{key}'"), value))
+            return function(*arguments)
+
+        student = json_object(*((name, page.c[name]) for name in STUDENT_LIST_COLUMNS))
+        students: ColumnElement[Any]
+        if dialect == "postgresql":
+            students = func.coalesce(
+                func.json_agg(aggregate_order_by(student, page.c.id)),
+                literal_column("'[]'::json"),
+            )
+        else:
+            students = func.json_group_array(student)
+        students = select(students).select_from(page).scalar_subquery()
+        if dialect != "postgresql":
+            # Значение подзапроса SQLite теряет признак JSON, json() его возвращает
+            students = func.json(students)
+        total = select(func.count()).select_from(matched).scalar_subquery()
+
+        return select(
+            json_object(
+                ("total", total),
+                ("page", bindparam("page", type_=Integer).cast(Integer)),
+                ("limit", bindparam("limit", type_=Integer).cast(Integer)),
+                ("students", students),
+            ).cast(Text)
+        )
+
+    @classmethod
+    async def _update_rows(
+        cls,
+        session: AsyncSession,
+        model: StudentModel,
+        field_names: Tuple[str, ...],
+        rows: List[Dict[str, Any]],
+    ) -> List[int]:
+        """
+        Применяет к студентам значения одного набора полей без commit.
+        В Postgres строки передаются одним UPDATE ... FROM (VALUES ...), в
+        остальных СУБД - одним executemany по ID.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param model: Модель основной таблицы или архива.
+        :param field_names: Изменяемые поля (одинаковые для всех строк).
+        :param rows: Значения полей вместе с ID студентов.
+        :return: ID найденных и измененных студентов.
+        """
+        if not rows:
+            return []
+        table = cast(Table, model.__table__)
+        student_ids = [row["id"] for row in rows]
+        if not field_names:
+            return list(
+                await session.scalars(select(model.id).where(model.id.in_(student_ids)))
+            )
+
+        if session.get_bind().dialect.name == "postgresql":
+            changes = values(
+                column("id", Integer),
+                *(column(name, table.c[name].type) for name in field_names),
+                name="changes",
+            ).data([tuple(row[name] for name in ("id", *field_names)) for row in rows])
+            updated = await session.scalars(
+                update(table)
+                .where(table.c.id == changes.c.id)
+                .values({name: changes.c[name] for name in field_names})
+                .returning(table.c.id)
+            )
+            return list(updated)
+
+        existing = list(
+            await session.scalars(select(model.id).where(model.id.in_(student_ids)))
+        )
+        await session.execute(
+            update(table)
+            .where(table.c.id == bindparam("student_id"))
+            .values({name: bindparam(f"new_{name}") for name in field_names}),
+            [
+                {
+                    "student_id": row["id"],
+                    **{f"new_{name}": row[name] for name in field_names},
+                }
+                for row in rows
+            ],
+        )
+        return existing
+
+    @classmethod
+    async def _upsert_chunk(
+        cls, session: AsyncSession, rows: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """
+        Сохраняет порцию студентов из внешней системы без commit и добавляет в
+        ленту изменений события о добавленных и измененных студентах.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param rows: Поля студентов с внешними ID (внешние ID не повторяются).
+        :return: Количество добавленных и измененных студентов.
+        """
+        by_external_id = {row["external_id"]: row for row in rows}
+        existing = set(
+            await session.scalars(
+                select(Student.external_id).where(
+                    Student.external_id.in_(by_external_id)
+                )
+            )
+        )
+        archived: Dict[str, int] = {
+            row.external_id: row.id
+            for row in await session.execute(
+                select(StudentArchive.external_id, StudentArchive.id).where(
+                    StudentArchive.external_id.in_(by_external_id)
+                )
+            )
+        }
+        restored = set(
+            await cls._restore_students(
+                session,
+                [
+                    student_id
+                    for external_id, student_id in archived.items()
+                    if not cls._is_archived_status(
+                        by_external_id[external_id]["study_status"]
+                    )
+                ],
+            )
+        )
+        existing.update(
+            external_id
+            for external_id, student_id in archived.items()
+            if student_id in restored
+        )
+
+        now = utc_now()
+        archive_rows = [
+            {"id": student_id, **by_external_id.pop(external_id), "updated_at": now}
+            for external_id, student_id in archived.items()
+            if student_id not in restored
+        ]
+        saved = await cls._upsert_rows(
+            session,
+            Student,
+            [{**row, "updated_at": now} for row in by_external_id.values()],
+        )
+        saved_in_archive = await cls._upsert_rows(session, StudentArchive, archive_rows)
+
+        inserted = 0
+        for row in saved:
+            created = row.external_id not in existing
+            inserted += created
+            change_feed.stage(
+                session,
+                "create" if created else "update",
+                row.id,
+                ResponseStudentSchema.model_validate(row).model_dump(mode="json"),
+            )
+        for row in saved_in_archive:
+            change_feed.stage(
+                session,
+                "update",
+                row.id,
+                ResponseStudentSchema.model_validate(row).model_dump(mode="json"),
+            )
+        cls._stage_archived(session, [row.id for row in saved_in_archive])
+        return inserted, len(saved) + len(saved_in_archive) - inserted
+
+    @classmethod
+    async def _upsert_rows(
+        cls,
+        session: AsyncSession,
+        model: StudentModel,
+        rows: List[Dict[str, Any]],
+    ) -> Sequence[Row[Any]]:
+        """
+        Добавляет или изменяет студентов по внешнему ID одним
+        INSERT ... ON CONFLICT DO UPDATE (Postgres и SQLite) без commit.
+        Существующая строка изменяется, только если отличается хотя бы одно
+        поле, поэтому студенты без изменений не перезаписываются и не
+        возвращаются.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param model: Модель основной таблицы или архива.
+        :param rows: Поля студентов с внешним ID и временем изменения
+            (одинаковый набор полей для всех строк).
+        :return: Добавленные и измененные строки: ID, внешний ID и поля ответа.
+        """
+        if not rows:
+            return []
+        table = cast(Table, model.__table__)
+        statement: Union[PostgresqlInsert, SqliteInsert]
+        if session.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(table)
+        else:
+            statement = sqlite_insert(table)
+        field_names = [
+            name for name in rows[0] if name not in ("id", "external_id", "updated_at")
+        ]
+        upsert = statement.on_conflict_do_update(
+            index_elements=[table.c.external_id],
+            set_={
+                name: statement.excluded[name] for name in (*field_names, "updated_at")
+            },
+            where=or_(
+                *(
+                    table.c[name].is_distinct_from(statement.excluded[name])
+                    for name in field_names
+                )
+            ),
+        ).returning(
+            table.c.id,
+            table.c.external_id,
+            *(table.c[name] for name in STUDENT_RESPONSE_COLUMNS),
+        )
+        return (await session.execute(upsert, rows)).all()
+
+    @classmethod
+    def _build_by_ids_query(cls, dialect: str, model: StudentModel) -> Select:
+        """
+        Строит запрос студентов по списку ID. В Postgres список передается одним
+        параметром-массивом (id = ANY(:student_ids)), поэтому текст запроса не
+        зависит от количества ID и подготавливается один раз.
+
+        :param dialect: Имя диалекта БД.
+        :param model: Модель основной таблицы или архива.
+        :return: Запрос с параметром student_ids.
+        """
+        if dialect == "postgresql":
+            condition = model.id == any_(bindparam("student_ids", type_=ARRAY(Integer)))
+        else:
+            condition = model.id.in_(bindparam("student_ids", expanding=True))
+        return select(model).options(joinedload(model.faculty)).where(condition)
+
+    @classmethod
+    async def _get_total_count(
+        cls,
+        session: AsyncSession,
+        filter_keys: Tuple[str, ...],
+        params: Dict[str, Any],
+        with_archive: bool = False,
+    ) -> int:
         """
         Подсчитывает общее количество студентов, соответствующих условиям.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param conditions: Условия для подсчета.
+        :param filter_keys: Набор присутствующих фильтров.
+        :param params: Значения фильтров.
+        :param with_archive: Учитывать архив.
         :return: Количество студентов.
         """
-        count_query = select(func.count()).select_from(Student).where(*conditions)
-        return (await session.execute(count_query)).scalar() or 0
+        count_query = statement_cache.get_or_build(
+            ("count", filter_keys, with_archive),
+            lambda: (
+                select(func.count()).select_from(cls._build_ids_union(filter_keys))
+                if with_archive
+                else select(func.count())
+                .select_from(Student)
+                .where(*cls._build_conditions(filter_keys))
+            ),
+        )
+        return (await session.execute(count_query, params)).scalar() or 0
+
+    @classmethod
+    def _stage_students(
+        cls,
+        session: AsyncSession,
+        action: str,
+        students: Sequence[Union[Student, StudentArchive]],
+    ) -> None:
+        """
+        Добавляет в ленту изменений события о созданных или измененных студентах.
+        События будут опубликованы после commit.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param action: Тип изменения: create или update.
+        :param students: Созданные или измененные студенты.
+        """
+        for student in students:
+            change_feed.stage(
+                session,
+                action,
+                student.id,
+                ResponseStudentSchema.model_validate(student).model_dump(mode="json"),
+            )
+
+    @classmethod
+    def _stage_archived(cls, session: AsyncSession, student_ids: Iterable[int]) -> None:
+        """
+        Добавляет в ленту изменений служебные события archive о студентах,
+        которые находятся в архиве. Событие добавляется и после изменения
+        студента в архиве, чтобы обработчики (хранилище в памяти) не приняли
+        событие update за студента основной таблицы.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: ID студентов в архиве.
+        """
+        for student_id in student_ids:
+            change_feed.stage(session, "archive", student_id)
+
+    @classmethod
+    async def _restore_students(
+        cls, session: AsyncSession, student_ids: List[int]
+    ) -> List[int]:
+        """
+        Возвращает студентов из архива в основную таблицу с теми же ID без
+        commit. В ленту изменений добавляются служебные события restore со
+        всеми полями студентов.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: ID студентов (отсутствующие в архиве пропускаются).
+        :return: ID возвращенных студентов.
+        """
+        if not student_ids:
+            return []
+        archived = (
+            await session.scalars(
+                select(StudentArchive)
+                .options(joinedload(StudentArchive.faculty))
+                .where(StudentArchive.id.in_(student_ids))
+            )
+        ).all()
+        if not archived:
+            return []
+
+        restored_ids = [student.id for student in archived]
+        await session.execute(
+            insert(Student),
+            [
+                {name: getattr(student, name) for name in STUDENT_COLUMNS}
+                for student in archived
+            ],
+        )
+        await session.execute(
+            delete(StudentArchive).where(StudentArchive.id.in_(restored_ids))
+        )
+        cls._stage_students(session, "restore", archived)
+        return restored_ids
+
+    @classmethod
+    async def _record_deleted(
+        cls, session: AsyncSession, student_ids: List[int]
+    ) -> None:
+        """
+        Сохраняет записи об удаленных студентах для инкрементальной синхронизации
+        и добавляет в ленту изменений события об удалении.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param student_ids: ID удаленных студентов.
+        """
+        if not student_ids:
+            return
+        await session.execute(
+            insert(StudentTombstone),
+            [{"student_id": student_id} for student_id in student_ids],
+        )
+        for student_id in student_ids:
+            change_feed.stage(session, "delete", student_id)
+
+    @classmethod
+    async def _secure_flush(cls, session: AsyncSession) -> None:
+        """
+        Безопасно выполняет flush изменений сессии.
+        """
+        try:
+            await session.flush()
+        except IntegrityError as exc:
+            change_feed.discard(session)
+            await session.rollback()
+            raise IntegrityViolationException(str(exc))
+
+    @classmethod
+    async def _stamp_changes(cls, session: AsyncSession) -> None:
+        """
+        Записывает номер commit (ChangeSequence) в студентов и записи об
+        удалении, измененные транзакцией (по событиям ленты изменений), и
+        присваивает событиям ID. Счетчик увеличивается на количество событий
+        непосредственно перед commit, а блокировка его строки держится до конца
+        транзакции, поэтому номера следуют порядку commit и курсор синхронизации
+        не обгоняет незавершенные транзакции.
+        """
+        events = change_feed.pending(session)
+        if not events:
+            return
+        change_seq = await cls._next_change_seq(session, len(events))
+        change_feed.number(session, change_seq - len(events) + 1)
+        changed = sorted({e.student_id for e in events if e.action != "delete"})
+        deleted = sorted({e.student_id for e in events if e.action == "delete"})
+        chunk_size = settings.STUDENT_BULK_CHUNK_SIZE
+        for start in range(0, len(changed), chunk_size):
+            chunk = changed[start : start + chunk_size]
+            for model in (Student, StudentArchive):
+                await session.execute(
+                    update(model)
+                    .where(model.id.in_(chunk))
+                    # Время изменения остается временем самого изменения
+                    .values(change_seq=change_seq, updated_at=model.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+        for start in range(0, len(deleted), chunk_size):
+            await session.execute(
+                update(StudentTombstone)
+                .where(
+                    StudentTombstone.student_id.in_(
+                        deleted[start : start + chunk_size]
+                    ),
+                    StudentTombstone.change_seq == 0,
+                )
+                .values(change_seq=change_seq)
+                .execution_options(synchronize_session=False)
+            )
+
+    @classmethod
+    async def _next_change_seq(cls, session: AsyncSession, count: int) -> int:
+        """
+        Увеличивает счетчик commit на count и возвращает новое значение
+        (номера value - count + 1 ... value принадлежат транзакции). Строка
+        счетчика остается заблокированной до конца транзакции.
+        """
+        statement: Union[PostgresqlInsert, SqliteInsert]
+        if session.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(ChangeSequence)
+        else:
+            statement = sqlite_insert(ChangeSequence)
+        increment = (
+            statement.values(id=1, value=count)
+            .on_conflict_do_update(
+                index_elements=[ChangeSequence.id],
+                set_={"value": ChangeSequence.value + count},
+            )
+            .returning(ChangeSequence.value)
+        )
+        return (await session.execute(increment)).scalar_one()
 
     @classmethod
     async def _secure_commit(cls, session: AsyncSession) -> None:
         """
-        Безопасно выполняет commit в базу данных.
+        Безопасно выполняет commit в базу данных и публикует накопленные события
+        ленты изменений.
         """
         try:
+            await cls._stamp_changes(session)
+            await change_feed.before_commit(session)
             await session.commit()
         except IntegrityError as exc:
+            change_feed.discard(session)
             await session.rollback()
             raise IntegrityViolationException(str(exc))
+        change_feed.after_commit(session)
+
+
+async def _clear_caches() -> None:
+    """Сбрасывает кэши, которые могли пропустить события при разрыве LISTEN."""
+    student_cache.clear()
+    fragment_cache.clear()
+
+
+# Записи кэша студентов и кэша фрагментов JSON сбрасываются при любом
+# изменении студента, а кэши целиком - после восстановления LISTEN
+change_feed.add_hook(student_cache.apply)
+change_feed.add_hook(fragment_cache.apply)
+change_feed.add_reconnect_hook(_clear_caches)
+
+# Групповая запись одиночных добавлений студентов (по умолчанию включена только
+# для SQLite)
+create_batcher: WriteBatcher[BodyStudentSchema, ResponseStudentSchema] = WriteBatcher(
+    StudentRepository._insert_students_batch,
+    window_ms=settings.create_batch_window_ms(),
+    max_size=settings.CREATE_BATCH_MAX_SIZE,
+)
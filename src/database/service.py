@@ -1,22 +1,119 @@
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, Any, AsyncGenerator, Tuple
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from src.database.config import settings
+from src.database.deadline import install_statement_timeouts
 from src.database.models import Base
+from src.database.slow_queries import slow_query_log
+from src.database.sqlite import install_pragmas, use_immediate_transactions
+from src.middleware.utils import READ_METHODS
 
-# Создаем движок
-DB_URL = settings.db_url(driver="asyncpg")
-engine = create_async_engine(DB_URL)
+# Асинхронные драйверы поддерживаемых СУБД
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
-# Фабрика сессий
+
+def make_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    """
+    Создает асинхронный движок SQLAlchemy с настройками приложения.
+
+    :param url: URL базы данных.
+    :param kwargs: Дополнительные параметры create_async_engine (например, poolclass).
+    :return: Асинхронный движок.
+    """
+    connect_args = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = (
+            settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        )
+    engine = create_async_engine(url, connect_args=connect_args, **kwargs)
+    if engine.dialect.name == "sqlite":
+        install_pragmas(engine)
+    return engine
+
+
+def make_write_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    """
+    Создает движок для записи. В SQLite это единственное соединение, которое
+    транзакции ждут в очереди (не дольше SQLITE_WRITE_TIMEOUT_SECONDS) и
+    начинают с BEGIN IMMEDIATE, для остальных СУБД - обычный движок.
+
+    :param url: URL базы данных.
+    :param kwargs: Дополнительные параметры create_async_engine.
+    :return: Асинхронный движок.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        return make_engine(url, **kwargs)
+    engine = make_engine(
+        url,
+        **{
+            **kwargs,
+            "pool_size": 1,
+            "max_overflow": 0,
+            "pool_timeout": settings.SQLITE_WRITE_TIMEOUT_SECONDS,
+        },
+    )
+    use_immediate_transactions(engine)
+    return engine
+
+
+def make_engines(url: str, **kwargs: Any) -> Tuple[AsyncEngine, AsyncEngine]:
+    """
+    Создает движки для записи и для чтения. В SQLite одновременно пишет только
+    одно соединение, поэтому запись выполняется через единственное соединение
+    движка записи: транзакции записи ждут его в очереди (не дольше
+    SQLITE_WRITE_TIMEOUT_SECONDS) и не получают ошибку database is locked.
+    Чтение в режиме WAL не блокируется записью и выполняется через пул из
+    SQLITE_READ_POOL_SIZE соединений. Для Postgres это один и тот же движок.
+
+    Очередь записи не объединяет транзакции: каждая выполняет свой commit.
+    Пакетами с одним commit записываются только одиночные добавления студентов
+    (create_batcher, для SQLite включен по умолчанию).
+
+    :param url: URL базы данных.
+    :param kwargs: Дополнительные параметры create_async_engine.
+    :return: Движок записи и движок чтения.
+    """
+    write_engine = make_write_engine(url, **kwargs)
+    if write_engine.dialect.name != "sqlite":
+        return write_engine, write_engine
+
+    read_engine = make_engine(
+        url,
+        **{**kwargs, "pool_size": settings.SQLITE_READ_POOL_SIZE, "max_overflow": 0},
+    )
+    return write_engine, read_engine
+
+
+# Создаем движки записи и чтения
+DB_URL = settings.db_url(driver=ASYNC_DRIVERS[settings.DB_BACKEND])
+engine, read_engine = make_engines(DB_URL)
+
+# Запросы к БД ограничиваются оставшимся сроком выполнения HTTP-запроса
+install_statement_timeouts()
+
+# Медленные запросы всех движков записываются в журнал
+slow_query_log.install()
+
+# Фабрики сессий для записи (по умолчанию) и для запросов, которые только читают
 async_session = async_sessionmaker(bind=engine, expire_on_commit=False)
+read_session = async_sessionmaker(bind=read_engine, expire_on_commit=False)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Асинхронный генератор сессии БД."""
-    async with async_session() as session:
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Асинхронный генератор сессии БД. Запросы GET, HEAD и OPTIONS получают
+    сессию движка чтения.
+    """
+    factory = read_session if request.method in READ_METHODS else async_session
+    async with factory() as session:
         yield session
 
 
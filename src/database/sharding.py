@@ -0,0 +1,601 @@
+import asyncio
+import heapq
+import itertools
+from collections import defaultdict
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Mapper, object_session
+
+from src.database.change_feed import change_feed
+from src.database.config import settings
+from src.database.models import Student, StudentArchive
+from src.database.repository import StudentRepository
+from src.database.service import make_write_engine
+from src.database.student_cache import student_cache
+from src.handlers.custom_exceptions import RowNotFoundException
+from src.logger import get_logger
+from src.schemas.base_schemas import SuccessResponse
+from src.schemas.student_schemas import (
+    BodyStudentSchema,
+    BulkUpdateErrorSchema,
+    BulkUpdateStudentSchema,
+    BulkUpdateStudentsResultSchema,
+    GetStudentSchema,
+    ResponseStudentSchema,
+    ResponseStudentsWithPaginationSchema,
+    UpdateStudentSchema,
+)
+
+logger = get_logger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+# Ключ в session.info с номером шарда и количеством шардов
+SHARD_INFO_KEY = "shard"
+
+
+def next_shard_id(max_id: int, shard: int, count: int) -> int:
+    """
+    Вычисляет следующий ID студента в шарде. ID студентов шарда дают остаток
+    shard при делении (ID - 1) на count, поэтому ID уникальны во всех шардах,
+    а шард студента определяется по его ID без запросов к БД.
+
+    :param max_id: Максимальный ID студента в шарде.
+    :param shard: Номер шарда.
+    :param count: Количество шардов.
+    :return: Следующий ID.
+    """
+    candidate = max_id + 1
+    return candidate + (shard - (candidate - 1)) % count
+
+
+def _allocate_student_id(mapper: Mapper, connection: Connection, target: Any) -> None:
+    """
+    Назначает ID новому студенту шарда. В Postgres ID выдает последовательность,
+    настроенная ShardRouter.prepare, для остальных СУБД ID вычисляется здесь.
+    Транзакции шарда SQLite начинаются с BEGIN IMMEDIATE, поэтому максимальный ID
+    не меняется до commit.
+    """
+    session = object_session(target)
+    shard_info = session.info.get(SHARD_INFO_KEY) if session else None
+    if (
+        shard_info is None
+        or target.id is not None
+        or connection.dialect.name == "postgresql"
+    ):
+        return
+    # ID студентов архива тоже заняты
+    max_id = max(
+        connection.scalar(select(func.max(Student.id))) or 0,
+        connection.scalar(select(func.max(StudentArchive.id))) or 0,
+    )
+    target.id = next_shard_id(max_id, *shard_info)
+
+
+class ShardRouter:
+    """
+    Маршрутизатор запросов по шардам.
+
+    Студенты распределяются по шардам по факультету. Таблица факультетов
+    является справочной и должна быть одинаковой во всех шардах.
+    """
+
+    def __init__(
+        self,
+        session_factories: Sequence[async_sessionmaker[AsyncSession]],
+        faculty_shards: Optional[Dict[int, int]] = None,
+    ) -> None:
+        self.session_factories = list(session_factories)
+        self.faculty_shards = faculty_shards or {}
+        if not event.contains(Student, "before_insert", _allocate_student_id):
+            event.listen(Student, "before_insert", _allocate_student_id)
+
+    @classmethod
+    def from_urls(
+        cls, urls: Sequence[str], faculty_shards: Optional[Dict[int, int]] = None
+    ) -> "ShardRouter":
+        """
+        Создает маршрутизатор с движками для каждого URL. Шард SQLite работает
+        через единственное соединение с BEGIN IMMEDIATE (как движок записи
+        основной БД), поэтому одновременные добавления не вычисляют один и тот
+        же ID студента.
+
+        :param urls: URL баз данных шардов.
+        :param faculty_shards: Явное соответствие факультет -> номер шарда.
+        :return: Маршрутизатор.
+        """
+        factories = [
+            async_sessionmaker(
+                bind=make_write_engine(url),
+                expire_on_commit=False,
+                info={SHARD_INFO_KEY: (index, len(urls))},
+            )
+            for index, url in enumerate(urls)
+        ]
+        return cls(factories, faculty_shards)
+
+    @property
+    def enabled(self) -> bool:
+        """Включено ли шардирование."""
+        return bool(self.session_factories)
+
+    @property
+    def count(self) -> int:
+        """Количество шардов."""
+        return len(self.session_factories)
+
+    def session(self, shard: int) -> AsyncSession:
+        """
+        Создает сессию шарда.
+
+        :param shard: Номер шарда.
+        :return: Асинхронная сессия SQLAlchemy.
+        """
+        return self.session_factories[shard]()
+
+    def engine(self, shard: int) -> AsyncEngine:
+        """
+        Возвращает движок шарда.
+
+        :param shard: Номер шарда.
+        :return: Асинхронный движок.
+        """
+        bind = self.session_factories[shard].kw["bind"]
+        assert isinstance(bind, AsyncEngine)
+        return bind
+
+    def shard_for_faculty(self, faculty_id: Optional[int]) -> int:
+        """
+        Определяет шард, в котором хранятся студенты факультета.
+
+        :param faculty_id: ID факультета.
+        :return: Номер шарда.
+        """
+        if faculty_id is None:
+            return 0
+        return self.faculty_shards.get(faculty_id, faculty_id % self.count)
+
+    def home_shard(self, student_id: int) -> int:
+        """
+        Определяет шард, в котором студент был создан.
+
+        :param student_id: ID студента.
+        :return: Номер шарда.
+        """
+        return (student_id - 1) % self.count
+
+    def shards_for_filters(self, filters: Dict[str, Optional[Any]]) -> List[int]:
+        """
+        Определяет шарды, в которых могут быть студенты, подходящие под фильтры.
+        Фильтр по факультету позволяет обратиться к одному шарду.
+
+        :param filters: Словарь фильтров.
+        :return: Номера шардов.
+        """
+        faculty_id = filters.get("faculty_id")
+        if faculty_id is not None:
+            return [self.shard_for_faculty(faculty_id)]
+        return list(range(self.count))
+
+    async def run(
+        self,
+        shard: int,
+        func: Callable[[AsyncSession], Awaitable[ResultT]],
+    ) -> ResultT:
+        """
+        Выполняет функцию в отдельной сессии шарда.
+
+        :param shard: Номер шарда.
+        :param func: Функция, принимающая сессию.
+        :return: Результат функции.
+        """
+        async with self.session(shard) as session:
+            return await func(session)
+
+    async def gather(
+        self,
+        shards: Sequence[int],
+        func: Callable[[AsyncSession], Awaitable[ResultT]],
+    ) -> List[ResultT]:
+        """
+        Выполняет функцию во всех указанных шардах параллельно.
+
+        :param shards: Номера шардов.
+        :param func: Функция, принимающая сессию.
+        :return: Результаты в порядке шардов.
+        """
+        return list(await asyncio.gather(*(self.run(shard, func) for shard in shards)))
+
+    async def locate(self, student_id: int) -> int:
+        """
+        Находит шард, в котором хранится студент. Сначала проверяется шард, в
+        котором студент был создан, затем остальные (если студент был перенесен
+        при смене факультета). Студент ищется в основной таблице и в архиве.
+
+        :param student_id: ID студента.
+        :return: Номер шарда.
+        """
+        home = self.home_shard(student_id)
+
+        async def exists(session: AsyncSession) -> bool:
+            return (
+                await session.get(Student, student_id) is not None
+                or await session.get(StudentArchive, student_id) is not None
+            )
+
+        if await self.run(home, exists):
+            return home
+        others = [shard for shard in range(self.count) if shard != home]
+        for shard, found in zip(others, await self.gather(others, exists)):
+            if found:
+                return shard
+        raise RowNotFoundException()
+
+    async def prepare(self) -> None:
+        """
+        Настраивает последовательности ID студентов в шардах Postgres так, чтобы
+        они выдавали ID только своего шарда, и подписывает ленту изменений на
+        события каждого шарда (NOTIFY доставляется только слушателям той же БД).
+        """
+        for shard in range(self.count):
+            engine = self.engine(shard)
+            await change_feed.start_listener(engine)
+            if engine.dialect.name != "postgresql":
+                continue
+            async with engine.begin() as connection:
+                sequence = await connection.scalar(
+                    text("SELECT pg_get_serial_sequence('students', 'id')")
+                )
+                max_id = max(
+                    await connection.scalar(select(func.max(Student.id))) or 0,
+                    await connection.scalar(select(func.max(StudentArchive.id))) or 0,
+                )
+                next_id = next_shard_id(max_id, shard, self.count)
+                await connection.execute(
+                    text(f"ALTER SEQUENCE {sequence} INCREMENT BY {self.count}")
+                )
+                if next_id > self.count:
+                    await connection.execute(
+                        text("SELECT setval(:sequence, :value, true)"),
+                        {"sequence": sequence, "value": next_id - self.count},
+                    )
+                else:
+                    await connection.execute(
+                        text("SELECT setval(:sequence, :value, false)"),
+                        {"sequence": sequence, "value": next_id},
+                    )
+
+    async def dispose(self) -> None:
+        """
+        Закрывает соединения всех шардов.
+        """
+        for shard in range(self.count):
+            await self.engine(shard).dispose()
+
+
+class ShardedStudentRepository:
+    """
+    Репозиторий студентов поверх шардов. Операции с одним студентом выполняются
+    в его шарде, список студентов собирается со всех подходящих шардов.
+    """
+
+    @classmethod
+    async def add_new_student(
+        cls, router: ShardRouter, student_data: BodyStudentSchema
+    ) -> ResponseStudentSchema:
+        """
+        Добавляет нового студента в шард его факультета.
+
+        :param router: Маршрутизатор шардов.
+        :param student_data: Данные нового студента.
+        :return: Ответ с информацией о созданном студенте.
+        """
+        return await router.run(
+            router.shard_for_faculty(student_data.faculty_id),
+            lambda session: StudentRepository._insert_student(session, student_data),
+        )
+
+    @classmethod
+    async def get_students(
+        cls, router: ShardRouter, filters: Dict[str, Optional[Any]]
+    ) -> ResponseStudentsWithPaginationSchema:
+        """
+        Получает список студентов со всех подходящих шардов. Каждый шард отдает
+        первые page * limit студентов по возрастанию ID, после слияния остается
+        запрошенная страница, поэтому порядок совпадает с порядком в одной БД.
+
+        :param router: Маршрутизатор шардов.
+        :param filters: Словарь с фильтрами (например, limit, page, date_of_birth и др.).
+        :return: Объект с информацией о студентах и пагинацией.
+        """
+        limit_value = filters.get("limit") or 10
+        page_value = filters.get("page") or 1
+        offset_value = (page_value - 1) * limit_value
+        shard_filters = {**filters, "page": 1, "limit": offset_value + limit_value}
+
+        pages = await router.gather(
+            router.shards_for_filters(filters),
+            lambda session: StudentRepository.get_students(session, shard_filters),
+        )
+        merged = heapq.merge(
+            *(shard_page.students for shard_page in pages),
+            key=lambda student: student.id,
+        )
+
+        return ResponseStudentsWithPaginationSchema(
+            total=sum(shard_page.total for shard_page in pages),
+            page=page_value,
+            limit=limit_value,
+            students=list(
+                itertools.islice(merged, offset_value, offset_value + limit_value)
+            ),
+        )
+
+    @classmethod
+    async def get_student(
+        cls, router: ShardRouter, student_id: int
+    ) -> GetStudentSchema:
+        """
+        Получает студента по его ID.
+
+        :param router: Маршрутизатор шардов.
+        :param student_id: ID студента.
+        :return: Информация о студенте.
+        """
+        students = await cls.get_students_by_ids(router, [student_id])
+        if not students:
+            raise RowNotFoundException()
+        return students[0]
+
+    @classmethod
+    async def get_students_by_ids(
+        cls, router: ShardRouter, student_ids: Sequence[int]
+    ) -> List[GetStudentSchema]:
+        """
+        Получает студентов по списку ID через кэш студентов. Отсутствующие в кэше
+        студенты запрашиваются одним запросом в каждом шарде.
+
+        :param router: Маршрутизатор шардов.
+        :param student_ids: ID студентов.
+        :return: Найденные студенты в порядке запрошенных ID.
+        """
+        found = await student_cache.get_or_load(
+            student_ids, lambda missing: cls._load_students_by_ids(router, missing)
+        )
+        return [
+            found[student_id]
+            for student_id in dict.fromkeys(student_ids)
+            if student_id in found
+        ]
+
+    @classmethod
+    async def _load_students_by_ids(
+        cls, router: ShardRouter, student_ids: List[int]
+    ) -> List[GetStudentSchema]:
+        """
+        Загружает студентов по списку ID: сначала из шардов, в которых они были
+        созданы, затем ненайденных - из остальных шардов (студенты, перенесенные
+        при смене факультета).
+
+        :param router: Маршрутизатор шардов.
+        :param student_ids: ID студентов.
+        :return: Найденные студенты.
+        """
+        ids_by_shard: Dict[int, List[int]] = defaultdict(list)
+        for student_id in student_ids:
+            ids_by_shard[router.home_shard(student_id)].append(student_id)
+
+        pages = await asyncio.gather(
+            *(
+                router.run(
+                    shard,
+                    partial(StudentRepository.load_students_by_ids, student_ids=ids),
+                )
+                for shard, ids in ids_by_shard.items()
+            )
+        )
+        students = [student for page in pages for student in page]
+
+        moved = sorted(set(student_ids) - {student.id for student in students})
+        if moved:
+            others = await router.gather(
+                range(router.count),
+                lambda session: StudentRepository.load_students_by_ids(session, moved),
+            )
+            students.extend(student for page in others for student in page)
+        return students
+
+    @classmethod
+    async def update_student(
+        cls, router: ShardRouter, student_id: int, student_data: UpdateStudentSchema
+    ) -> ResponseStudentSchema:
+        """
+        Обновляет информацию о студенте. При смене факультета на факультет другого
+        шарда студент переносится: сначала добавляется в новый шард с тем же ID,
+        затем удаляется из прежнего.
+
+        Перенос не атомарен. Если удаление из прежнего шарда не удалось после
+        всех попыток, запрос завершается ошибкой, а студент остается в обоих
+        шардах (чтение может вернуть прежнюю копию). Повтор того же запроса
+        завершает перенос: студент уже есть в новом шарде, поэтому он
+        обновляется там, а копия в прежнем шарде удаляется.
+
+        :param router: Маршрутизатор шардов.
+        :param student_id: ID студента, которого нужно обновить.
+        :param student_data: Данные для обновления.
+        :return: Обновленная информация о студенте.
+        """
+        source = await router.locate(student_id)
+        changes = student_data.model_dump(exclude_unset=True)
+        target = source
+        if "faculty_id" in changes:
+            target = router.shard_for_faculty(changes["faculty_id"])
+
+        if target == source:
+            return await router.run(
+                source,
+                lambda session: StudentRepository.update_student(
+                    session, student_id, student_data
+                ),
+            )
+
+        async with router.session(source) as source_session:
+            student: Optional[Union[Student, StudentArchive]] = (
+                await source_session.get(Student, student_id)
+                or await source_session.get(StudentArchive, student_id)
+            )
+            if not student:
+                raise RowNotFoundException()
+            moved = ResponseStudentSchema.model_validate(
+                {
+                    **ResponseStudentSchema.model_validate(student).model_dump(),
+                    **changes,
+                }
+            )
+
+        # Студент уже есть в новом шарде, если предыдущий перенос не удалил его
+        # из прежнего
+        existing = await router.run(
+            target,
+            partial(StudentRepository.load_students_by_ids, student_ids=[student_id]),
+        )
+        if existing:
+            result = await router.run(
+                target,
+                lambda session: StudentRepository.update_student(
+                    session, student_id, student_data
+                ),
+            )
+        else:
+            result = await router.run(
+                target,
+                lambda session: StudentRepository.add_student_with_id(session, moved),
+            )
+        await cls._remove_moved_student(router, source, student_id)
+        # Копия в прежнем шарде могла попасть в кэш после события update
+        student_cache.invalidate(student_id)
+        return result
+
+    @classmethod
+    async def _remove_moved_student(
+        cls, router: ShardRouter, shard: int, student_id: int
+    ) -> None:
+        """
+        Удаляет копию перенесенного студента из прежнего шарда, повторяя
+        удаление при ошибках БД. Удаление идемпотентно, поэтому повтор после
+        ошибки на этапе commit безопасен.
+
+        :param router: Маршрутизатор шардов.
+        :param shard: Номер прежнего шарда.
+        :param student_id: ID студента.
+        """
+        attempts = settings.SHARD_MOVE_DELETE_RETRIES
+        for attempt in range(1, attempts + 1):
+            try:
+                await router.run(
+                    shard,
+                    partial(
+                        StudentRepository.remove_moved_student, student_id=student_id
+                    ),
+                )
+                return
+            except SQLAlchemyError:
+                if attempt == attempts:
+                    logger.exception(
+                        "Студент %s перенесен, но остался в шарде %s",
+                        student_id,
+                        shard,
+                    )
+                    raise
+                await asyncio.sleep(
+                    settings.SHARD_MOVE_DELETE_BACKOFF_MS * attempt / 1000
+                )
+
+    @classmethod
+    async def bulk_update_students(
+        cls, router: ShardRouter, items: List[BulkUpdateStudentSchema]
+    ) -> BulkUpdateStudentsResultSchema:
+        """
+        Применяет изменения многих студентов. Студенты могут находиться в разных
+        шардах и переноситься между шардами при смене факультета, поэтому
+        изменения применяются по одному через update_student.
+
+        :param router: Маршрутизатор шардов.
+        :param items: Изменения студентов.
+        :return: Количество измененных студентов и ошибки отдельных изменений.
+        """
+        updated = 0
+        failed: List[BulkUpdateErrorSchema] = []
+        for item in items:
+            student_data = UpdateStudentSchema(
+                **item.model_dump(exclude_unset=True, exclude={"id"})
+            )
+            try:
+                await cls.update_student(router, item.id, student_data)
+            except RowNotFoundException as exc:
+                failed.append(BulkUpdateErrorSchema(id=item.id, detail=exc.detail))
+            else:
+                updated += 1
+        return BulkUpdateStudentsResultSchema(updated=updated, failed=failed)
+
+    @classmethod
+    async def remove_student(
+        cls, router: ShardRouter, student_id: int
+    ) -> SuccessResponse:
+        """
+        Удаляет студента по его ID.
+
+        :param router: Маршрутизатор шардов.
+        :param student_id: ID студента для удаления.
+        :return: Сообщение об успешном удалении.
+        """
+        return await router.run(
+            await router.locate(student_id),
+            lambda session: StudentRepository.remove_student(session, student_id),
+        )
+
+    @classmethod
+    async def remove_students_with_params(
+        cls, router: ShardRouter, filters: Dict[str, Optional[Any]]
+    ) -> SuccessResponse:
+        """
+        Удаляет студентов по переданным параметрам во всех подходящих шардах.
+
+        :param router: Маршрутизатор шардов.
+        :param filters: Фильтры для удаления студентов.
+        :return: Сообщение с количеством удаленных студентов.
+        """
+
+        async def delete(session: AsyncSession) -> int:
+            try:
+                return await StudentRepository.delete_students_with_params(
+                    session, filters
+                )
+            except RowNotFoundException:
+                return 0
+
+        deleted_rows = sum(
+            await router.gather(router.shards_for_filters(filters), delete)
+        )
+        if not deleted_rows:
+            raise RowNotFoundException()
+        return SuccessResponse(message=f"Удалено {deleted_rows} студентов!")
+
+
+# Маршрутизатор шардов приложения (выключен, если DB_SHARD_URLS не заданы)
+shard_router = ShardRouter.from_urls(settings.DB_SHARD_URLS, settings.DB_SHARD_MAP)
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+ResultT = TypeVar("ResultT")
+
+
+class SingleFlight(Generic[ResultT]):
+    """
+    Объединение одновременных одинаковых вызовов.
+
+    Первый вызов с данным ключом (ведущий) выполняет работу, а остальные вызовы,
+    пришедшие до ее завершения, ожидают и получают тот же результат или то же
+    исключение. Если ведущий вызов отменен, один из ожидающих выполняет работу сам.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future[ResultT]] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def run(
+        self, key: Hashable, func: Callable[[], Awaitable[ResultT]]
+    ) -> ResultT:
+        """
+        Выполняет func или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+        :param key: Ключ, определяющий одинаковые вызовы.
+        :param func: Функция, выполняющая работу.
+        :return: Результат func.
+        """
+        while (in_flight := self._calls.get(key)) is not None:
+            try:
+                result = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if in_flight.cancelled():
+                    continue
+                raise
+            self.shared += 1
+            return result
+
+        future: asyncio.Future[ResultT] = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executed += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Исключение получит сам ведущий вызов, даже если ожидающих нет
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,363 @@
+import asyncio
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Dict, Iterator, List, Optional
+
+from greenlet import getcurrent  # type: ignore[import-untyped]
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.config import settings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Отдельный логгер с ротацией файла (см. src/log_config.py): одна строка JSON
+# на каждый медленный запрос
+slow_query_logger = get_logger("slow_queries")
+
+# Атрибут контекста выполнения с моментом начала запроса
+STARTED_ATTR = "_slow_query_started"
+
+# Параметры, значения которых показывают глубину выборки и сохраняются как есть
+DEPTH_PARAMS = frozenset({"limit", "offset", "batch_size"})
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@dataclass
+class SlowQuery:
+    """
+    Статистика медленных выполнений запросов с одинаковым отпечатком.
+
+    Пример параметров самого медленного выполнения хранится только в памяти
+    для EXPLAIN и в лог и ответы API не попадает.
+    """
+
+    fingerprint: str
+    sql: str
+    dialect: str
+    count: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+    origins: Dict[str, int] = field(default_factory=dict)
+    params: Dict[str, str] = field(default_factory=dict)
+    last_seen: Optional[datetime] = None
+    plan: Optional[List[str]] = None
+    sample_statement: str = ""
+    sample_parameters: Any = None
+    engine: Optional[Engine] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Статистика без примера параметров."""
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "dialect": self.dialect,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "origins": self.origins,
+            "params": self.params,
+            "last_seen": self.last_seen,
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов к БД.
+
+    Время выполнения измеряется событиями движков SQLAlchemy. Запрос дольше
+    threshold_ms записывается в лог с нормализованным текстом SQL, формой
+    параметров (типы и размеры списков, значения limit и offset), длительностью
+    и методом приложения, из которого он выполнен. В памяти хранится статистика
+    по отпечаткам нормализованного SQL. При auto_explain=True для нового или
+    ставшего медленнее отпечатка в фоне снимается план EXPLAIN отдельным
+    соединением.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        max_fingerprints: int,
+        auto_explain: bool,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self.auto_explain = auto_explain
+        self._queries: Dict[str, SlowQuery] = {}
+        self._explain_tasks: "set[asyncio.Task[None]]" = set()
+        self._installed = False
+
+    def install(self) -> None:
+        """
+        Подписывается на выполнение запросов всех движков SQLAlchemy.
+        """
+        if self._installed:
+            return
+        event.listen(Engine, "before_cursor_execute", self._before_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_execute)
+        self._installed = True
+
+    def top(self, limit: int) -> List[SlowQuery]:
+        """
+        Возвращает самые медленные отпечатки запросов.
+
+        :param limit: Количество отпечатков.
+        :return: Статистика по убыванию максимальной длительности.
+        """
+        return sorted(
+            self._queries.values(), key=lambda query: query.max_ms, reverse=True
+        )[:limit]
+
+    def get(self, fingerprint: str) -> Optional[SlowQuery]:
+        """
+        Возвращает статистику отпечатка.
+
+        :param fingerprint: Отпечаток запроса.
+        :return: Статистика или None.
+        """
+        return self._queries.get(fingerprint)
+
+    def clear(self) -> None:
+        """
+        Очищает статистику.
+        """
+        self._queries.clear()
+
+    async def explain(self, query: SlowQuery, analyze: bool = False) -> List[str]:
+        """
+        Снимает план запроса с параметрами самого медленного выполнения.
+        Запрос выполняется в отдельном соединении, транзакция откатывается.
+        ANALYZE (фактическое выполнение) разрешен только для SELECT.
+
+        :param query: Статистика отпечатка.
+        :param analyze: Выполнить запрос и показать фактическое время (Postgres).
+        :return: Строки плана.
+        """
+        if query.engine is None:
+            return []
+        analyze = analyze and query.sql.lstrip().upper().startswith("SELECT")
+        if query.dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+        else:
+            prefix = "EXPLAIN QUERY PLAN "
+        async with AsyncEngine(query.engine).connect() as connection:
+            result = await connection.exec_driver_sql(
+                prefix + query.sample_statement, query.sample_parameters
+            )
+            plan = [str(row[-1]) for row in result]
+            await connection.rollback()
+        query.plan = plan
+        return plan
+
+    def _before_execute(
+        self,
+        connection: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Optional[ExecutionContext],
+        executemany: bool,
+    ) -> None:
+        if context is not None:
+            setattr(context, STARTED_ATTR, time.perf_counter())
+
+    def _after_execute(
+        self,
+        connection: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Optional[ExecutionContext],
+        executemany: bool,
+    ) -> None:
+        started = getattr(context, STARTED_ATTR, None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms or statement.startswith("EXPLAIN"):
+            return
+        try:
+            self._record(
+                connection, cursor, statement, parameters, context, duration_ms
+            )
+        except Exception:
+            logger.exception("Не удалось записать медленный запрос")
+
+    def _record(
+        self,
+        connection: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Optional[ExecutionContext],
+        duration_ms: float,
+    ) -> None:
+        """Обновляет статистику отпечатка и пишет запись в лог."""
+        sql = normalize_sql(statement)
+        fingerprint = hashlib.sha1(sql.encode()).hexdigest()[:16]
+        origin = find_origin(sys._getframe())
+        params = parameter_shapes(context, parameters)
+
+        query = self._queries.get(fingerprint)
+        if query is None:
+            if len(self._queries) >= self.max_fingerprints:
+                fastest = min(self._queries.values(), key=lambda item: item.max_ms)
+                del self._queries[fastest.fingerprint]
+            query = SlowQuery(
+                fingerprint=fingerprint, sql=sql, dialect=connection.dialect.name
+            )
+            self._queries[fingerprint] = query
+        query.count += 1
+        query.total_ms += duration_ms
+        query.origins[origin] = query.origins.get(origin, 0) + 1
+        query.last_seen = datetime.now(timezone.utc)
+        slower = duration_ms > query.max_ms
+        if slower:
+            query.max_ms = duration_ms
+            query.params = params
+            query.sample_statement = statement
+            query.sample_parameters = (
+                parameters[0] if getattr(context, "executemany", False) else parameters
+            )
+            query.engine = connection.engine
+
+        slow_query_logger.info(
+            json.dumps(
+                {
+                    "fingerprint": fingerprint,
+                    "duration_ms": round(duration_ms, 3),
+                    "origin": origin,
+                    "sql": sql,
+                    "params": params,
+                    "rows": cursor.rowcount if cursor.rowcount >= 0 else None,
+                },
+                ensure_ascii=False,
+            )
+        )
+        if self.auto_explain and slower:
+            self._schedule_explain(query)
+
+    def _schedule_explain(self, query: SlowQuery) -> None:
+        """Снимает план в фоне, если запрос выполнен внутри цикла событий."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        async def capture() -> None:
+            try:
+                plan = await self.explain(query)
+            except Exception:
+                logger.exception("Не удалось получить план запроса %s", query.sql)
+                return
+            slow_query_logger.info(
+                json.dumps(
+                    {"fingerprint": query.fingerprint, "plan": plan},
+                    ensure_ascii=False,
+                )
+            )
+
+        task = loop.create_task(capture())
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Приводит текст запроса к виду, не зависящему от значений и количества
+    параметров: литералы и параметры заменяются на ?, списки параметров IN -
+    на (?...), пробельные символы схлопываются.
+
+    :param statement: Текст запроса в формате драйвера БД.
+    :return: Нормализованный текст запроса.
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def parameter_shapes(
+    context: Optional[ExecutionContext], parameters: Any
+) -> Dict[str, str]:
+    """
+    Описывает параметры запроса без их значений: тип, размер списков, а для
+    limit и offset - значение.
+
+    :param context: Контекст выполнения SQLAlchemy.
+    :param parameters: Параметры в формате драйвера БД.
+    :return: Форма параметров по именам (или позициям).
+    """
+    compiled = getattr(context, "compiled_parameters", None)
+    if compiled:
+        values: Dict[str, Any] = dict(compiled[0])
+    elif isinstance(parameters, dict):
+        values = parameters
+    elif isinstance(parameters, (list, tuple)):
+        values = {str(index): value for index, value in enumerate(parameters)}
+    else:
+        values = {}
+
+    shapes = {}
+    for name, value in values.items():
+        shape = type(value).__name__
+        if isinstance(value, (list, tuple, set)):
+            shape = f"{shape}[{len(value)}]"
+        elif name in DEPTH_PARAMS:
+            shape = f"{shape}={value}"
+        shapes[name] = shape
+    if compiled and len(compiled) > 1:
+        shapes["executemany"] = str(len(compiled))
+    return shapes
+
+
+def find_origin(frame: Optional[FrameType]) -> str:
+    """
+    Находит метод приложения, из которого выполнен запрос. Асинхронный движок
+    выполняет запрос в отдельном greenlet, поэтому после его кадров
+    просматриваются кадры родительского greenlet с цепочкой корутин.
+
+    :param frame: Текущий кадр.
+    :return: Имя вида "src.database.repository.StudentRepository.get_students".
+    """
+    for current in _frames(frame):
+        module = current.f_globals.get("__name__", "")
+        if module.startswith("src.") and module != __name__:
+            return f"{module}.{current.f_code.co_qualname}"
+    return "unknown"
+
+
+def _frames(frame: Optional[FrameType]) -> Iterator[FrameType]:
+    """Кадры текущего greenlet и его родителей от вершины к корню."""
+    current_greenlet = getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current_greenlet = current_greenlet.parent
+        if current_greenlet is None:
+            return
+        frame = current_greenlet.gr_frame
+
+
+# Журнал медленных запросов приложения
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS,
+    auto_explain=settings.SLOW_QUERY_EXPLAIN,
+)
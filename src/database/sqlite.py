@@ -0,0 +1,69 @@
+from typing import Any, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from src.database.config import settings
+
+
+def sqlite_pragmas() -> List[str]:
+    """
+    Настройки соединения SQLite для работы под нагрузкой: журнал WAL (чтение не
+    блокируется записью), synchronous=NORMAL (в режиме WAL commit не ждет
+    записи на диск, данные не теряются при сбое процесса), отображение файла в
+    память, кэш страниц, ожидание блокировки вместо ошибки database is locked и
+    проверка внешних ключей, как в Postgres.
+
+    :return: Команды PRAGMA.
+    """
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA foreign_keys=ON",
+    ]
+
+
+def install_pragmas(engine: AsyncEngine) -> None:
+    """
+    Применяет настройки sqlite_pragmas к каждому новому соединению движка.
+
+    :param engine: Асинхронный движок SQLite.
+    """
+    event.listen(engine.sync_engine, "connect", _set_pragmas)
+
+
+def use_immediate_transactions(engine: AsyncEngine) -> None:
+    """
+    Начинает транзакции движка командой BEGIN IMMEDIATE: блокировка записи
+    берется в начале транзакции, а не при первом изменении. Иначе транзакция,
+    которая сначала читает, а потом пишет, получает database is locked без
+    ожидания busy_timeout, если после ее чтения данные изменил другой процесс.
+
+    :param engine: Асинхронный движок SQLite.
+    """
+    event.listen(engine.sync_engine, "connect", _disable_driver_transactions)
+    event.listen(engine.sync_engine, "begin", _begin_immediate)
+
+
+def _set_pragmas(dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _disable_driver_transactions(
+    dbapi_connection: Any, connection_record: ConnectionPoolEntry
+) -> None:
+    # Драйвер sqlite3 сам начинает транзакции только перед изменениями,
+    # поэтому транзакции начинает SQLAlchemy (_begin_immediate)
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(connection: Connection) -> None:
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
@@ -0,0 +1,71 @@
+from threading import Lock
+from typing import Callable, Dict, Hashable, TypeVar
+
+StatementT = TypeVar("StatementT")
+
+
+class StatementCache:
+    """
+    Кэш SQL-конструкций репозитория.
+
+    Ключом служит тип запроса и набор присутствующих фильтров, а сами значения
+    фильтров передаются через bindparam. Поэтому для каждой комбинации фильтров
+    SQLAlchemy строит и компилирует запрос один раз, а asyncpg получает один и тот же
+    текст SQL и переиспользует подготовленный (prepared) statement.
+    """
+
+    def __init__(self) -> None:
+        self._statements: Dict[Hashable, object] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self, key: Hashable, builder: Callable[[], StatementT]
+    ) -> StatementT:
+        """
+        Возвращает запрос из кэша или строит его и сохраняет.
+
+        :param key: Ключ запроса (тип запроса и набор фильтров).
+        :param builder: Функция, строящая запрос при промахе кэша.
+        :return: Готовая SQL-конструкция.
+        """
+        statement = self._statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            return statement  # type: ignore[return-value]
+
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                statement = builder()
+                self._statements[key] = statement
+                self.misses += 1
+            else:
+                self.hits += 1
+        return statement  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает счетчики попаданий и промахов кэша.
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._statements),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """
+        Очищает кэш и сбрасывает счетчики.
+        """
+        with self._lock:
+            self._statements.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Общий кэш запросов репозитория студентов
+statement_cache = StatementCache()
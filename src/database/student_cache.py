@@ -0,0 +1,122 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from src.database.change_feed import ChangeEvent
+from src.database.config import settings
+from src.schemas.student_schemas import GetStudentSchema
+
+StudentLoader = Callable[[List[int]], Awaitable[List[GetStudentSchema]]]
+
+
+class StudentCache:
+    """
+    Ограниченный кэш студентов по ID в памяти процесса.
+
+    Записи вытесняются по давности использования (LRU) и по времени жизни, а при
+    любом событии ленты изменений (create, update, delete) запись студента
+    удаляется. Лента изменений вызывает обработчики сразу после commit в этом
+    процессе и при получении событий других процессов через LISTEN.
+
+    Чтобы данные, прочитанные до commit конкурентного изменения, не попали в кэш
+    после сброса, результат запроса сохраняется, только если с его начала не
+    было ни одного сброса.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, GetStudentSchema]]" = (
+            OrderedDict()
+        )
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кэш."""
+        return self.max_size > 0
+
+    async def get_or_load(
+        self, student_ids: Sequence[int], load: StudentLoader
+    ) -> Dict[int, GetStudentSchema]:
+        """
+        Возвращает студентов из кэша, а отсутствующих загружает одним вызовом
+        load и сохраняет в кэш.
+
+        :param student_ids: ID студентов.
+        :param load: Функция, загружающая студентов по списку ID.
+        :return: Найденные студенты по ID (отсутствующих в БД в словаре нет).
+        """
+        found: Dict[int, GetStudentSchema] = {}
+        missing: List[int] = []
+        now = time.monotonic()
+        for student_id in dict.fromkeys(student_ids):
+            entry = self._entries.get(student_id) if self.enabled else None
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(student_id)
+                found[student_id] = entry[1]
+            else:
+                missing.append(student_id)
+        self.hits += len(found)
+        self.misses += len(missing)
+        if not missing:
+            return found
+
+        generation = self._generation
+        loaded = await load(missing)
+        if self.enabled and generation == self._generation:
+            expires_at = time.monotonic() + self.ttl_seconds
+            for student in loaded:
+                self._entries[student.id] = (expires_at, student)
+                self._entries.move_to_end(student.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        found.update((student.id, student) for student in loaded)
+        return found
+
+    def invalidate(self, student_id: int) -> None:
+        """
+        Удаляет студента из кэша.
+
+        :param student_id: ID студента.
+        """
+        self._generation += 1
+        self._entries.pop(student_id, None)
+
+    def apply(self, event: ChangeEvent) -> None:
+        """
+        Обработчик ленты изменений: сбрасывает запись измененного студента.
+
+        :param event: Событие изменения студента.
+        """
+        self.invalidate(event.student_id)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает размер кэша и счетчики попаданий и промахов.
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """
+        Очищает кэш и сбрасывает счетчики.
+        """
+        self._generation += 1
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Общий кэш студентов по ID
+student_cache = StudentCache(
+    max_size=settings.STUDENT_CACHE_SIZE,
+    ttl_seconds=settings.STUDENT_CACHE_TTL_SECONDS,
+)
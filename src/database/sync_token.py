@@ -0,0 +1,66 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from src.handlers.custom_exceptions import InvalidSyncTokenException
+
+# Позиция курсора: номер commit изменения (change_seq) и ID записи
+Position = Tuple[int, int]
+
+
+@dataclass
+class SyncToken:
+    """
+    Токен инкрементальной синхронизации.
+
+    Содержит две позиции курсора: по измененным студентам (change_seq, id) и по
+    удаленным (change_seq, id записи об удалении). Токен непрозрачен для клиента и
+    передается в следующий запрос как есть.
+    """
+
+    students: Optional[Position] = None
+    deleted: Optional[Position] = None
+
+    def encode(self) -> str:
+        """
+        Кодирует токен в строку.
+        """
+        payload = {
+            key: [position[0], position[1]]
+            for key, position in (("s", self.students), ("d", self.deleted))
+            if position is not None
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: Optional[str]) -> "SyncToken":
+        """
+        Декодирует токен. Пустой токен означает синхронизацию с начала.
+
+        :param token: Строка токена.
+        :return: Токен.
+        """
+        if not token:
+            return cls()
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            positions = {
+                key: (_to_int(value[0]), _to_int(value[1]))
+                for key, value in payload.items()
+            }
+        except (ValueError, TypeError, IndexError, AttributeError):
+            raise InvalidSyncTokenException()
+        return cls(students=positions.get("s"), deleted=positions.get("d"))
+
+
+def _to_int(value: object) -> int:
+    """
+    Проверяет, что значение позиции - целое число. Токены прежнего формата
+    (со временем изменения) считаются некорректными.
+    """
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(value)
+    return value
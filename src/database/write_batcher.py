@@ -0,0 +1,133 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+FlushResult = List[Union[ResultT, BaseException]]
+
+
+class LeaderCancelledError(Exception):
+    """
+    Ведущий вызов пакета был отменен до записи пакета в БД.
+    """
+
+
+class _Batch(Generic[ItemT, ResultT]):
+    """Пакет записей, собираемых в течение одного окна."""
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[ItemT, asyncio.Future[ResultT]]] = []
+        self.full = asyncio.Event()
+
+
+class WriteBatcher(Generic[ItemT, ResultT]):
+    """
+    Групповая запись (group commit) одиночных операций.
+
+    Первый вызов в окне становится ведущим: он ждет окончания окна или заполнения
+    пакета, после чего записывает весь пакет в своей сессии одним запросом и одним
+    commit. Каждый вызов получает свой результат или свое исключение.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[AsyncSession, List[ItemT]], Awaitable[FlushResult]],
+        window_ms: float,
+        max_size: int,
+    ) -> None:
+        self._flush = flush
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._batch: Optional[_Batch[ItemT, ResultT]] = None
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Включена ли групповая запись."""
+        return self.window > 0 and self.max_size > 1
+
+    async def submit(
+        self,
+        session: AsyncSession,
+        item: ItemT,
+        fallback: Callable[[], Awaitable[ResultT]],
+    ) -> ResultT:
+        """
+        Добавляет запись в текущий пакет и ожидает ее результат.
+
+        :param session: Сессия вызова, используется если вызов станет ведущим.
+        :param item: Данные записи.
+        :param fallback: Одиночная запись, если ведущий вызов был отменен.
+        :return: Результат записи.
+        """
+        future: asyncio.Future[ResultT] = asyncio.get_running_loop().create_future()
+
+        batch = self._batch
+        if batch is not None:
+            batch.entries.append((item, future))
+            if len(batch.entries) >= self.max_size:
+                self._detach(batch)
+            try:
+                return await future
+            except LeaderCancelledError:
+                return await fallback()
+
+        batch = _Batch()
+        batch.entries.append((item, future))
+        self._batch = batch
+        try:
+            await asyncio.wait_for(batch.full.wait(), timeout=self.window)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            self._detach(batch)
+            for _, pending in batch.entries[1:]:
+                if not pending.done():
+                    pending.set_exception(LeaderCancelledError())
+            raise
+        self._detach(batch)
+
+        # Пакет дописывается даже при отмене ведущего вызова,
+        # иначе остальные вызовы не получат результатов
+        write = asyncio.ensure_future(self._write(session, batch))
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            await asyncio.wait([write])
+            raise
+        return await future
+
+    def _detach(self, batch: _Batch[ItemT, ResultT]) -> None:
+        """Закрывает пакет для новых записей."""
+        if self._batch is batch:
+            self._batch = None
+        batch.full.set()
+
+    async def _write(
+        self, session: AsyncSession, batch: _Batch[ItemT, ResultT]
+    ) -> None:
+        """Записывает пакет и раздает результаты вызовам."""
+        items = [item for item, _ in batch.entries]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await self._flush(session, items)
+        except BaseException as exc:
+            for _, future in batch.entries[1:]:
+                if not future.done():
+                    future.set_exception(exc)
+            raise
+
+        for (_, future), result in zip(batch.entries, results):
+            # Вызов мог быть отменен (например, по сроку выполнения запроса),
+            # пока пакет записывался: его результат уже никому не нужен
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,167 @@
+import json
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.schemas.student_schemas import ResponseStudentsWithPaginationSchema
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - зависит от окружения
+    msgpack = None  # type: ignore
+
+# Форматы ответа списка студентов: обычный JSON
+# (ResponseStudentsWithPaginationSchema), колоночный JSON и MessagePack
+# с колоночной раскладкой
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_MEDIA_TYPE = "application/vnd.students.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Другие названия форматов, которые присылают клиенты
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK_MEDIA_TYPE}
+
+# Поля, значения которых в колоночной раскладке заменяются номерами в словаре
+DICTIONARY_FIELDS = frozenset({"study_status", "faculty_title"})
+
+
+@dataclass
+class StudentRows:
+    """
+    Страница студентов в виде строк запроса: значения полей fields в каждой
+    строке rows.
+    """
+
+    total: int
+    page: int
+    limit: int
+    fields: Tuple[str, ...]
+    rows: Sequence[Sequence[Any]]
+
+    @classmethod
+    def from_schema(
+        cls, response: ResponseStudentsWithPaginationSchema, fields: Tuple[str, ...]
+    ) -> "StudentRows":
+        """
+        Строит страницу из готового ответа (хранилище в памяти, шардирование).
+
+        :param response: Ответ со списком студентов.
+        :param fields: Поля студента в порядке столбцов.
+        :return: Страница студентов в виде строк.
+        """
+        return cls(
+            total=response.total,
+            page=response.page,
+            limit=response.limit,
+            fields=fields,
+            rows=[
+                tuple(getattr(student, name) for name in fields)
+                for student in response.students
+            ],
+        )
+
+
+def available_media_types() -> Tuple[str, ...]:
+    """
+    Находит доступные форматы ответа списка студентов в порядке предпочтения
+    сервера. MessagePack доступен, только если установлен пакет msgpack.
+
+    :return: Типы содержимого.
+    """
+    if msgpack is None:
+        return JSON_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE
+    return JSON_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Выбирает формат ответа по заголовку Accept: с наибольшим весом q, а при
+    равных весах - первый в порядке предпочтения сервера. Если ни один формат
+    не подходит, используется обычный JSON.
+
+    :param accept: Значение заголовка Accept.
+    :return: Тип содержимого ответа.
+    """
+    weights: Dict[str, float] = {}
+    for item in (accept or "").split(","):
+        media_type, *params = item.split(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[MEDIA_TYPE_ALIASES.get(media_type, media_type)] = weight
+
+    best = JSON_MEDIA_TYPE
+    best_weight = 0.0
+    for media_type in available_media_types():
+        # Точное совпадение важнее шаблонов application/* и */*
+        major = media_type.split("/")[0]
+        for pattern in (media_type, f"{major}/*", "*/*"):
+            if pattern in weights:
+                if weights[pattern] > best_weight:
+                    best, best_weight = media_type, weights[pattern]
+                break
+    return best
+
+
+def to_columns(page: StudentRows) -> Dict[str, Any]:
+    """
+    Переводит страницу студентов в колоночную раскладку: по одному массиву на
+    поле, а значения study_status и faculty_title заменяются номерами в
+    словаре dictionaries.
+
+    :param page: Страница студентов в виде строк.
+    :return: Словарь с полями total, page, limit, count, columns и dictionaries.
+    """
+    columns: Dict[str, List[Any]] = {}
+    dictionaries: Dict[str, List[Any]] = {}
+    values = zip(*page.rows) if page.rows else ((),) * len(page.fields)
+    for name, column in zip(page.fields, values):
+        if name in DICTIONARY_FIELDS:
+            codes: Dict[Any, int] = {}
+            columns[name] = [
+                None if value is None else codes.setdefault(value, len(codes))
+                for value in column
+            ]
+            dictionaries[name] = _plain_column(list(codes))
+        else:
+            columns[name] = _plain_column(column)
+    return {
+        "total": page.total,
+        "page": page.page,
+        "limit": page.limit,
+        "count": len(page.rows),
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+
+def encode_students(page: StudentRows, media_type: str) -> bytes:
+    """
+    Кодирует страницу студентов в колоночном формате.
+
+    :param page: Страница студентов в виде строк.
+    :param media_type: COLUMNAR_MEDIA_TYPE или MSGPACK_MEDIA_TYPE.
+    :return: Тело ответа.
+    """
+    columns = to_columns(page)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(columns)
+    return json.dumps(columns, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _plain_column(column: Sequence[Any]) -> List[Any]:
+    """Заменяет даты строками ISO 8601, а перечисления - их значениями."""
+    sample = next((value for value in column if value is not None), None)
+    if isinstance(sample, date):
+        return [None if value is None else value.isoformat() for value in column]
+    if isinstance(sample, Enum):
+        return [None if value is None else value.value for value in column]
+    return list(column)
@@ -30,6 +30,74 @@ class RowNotFoundException(BaseCustomException):
     default_message = "Запрашиваемая запись не найдена!"
 
 
+class EventsExpiredException(BaseCustomException):
+    """
+    Исключение, возникающее, когда запрошенные события уже удалены из истории.
+    """
+
+    status_code = status.HTTP_410_GONE
+    default_message = (
+        "События после указанного ID недоступны! Выполните полную синхронизацию!"
+    )
+
+
+class InvalidSyncTokenException(BaseCustomException):
+    """
+    Исключение, возникающее при некорректном токене синхронизации.
+    """
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_message = "Некорректный токен синхронизации!"
+
+
+class InvalidStudentIdsException(BaseCustomException):
+    """
+    Исключение, возникающее при некорректном списке ID студентов.
+    """
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_message = "Некорректный список ID студентов!"
+
+
+class AdminAccessDeniedException(BaseCustomException):
+    """
+    Исключение, возникающее при обращении к служебным маршрутам без токена
+    администратора.
+    """
+
+    status_code = status.HTTP_403_FORBIDDEN
+    default_message = "Доступ запрещен!"
+
+
+class DeadlineExceededException(BaseCustomException):
+    """
+    Исключение, возникающее, когда запрос не успел выполниться за отведенное время.
+    """
+
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_message = "Превышено время обработки запроса!"
+
+
+class ShardingNotSupportedException(BaseCustomException):
+    """
+    Исключение, возникающее при вызове операции, которая не поддерживается
+    вместе с шардированием.
+    """
+
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_message = "Операция недоступна при шардировании!"
+
+
+class JobClaimLostException(Exception):
+    """
+    Исключение, возникающее, когда фоновую задачу захватил другой процесс.
+    """
+
+    def __init__(self, job_id: int):
+        super().__init__(f"Задача {job_id} захвачена другим процессом")
+        self.job_id = job_id
+
+
 class IntegrityViolationException(Exception):
     """
     Исключение, возникающее при нарушении целостности данных.
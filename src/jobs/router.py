@@ -0,0 +1,210 @@
+from datetime import timedelta
+
+from fastapi import APIRouter, Path, status
+
+from src.database.models import Job, utc_now
+from src.database.repository import StudentRepository
+from src.database.service import DBSession
+from src.database.sharding import shard_router
+from src.handlers.custom_exceptions import (
+    RowNotFoundException,
+    ShardingNotSupportedException,
+)
+from src.jobs.runner import job_runner
+from src.jobs.tasks import (
+    ARCHIVE_STUDENTS,
+    CHANGE_STATUS,
+    DELETE_STUDENTS,
+    IMPORT_STUDENTS,
+)
+from src.schemas.job_schemas import (
+    ArchiveStudentsJobSchema,
+    ChangeStatusJobSchema,
+    ImportStudentsJobSchema,
+    JobSchema,
+)
+from src.schemas.student_schemas import DeleteQueryStudentSchema
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["Фоновые задачи"])
+
+
+@router.post(
+    "/students/delete",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Удалить студентов с фильтрацией в фоне",
+    description="Создает фоновую задачу удаления студентов по заданным фильтрам.",
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Задача создана",
+            "model": JobSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Запрашиваемая запись не найдена!"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+        status.HTTP_501_NOT_IMPLEMENTED: {
+            "description": "Фоновые задачи недоступны при шардировании"
+        },
+    },
+)
+async def delete_students_job(
+    session: DBSession,
+    params: DeleteQueryStudentSchema,
+) -> JobSchema:
+    """Фоновое удаление студентов с параметрами"""
+    if shard_router.enabled:
+        raise ShardingNotSupportedException()
+    total = await StudentRepository.count_students(session, params.model_dump())
+    if total == 0:
+        raise RowNotFoundException()
+
+    job = await job_runner.submit(
+        session, DELETE_STUDENTS, params.model_dump(mode="json"), total
+    )
+    return JobSchema.model_validate(job)
+
+
+@router.post(
+    "/students/change-status",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Изменить статус студентов с фильтрацией в фоне",
+    description="Создает фоновую задачу изменения статуса обучения студентов.",
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Задача создана",
+            "model": JobSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Запрашиваемая запись не найдена!"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+        status.HTTP_501_NOT_IMPLEMENTED: {
+            "description": "Фоновые задачи недоступны при шардировании"
+        },
+    },
+)
+async def change_status_job(
+    session: DBSession,
+    params: ChangeStatusJobSchema,
+) -> JobSchema:
+    """Фоновое изменение статуса студентов"""
+    if shard_router.enabled:
+        raise ShardingNotSupportedException()
+    total = await StudentRepository.count_students(
+        session, params.model_dump(exclude={"new_status"})
+    )
+    if total == 0:
+        raise RowNotFoundException()
+
+    job = await job_runner.submit(
+        session, CHANGE_STATUS, params.model_dump(mode="json"), total
+    )
+    return JobSchema.model_validate(job)
+
+
+@router.post(
+    "/students/import",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Импортировать студентов в фоне",
+    description="Создает фоновую задачу массового добавления студентов.",
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Задача создана",
+            "model": JobSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Факультет не найден! Сначала создайте факультет!"
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+        status.HTTP_501_NOT_IMPLEMENTED: {
+            "description": "Фоновые задачи недоступны при шардировании"
+        },
+    },
+)
+async def import_students_job(
+    session: DBSession,
+    params: ImportStudentsJobSchema,
+) -> JobSchema:
+    """Фоновый импорт студентов"""
+    if shard_router.enabled:
+        raise ShardingNotSupportedException()
+    await StudentRepository.check_faculties_exist(
+        session,
+        {student.faculty_id for student in params.students if student.faculty_id},
+    )
+
+    job = await job_runner.submit(
+        session, IMPORT_STUDENTS, params.model_dump(mode="json"), len(params.students)
+    )
+    return JobSchema.model_validate(job)
+
+
+@router.post(
+    "/students/archive",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Перенести студентов в архив в фоне",
+    description=(
+        "Создает фоновую задачу переноса в архив выпускников и отчисленных "
+        "студентов, которые не изменялись заданное количество дней."
+    ),
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Задача создана",
+            "model": JobSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Запрашиваемая запись не найдена!"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+        status.HTTP_501_NOT_IMPLEMENTED: {
+            "description": "Фоновые задачи недоступны при шардировании"
+        },
+    },
+)
+async def archive_students_job(
+    session: DBSession,
+    params: ArchiveStudentsJobSchema,
+) -> JobSchema:
+    """Фоновый перенос студентов в архив"""
+    if shard_router.enabled:
+        raise ShardingNotSupportedException()
+    before = utc_now() - timedelta(days=params.older_than_days)
+    total = await StudentRepository.count_archivable(session, before)
+    if total == 0:
+        raise RowNotFoundException()
+
+    job = await job_runner.submit(
+        session, ARCHIVE_STUDENTS, {"before": before.isoformat()}, total
+    )
+    return JobSchema.model_validate(job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Получить статус фоновой задачи",
+    description="Возвращает статус и прогресс фоновой задачи по ее ID.",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Статус задачи успешно получен",
+            "model": JobSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Запрашиваемая запись не найдена!"},
+    },
+)
+async def get_job(
+    session: DBSession,
+    job_id: int = Path(..., title="Job ID", description="ID задачи", ge=1),
+) -> JobSchema:
+    """Получение статуса фоновой задачи"""
+    job = await session.get(Job, job_id)
+    if not job:
+        raise RowNotFoundException()
+    return JobSchema.model_validate(job)
@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import os
+import socket
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from uuid import uuid4
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database.config import settings
+from src.database.models import Job, JobStatus, utc_now
+from src.database.service import async_session
+from src.handlers.custom_exceptions import JobClaimLostException
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Обработчик одной порции задачи: возвращает True, когда задача выполнена
+JobHandler = Callable[[AsyncSession, Job, int], Awaitable[bool]]
+
+
+class JobRunner:
+    """
+    Исполнитель фоновых задач внутри процесса приложения.
+
+    Задачи хранятся в таблице jobs и выполняются порциями: каждая порция и
+    контрольная точка задачи сохраняются одним commit, поэтому после перезапуска
+    задача продолжается с последней сохраненной точки. Одновременно выполняется
+    не более concurrency задач. Внешний брокер не требуется.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        chunk_size: int,
+        stale_after: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.stale_after = stale_after
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """
+        Регистрирует обработчик задач заданного типа.
+
+        :param kind: Тип задачи.
+        :param handler: Обработчик одной порции задачи.
+        """
+        self._handlers[kind] = handler
+
+    async def submit(
+        self,
+        session: AsyncSession,
+        kind: str,
+        params: Dict[str, Any],
+        total: Optional[int] = None,
+    ) -> Job:
+        """
+        Сохраняет новую задачу и ставит ее в очередь на выполнение.
+
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param kind: Тип задачи.
+        :param params: Параметры задачи (должны сериализоваться в JSON).
+        :param total: Оценка общего количества записей.
+        :return: Созданная задача.
+        """
+        job = Job(kind=kind, params=params, total=total, status=JobStatus.pending)
+        session.add(job)
+        await session.commit()
+        self.schedule(job.id)
+        return job
+
+    def schedule(self, job_id: int) -> None:
+        """
+        Запускает выполнение задачи в фоне.
+
+        :param job_id: ID задачи.
+        """
+        # Задача не наследует контекст запроса, в том числе его срок выполнения
+        task = asyncio.create_task(self._run(job_id), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resume(self) -> int:
+        """
+        Возобновляет незавершенные задачи после перезапуска приложения.
+
+        :return: Количество поставленных в очередь задач.
+        """
+        async with self.session_factory() as session:
+            job_ids = list(
+                await session.scalars(
+                    select(Job.id)
+                    .where(Job.status.in_([JobStatus.pending, JobStatus.running]))
+                    .order_by(Job.id)
+                )
+            )
+        for job_id in job_ids:
+            self.schedule(job_id)
+        return len(job_ids)
+
+    async def shutdown(self) -> None:
+        """
+        Останавливает выполнение задач и возвращает их в очередь.
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.status == JobStatus.running)
+                .where(Job.worker_id == self.worker_id)
+                .values(status=JobStatus.pending, worker_id=None)
+            )
+            await session.commit()
+
+    async def _claim(self, session: AsyncSession, job_id: int) -> bool:
+        """
+        Захватывает задачу для выполнения этим процессом.
+        Задачу другого процесса можно захватить, только если он давно не сохранял
+        прогресс.
+        """
+        stale_before = utc_now() - timedelta(seconds=self.stale_after)
+        claimed = await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .where(
+                or_(
+                    Job.status == JobStatus.pending,
+                    and_(
+                        Job.status == JobStatus.running,
+                        or_(
+                            Job.worker_id == self.worker_id,
+                            Job.heartbeat_at < stale_before,
+                        ),
+                    ),
+                )
+            )
+            .values(status=JobStatus.running, worker_id=self.worker_id)
+        )
+        await session.commit()
+        return claimed.rowcount == 1  # type: ignore[attr-defined]
+
+    async def _complete(self, session: AsyncSession, job_id: int) -> None:
+        """
+        Отмечает задачу выполненной, если она все еще захвачена этим процессом.
+        """
+        completed = await session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == self.worker_id)
+            .values(status=JobStatus.completed)
+            .execution_options(synchronize_session=False)
+        )
+        if completed.rowcount != 1:  # type: ignore[attr-defined]
+            await session.rollback()
+            raise JobClaimLostException(job_id)
+        await session.commit()
+
+    async def _run(self, job_id: int) -> None:
+        """Выполняет задачу порциями до завершения."""
+        async with self._semaphore:
+            async with self.session_factory() as session:
+                if not await self._claim(session, job_id):
+                    return
+
+            try:
+                finished = False
+                while not finished:
+                    async with self.session_factory() as session:
+                        job = await session.get(Job, job_id)
+                        if job is None or job.worker_id != self.worker_id:
+                            return
+                        handler = self._handlers[job.kind]
+                        finished = await handler(session, job, self.chunk_size)
+                        if finished:
+                            await self._complete(session, job_id)
+                    # Отдаем управление обработке запросов между порциями
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except JobClaimLostException:
+                logger.warning(
+                    "Фоновую задачу %s перехватил другой процесс, выполнение "
+                    "остановлено",
+                    job_id,
+                )
+            except Exception as exc:
+                logger.exception("Фоновая задача %s завершилась с ошибкой", job_id)
+                async with self.session_factory() as session:
+                    await session.execute(
+                        update(Job)
+                        .where(Job.id == job_id)
+                        .values(status=JobStatus.failed, error=str(exc))
+                    )
+                    await session.commit()
+
+
+# Исполнитель фоновых задач приложения
+job_runner = JobRunner(
+    async_session,
+    concurrency=settings.JOB_CONCURRENCY,
+    chunk_size=settings.JOB_CHUNK_SIZE,
+    stale_after=settings.JOB_STALE_SECONDS,
+)
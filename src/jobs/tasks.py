@@ -0,0 +1,123 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import Job
+from src.database.repository import StudentRepository
+from src.jobs.runner import job_runner
+from src.schemas.job_schemas import ChangeStatusJobSchema
+from src.schemas.student_schemas import BodyStudentSchema, DeleteQueryStudentSchema
+
+# Типы фоновых задач
+DELETE_STUDENTS = "delete_students"
+CHANGE_STATUS = "change_status"
+IMPORT_STUDENTS = "import_students"
+ARCHIVE_STUDENTS = "archive_students"
+
+
+async def delete_students_chunk(
+    session: AsyncSession, job: Job, chunk_size: int
+) -> bool:
+    """
+    Удаляет очередную порцию студентов, соответствующих фильтрам задачи.
+
+    :param session: Асинхронная сессия SQLAlchemy.
+    :param job: Выполняемая задача.
+    :param chunk_size: Размер порции.
+    :return: True, если задача выполнена.
+    """
+    filters = DeleteQueryStudentSchema.model_validate(job.params).model_dump()
+    student_ids = await StudentRepository.get_ids_chunk(
+        session, filters, job.checkpoint, chunk_size
+    )
+    if not student_ids:
+        return True
+
+    job.processed += await StudentRepository.delete_students_by_ids(
+        session, student_ids
+    )
+    job.checkpoint = student_ids[-1]
+    await StudentRepository.commit_job_chunk(session, job, job_runner.worker_id)
+    return len(student_ids) < chunk_size
+
+
+async def change_status_chunk(session: AsyncSession, job: Job, chunk_size: int) -> bool:
+    """
+    Изменяет статус обучения очередной порции студентов.
+
+    :param session: Асинхронная сессия SQLAlchemy.
+    :param job: Выполняемая задача.
+    :param chunk_size: Размер порции.
+    :return: True, если задача выполнена.
+    """
+    params = ChangeStatusJobSchema.model_validate(job.params)
+    student_ids = await StudentRepository.get_ids_chunk(
+        session, params.model_dump(exclude={"new_status"}), job.checkpoint, chunk_size
+    )
+    if not student_ids:
+        return True
+
+    job.processed += await StudentRepository.update_status_by_ids(
+        session, student_ids, params.new_status
+    )
+    job.checkpoint = student_ids[-1]
+    await StudentRepository.commit_job_chunk(session, job, job_runner.worker_id)
+    return len(student_ids) < chunk_size
+
+
+async def import_students_chunk(
+    session: AsyncSession, job: Job, chunk_size: int
+) -> bool:
+    """
+    Добавляет очередную порцию студентов из задачи импорта.
+    Контрольной точкой служит индекс следующего студента в списке.
+
+    :param session: Асинхронная сессия SQLAlchemy.
+    :param job: Выполняемая задача.
+    :param chunk_size: Размер порции.
+    :return: True, если задача выполнена.
+    """
+    students = job.params["students"][job.checkpoint : job.checkpoint + chunk_size]
+    if not students:
+        return True
+
+    job.processed += await StudentRepository.insert_students(
+        session, [BodyStudentSchema.model_validate(student) for student in students]
+    )
+    job.checkpoint += len(students)
+    await StudentRepository.commit_job_chunk(session, job, job_runner.worker_id)
+    return job.checkpoint >= len(job.params["students"])
+
+
+async def archive_students_chunk(
+    session: AsyncSession, job: Job, chunk_size: int
+) -> bool:
+    """
+    Переносит в архив очередную порцию выпускников и отчисленных студентов.
+    Граница срока без изменений вычисляется при создании задачи, поэтому
+    продолжение задачи после перезапуска отбирает тех же студентов.
+
+    :param session: Асинхронная сессия SQLAlchemy.
+    :param job: Выполняемая задача.
+    :param chunk_size: Размер порции.
+    :return: True, если задача выполнена.
+    """
+    student_ids = await StudentRepository.archive_students(
+        session,
+        datetime.fromisoformat(job.params["before"]),
+        job.checkpoint,
+        chunk_size,
+    )
+    if not student_ids:
+        return True
+
+    job.processed += len(student_ids)
+    job.checkpoint = student_ids[-1]
+    await StudentRepository.commit_job_chunk(session, job, job_runner.worker_id)
+    return len(student_ids) < chunk_size
+
+
+job_runner.register(DELETE_STUDENTS, delete_students_chunk)
+job_runner.register(CHANGE_STATUS, change_status_chunk)
+job_runner.register(IMPORT_STUDENTS, import_students_chunk)
+job_runner.register(ARCHIVE_STUDENTS, archive_students_chunk)
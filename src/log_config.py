@@ -5,6 +5,7 @@ from pathlib import Path
 log_folder_path = Path(__file__).parent.parent / "logs"
 log_folder_path.mkdir(exist_ok=True)
 log_file_path = log_folder_path / "logfile.log"
+slow_queries_file_path = log_folder_path / "slow_queries.log"
 
 # Конфигурация логгера
 dict_config = {
@@ -18,6 +19,10 @@ dict_config = {
         "consoleFormatter": {
             "format": "%(name)s - %(levelname)s - %(message)s",
         },
+        "jsonLineFormatter": {
+            "format": '{"time": "%(asctime)s", "query": %(message)s}',
+            "datefmt": "%Y-%m-%dT%H:%M:%S%z",
+        },
     },
     "handlers": {
         "stream": {
@@ -34,6 +39,21 @@ dict_config = {
             "maxBytes": 10**6,
             "backupCount": 5,
         },
+        "slow_queries": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "level": "INFO",
+            "formatter": "jsonLineFormatter",
+            "filename": str(slow_queries_file_path),
+            "maxBytes": 10**7,
+            "backupCount": 5,
+        },
+    },
+    "loggers": {
+        "slow_queries": {
+            "level": "INFO",
+            "handlers": ["slow_queries"],
+            "propagate": False,
+        },
     },
     "root": {
         "level": "DEBUG",
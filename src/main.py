@@ -1,20 +1,94 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import uvicorn
 from fastapi import FastAPI
 
+from src.admin.profiler import profiler
+from src.admin.router import router as admin_router
+from src.database.change_feed import change_feed
+from src.database.config import settings
+from src.database.read_model import read_model
+from src.database.service import async_session, engine
+from src.database.sharding import shard_router
 from src.handlers.handlers import exception_handler
+from src.jobs.router import router as jobs_router
+from src.jobs.runner import job_runner
+from src.middleware.admission import AdmissionControlMiddleware
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.deadline import DeadlineMiddleware
+from src.middleware.profiler import ProfilerMiddleware
 from src.router import router
 
 # Настройка логгера
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+async def load_read_model() -> None:
+    """Загружает хранилище студентов в памяти из БД."""
+    async with async_session() as session:
+        await read_model.load(session)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Запуск и остановка фоновых задач и ленты изменений вместе с приложением."""
+    await change_feed.start_listener(engine)
+    if shard_router.enabled:
+        if settings.READ_MODEL:
+            # Хранилище в памяти строится по одной БД и не видит шарды
+            logger.warning(
+                "READ_MODEL игнорируется: хранилище в памяти не поддерживает "
+                "шардирование (DB_SHARD_URLS)"
+            )
+        await shard_router.prepare()
+    elif settings.READ_MODEL:
+        change_feed.add_hook(read_model.apply)
+        # После разрыва LISTEN хранилище могло пропустить события
+        change_feed.add_reconnect_hook(load_read_model)
+        await load_read_model()
+    resumed = await job_runner.resume()
+    if resumed:
+        logger.info("Возобновлено фоновых задач: %s", resumed)
+    yield
+    await job_runner.shutdown()
+    profiler.stop()
+    await change_feed.stop_listener()
+    await shard_router.dispose()
+
+
 # Создание экземпляра FastAPI
-app = FastAPI(title="API Студентов", version="1.0.0")
+app = FastAPI(title="API Студентов", version="1.0.0", lifespan=lifespan)
 
 # Глобальный обработчик исключений
 app.add_exception_handler(Exception, exception_handler)
 
+# Поток событий держит соединение долго и к БД не обращается, поэтому не
+# ограничивается ни контролем допуска, ни сроком выполнения
+LONG_LIVED_PATHS = {"/api/v1/students/events"}
+
+# Выборочное профилирование запросов (без сеанса профилирования только
+# проверяет, что сеанс не запущен). Подключается первым, чтобы ожидание в
+# очереди контроля допуска не попадало в профиль
+app.add_middleware(ProfilerMiddleware)
+
+# Контроль допуска запросов при перегрузке БД
+if settings.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionControlMiddleware, exempt_paths=LONG_LIVED_PATHS)
+
+# Срок выполнения запроса. Подключается последним, чтобы ожидание в очереди
+# контроля допуска тоже входило в срок
+if settings.DEADLINES:
+    app.add_middleware(DeadlineMiddleware, exempt_paths=LONG_LIVED_PATHS)
+
+# Сжатие ответов. Подключается внешним, чтобы сжатие не занимало место
+# контроля допуска и не входило в срок выполнения запроса
+if settings.COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
 # Подключение маршрутов
 app.include_router(router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
@@ -0,0 +1,256 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.database import deadline
+from src.database.config import settings
+from src.logger import get_logger
+from src.middleware.utils import header_timeout_ms, is_read, route_key
+
+logger = get_logger(__name__)
+
+# Вес нового замера во времени обслуживания запроса
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """
+    Запрос не допущен: очередь заполнена или ожидание превысит бюджет запроса.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """
+    Ограничение числа одновременных запросов с очередью ожидания.
+
+    Освободившийся слот передается первому запросу в очереди. Ожидаемое время
+    ожидания оценивается по длине очереди и сглаженному времени обслуживания.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.active = 0
+        self.rejected = 0
+        self.service_time = 0.0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        """Количество запросов в очереди."""
+        return len(self._waiters)
+
+    def predicted_wait(self) -> float:
+        """
+        Оценивает время ожидания слота для нового запроса.
+
+        :return: Время в секундах.
+        """
+        if self.active < self.concurrency and not self._waiters:
+            return 0.0
+        return (self.queued + 1) / self.concurrency * self.service_time
+
+    async def acquire(self, budget: float) -> None:
+        """
+        Занимает слот, ожидая в очереди не дольше budget секунд.
+
+        :param budget: Максимальное время ожидания в секундах.
+        :raises AdmissionRejected: Если очередь заполнена или ожидание превысит budget.
+        """
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return
+        if self.queued >= self.queue_size or self.predicted_wait() > budget:
+            self._reject()
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, budget)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Слот уже передан этому запросу - отдаем его следующему
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._reject()
+            raise
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        """
+        Освобождает слот и передает его первому запросу в очереди.
+
+        :param elapsed: Время обслуживания запроса в секундах.
+        """
+        if elapsed is not None:
+            self.service_time += SERVICE_TIME_SMOOTHING * (elapsed - self.service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает текущее состояние ограничения.
+        """
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "service_time_ms": round(self.service_time * 1000, 3),
+        }
+
+    def _reject(self) -> None:
+        """Отклоняет запрос с оценкой времени, через которое стоит повторить."""
+        self.rejected += 1
+        raise AdmissionRejected(max(self.predicted_wait(), self.service_time))
+
+
+class AdmissionController:
+    """
+    Контроль допуска запросов к обработчикам.
+
+    Чтение и запись имеют отдельные лимиты, поэтому поток запросов списка не
+    занимает соединения, нужные для добавления и изменения студентов. Для
+    отдельных маршрутов можно задать дополнительный, более строгий лимит.
+    """
+
+    def __init__(
+        self,
+        read: Limiter,
+        write: Limiter,
+        read_budget_ms: float,
+        write_budget_ms: float,
+        route_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.read = read
+        self.write = write
+        self.read_budget_ms = read_budget_ms
+        self.write_budget_ms = write_budget_ms
+        self._routes: Dict[str, Limiter] = {
+            key: Limiter(key, limit, read.queue_size)
+            for key, limit in (route_limits or {}).items()
+        }
+
+    def limiters(self, scope: Scope) -> List[Limiter]:
+        """
+        Возвращает ограничения, которые должен пройти запрос, по порядку.
+
+        :param scope: ASGI scope запроса.
+        :return: Список ограничений.
+        """
+        limiters = []
+        if self._routes:
+            route_limiter = self._routes.get(route_key(scope) or "")
+            if route_limiter is not None:
+                limiters.append(route_limiter)
+        limiters.append(self.read if is_read(scope) else self.write)
+        return limiters
+
+    def budget(self, scope: Scope) -> float:
+        """
+        Определяет, сколько секунд запрос может ждать в очереди: бюджет класса
+        запроса, уменьшенный до срока выполнения запроса или, если срок не
+        установлен, до значения заголовка X-Request-Timeout-Ms.
+
+        :param scope: ASGI scope запроса.
+        :return: Время в секундах.
+        """
+        budget_ms = self.read_budget_ms if is_read(scope) else self.write_budget_ms
+        left = deadline.remaining()
+        limit_ms = left * 1000 if left is not None else header_timeout_ms(scope)
+        if limit_ms is not None:
+            budget_ms = min(budget_ms, limit_ms)
+        return budget_ms / 1000
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Возвращает состояние всех ограничений.
+        """
+        limiters = [self.read, self.write, *self._routes.values()]
+        return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware контроля допуска.
+
+    Запрос занимает слот на все время обработки, включая отправку ответа. Если
+    слот не освободится за бюджет запроса, сразу возвращается 503 с заголовком
+    Retry-After, вместо того чтобы ждать соединение из пула до таймаута.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: Optional[AdmissionController] = None,
+        exempt_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.controller = controller or admission_controller
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        wait_until = time.monotonic() + self.controller.budget(scope)
+        acquired: List[Limiter] = []
+        try:
+            for limiter in self.controller.limiters(scope):
+                await limiter.acquire(max(wait_until - time.monotonic(), 0.0))
+                acquired.append(limiter)
+        except AdmissionRejected as exc:
+            for limiter in acquired:
+                limiter.release()
+            logger.debug("Запрос %s %s отклонен", scope["method"], scope["path"])
+            response = JSONResponse(
+                {"detail": "Сервис перегружен! Повторите запрос позже!"},
+                status_code=503,
+                headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+            )
+            await response(scope, receive, send)
+            return
+        except BaseException:
+            for limiter in acquired:
+                limiter.release()
+            raise
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.monotonic() - started
+            for limiter in acquired:
+                limiter.release(elapsed)
+
+
+# Контроль допуска запросов приложения
+admission_controller = AdmissionController(
+    read=Limiter(
+        "read", settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE_SIZE
+    ),
+    write=Limiter(
+        "write",
+        settings.ADMISSION_WRITE_CONCURRENCY,
+        settings.ADMISSION_WRITE_QUEUE_SIZE,
+    ),
+    read_budget_ms=settings.ADMISSION_READ_BUDGET_MS,
+    write_budget_ms=settings.ADMISSION_WRITE_BUDGET_MS,
+    route_limits=settings.ADMISSION_ROUTE_LIMITS,
+)
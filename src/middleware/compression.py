@@ -0,0 +1,274 @@
+import asyncio
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.config import settings
+from src.formats import COLUMNAR_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover - зависит от окружения
+    zstandard = None  # type: ignore
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - зависит от окружения
+    brotli = None  # type: ignore
+
+# Типы содержимого, которые имеет смысл сжимать
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    COLUMNAR_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+)
+
+# Статусы ответов без тела
+NO_BODY_STATUSES = frozenset({204, 304})
+
+
+class Compressor(ABC):
+    """
+    Потоковый компрессор одного ответа.
+
+    compress сжимает очередной фрагмент тела и сбрасывает буфер, чтобы клиент
+    мог распаковать все полученные данные (важно для потока событий), finish
+    завершает сжатый поток.
+    """
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Сжимает фрагмент тела и сбрасывает буфер компрессора."""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Завершает сжатый поток."""
+
+
+class GzipCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        # wbits=31: формат gzip (заголовок и контрольная сумма)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> Dict[str, Callable[[], Compressor]]:
+    """
+    Находит доступные алгоритмы сжатия в порядке предпочтения сервера.
+    zstd и brotli используются, только если установлены пакеты zstandard и
+    brotli.
+
+    :return: Фабрики компрессоров по названию кодировки.
+    """
+    encodings: Dict[str, Callable[[], Compressor]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)
+    if brotli is not None:
+        encodings["br"] = lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_LEVEL)
+    encodings["gzip"] = lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)
+    return encodings
+
+
+def negotiate(accept_encoding: str, supported: Iterable[str]) -> Optional[str]:
+    """
+    Выбирает кодировку по заголовку Accept-Encoding: с наибольшим весом q, а
+    при равных весах - первую в порядке предпочтения сервера.
+
+    :param accept_encoding: Значение заголовка Accept-Encoding.
+    :param supported: Доступные кодировки в порядке предпочтения сервера.
+    :return: Название кодировки или None, если сжимать не нужно.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in supported:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware сжатия ответов с согласованием кодировки по
+    Accept-Encoding (zstd, br, gzip).
+
+    Ответ, переданный одним сообщением, сжимается целиком, если он не меньше
+    min_size. Потоковый ответ сжимается по фрагментам со сбросом буфера после
+    каждого, поэтому клиент получает данные без задержки. Фрагменты не меньше
+    thread_min_size сжимаются в пуле потоков, чтобы не блокировать цикл событий.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        min_size: int = settings.COMPRESSION_MIN_SIZE,
+        thread_min_size: int = settings.COMPRESSION_THREAD_MIN_SIZE,
+        encodings: Optional[Dict[str, Callable[[], Compressor]]] = None,
+    ) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.thread_min_size = thread_min_size
+        self.encodings = available_encodings() if encodings is None else encodings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    async def run(self, function: Callable[..., bytes], *args: Any) -> bytes:
+        """
+        Выполняет сжатие: большие фрагменты - в пуле потоков.
+
+        :param function: Метод компрессора.
+        :param args: Фрагмент тела ответа (или ничего для finish).
+        :return: Сжатые данные.
+        """
+        if args and len(args[0]) >= self.thread_min_size:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+
+class CompressionResponder:
+    """
+    Обертка send одного ответа: решает, сжимать ли ответ, и сжимает его тело.
+    """
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor: Optional[Compressor] = None
+        # None - решение еще не принято, False - ответ передается без сжатия
+        self._compress: Optional[bool] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            if not self._compressible(message["status"], headers):
+                self._compress = False
+                await self._send(message)
+            else:
+                MutableHeaders(raw=message["headers"]).add_vary_header(
+                    "Accept-Encoding"
+                )
+            return
+        if message["type"] != "http.response.body" or self._compress is False:
+            if self._compress is None:
+                # Сообщение другого типа (например, http.response.pathsend) до
+                # тела: сжимать нечего, но задержанное начало ответа должно
+                # уйти первым
+                assert self._start is not None
+                self._compress = False
+                await self._send(self._start)
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self._compress is None:
+            assert self._start is not None
+            if not more_body and len(body) < self.middleware.min_size:
+                self._compress = False
+                await self._send(self._start)
+                await self._send(message)
+                return
+            self._compress = True
+            self._compressor = self.middleware.encodings[self.encoding]()
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            await self._send_body(body, more_body, first=True)
+            return
+        await self._send_body(body, more_body)
+
+    async def _send_body(
+        self, body: bytes, more_body: bool, first: bool = False
+    ) -> None:
+        assert self._compressor is not None and self._start is not None
+        data = (
+            await self.middleware.run(self._compressor.compress, body) if body else b""
+        )
+        if not more_body:
+            data += self._compressor.finish()
+        if first:
+            if not more_body:
+                MutableHeaders(raw=self._start["headers"])["Content-Length"] = str(
+                    len(data)
+                )
+            await self._send(self._start)
+        if data or not more_body:
+            await self._send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+    @staticmethod
+    def _compressible(status: int, headers: Headers) -> bool:
+        """Можно ли сжимать ответ с таким статусом и заголовками."""
+        if status in NO_BODY_STATUSES or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Dict, Iterable, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.config import settings
+from src.database.deadline import deadline_scope, is_deadline_error
+from src.handlers.custom_exceptions import DeadlineExceededException
+from src.logger import get_logger
+from src.middleware.utils import header_timeout_ms, is_read, route_key
+
+logger = get_logger(__name__)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware сроков выполнения запросов.
+
+    Срок определяется по маршруту (или по типу запроса) и может быть изменен
+    заголовком X-Request-Timeout-Ms в пределах max_ms. Оставшееся время
+    ограничивает запросы к БД, а по истечении срока обработка отменяется,
+    соединение возвращается в пул и клиент получает 504.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        read_ms: float = settings.DEADLINE_READ_MS,
+        write_ms: float = settings.DEADLINE_WRITE_MS,
+        max_ms: float = settings.DEADLINE_MAX_MS,
+        route_ms: Optional[Dict[str, float]] = None,
+        exempt_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.read_ms = read_ms
+        self.write_ms = write_ms
+        self.max_ms = max_ms
+        self.route_ms = settings.DEADLINE_ROUTE_MS if route_ms is None else route_ms
+        self.exempt_paths = frozenset(exempt_paths)
+
+    def timeout(self, scope: Scope) -> float:
+        """
+        Определяет срок выполнения запроса.
+
+        :param scope: ASGI scope запроса.
+        :return: Время в секундах.
+        """
+        timeout_ms = header_timeout_ms(scope)
+        if timeout_ms is None:
+            timeout_ms = self.read_ms if is_read(scope) else self.write_ms
+            if self.route_ms:
+                timeout_ms = self.route_ms.get(route_key(scope) or "", timeout_ms)
+        return min(timeout_ms, self.max_ms) / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        timeout = self.timeout(scope)
+        with deadline_scope(timeout):
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.app(scope, receive, send_wrapper)
+                return
+            except TimeoutError:
+                pass
+            except Exception as exc:
+                if not is_deadline_error(exc):
+                    raise
+
+        logger.warning(
+            "Запрос %s %s не выполнен за %.3f с",
+            scope["method"],
+            scope["path"],
+            timeout,
+        )
+        error = DeadlineExceededException()
+        if response_started:
+            # Ответ уже начал отправляться, остается только оборвать соединение
+            raise error
+        response = JSONResponse(
+            {"detail": error.detail, "timeout_ms": round(timeout * 1000)},
+            status_code=error.status_code,
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,31 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.admin.profiler import SamplingProfiler, profiler
+from src.middleware.utils import route_key
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware выборочного профилирования запросов.
+
+    Пока сеанс профилирования не запущен, запрос передается дальше без
+    дополнительной работы. Во время сеанса подходящие запросы регистрируются
+    в профилировщике на время обработки.
+    """
+
+    def __init__(self, app: ASGIApp, sampler: SamplingProfiler = profiler) -> None:
+        self.app = app
+        self.sampler = sampler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.sampler.capture is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not self.sampler.enter(route_key(scope)):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.sampler.leave()
@@ -0,0 +1,51 @@
+from typing import Optional
+
+from starlette.routing import Match
+from starlette.types import Scope
+
+# Заголовок, которым клиент сообщает, сколько миллисекунд готов ждать ответа
+TIMEOUT_HEADER = b"x-request-timeout-ms"
+
+# Методы, которые обслуживаются в рамках лимитов чтения
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def is_read(scope: Scope) -> bool:
+    """
+    Проверяет, что запрос только читает данные.
+
+    :param scope: ASGI scope запроса.
+    :return: True для GET, HEAD и OPTIONS.
+    """
+    return scope["method"] in READ_METHODS
+
+
+def route_key(scope: Scope) -> Optional[str]:
+    """
+    Находит маршрут, которому соответствует запрос.
+
+    :param scope: ASGI scope запроса.
+    :return: Ключ вида "GET /api/v1/students/" или None, если маршрут не найден.
+    """
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{scope['method']} {route.path}"
+    return None
+
+
+def header_timeout_ms(scope: Scope) -> Optional[float]:
+    """
+    Читает время ожидания ответа из заголовка X-Request-Timeout-Ms.
+
+    :param scope: ASGI scope запроса.
+    :return: Время в миллисекундах или None, если заголовок отсутствует или некорректен.
+    """
+    for name, value in scope["headers"]:
+        if name == TIMEOUT_HEADER:
+            try:
+                timeout = float(value)
+            except ValueError:
+                return None
+            return timeout if timeout >= 0 else None
+    return None
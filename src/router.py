@@ -1,22 +1,52 @@
-from typing import Optional
+import json
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional
 
-from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi import APIRouter, Depends, Header, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
 
-from src.database.repository import StudentRepository
+from src.database.change_feed import ChangeEvent, FeedGap, FeedOverflow, change_feed
+from src.database.config import settings
+from src.database.fragment_cache import fragment_cache
+from src.database.repository import STUDENT_LIST_COLUMNS, StudentRepository
 from src.database.service import DBSession
+from src.database.sharding import ShardedStudentRepository, shard_router
+from src.database.singleflight import SingleFlight
+from src.formats import (
+    COLUMNAR_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    StudentRows,
+    encode_students,
+    negotiate_media_type,
+)
+from src.handlers.custom_exceptions import (
+    EventsExpiredException,
+    InvalidStudentIdsException,
+    ShardingNotSupportedException,
+)
 from src.schemas.base_schemas import SuccessResponse
 from src.schemas.student_schemas import (
     BodyStudentSchema,
+    BulkUpdateStudentsResultSchema,
+    BulkUpdateStudentsSchema,
     DeleteQueryStudentSchema,
+    GetStudentSchema,
     QueryStudentSchema,
     ResponseStudentSchema,
     ResponseStudentsWithPaginationSchema,
+    StudentChangesSchema,
+    StudentsByIdsSchema,
     StudentStatusEnum,
     UpdateStudentSchema,
+    UpsertStudentsResultSchema,
+    UpsertStudentsSchema,
 )
 
 router = APIRouter(prefix="/api/v1/students", tags=["Студенты"])
 
+# Одновременные одинаковые запросы списка студентов выполняются один раз
+students_list_flight: SingleFlight[bytes] = SingleFlight()
+
 
 @router.post(
     "/",
@@ -42,6 +72,10 @@ async def add_student(
     student_data: BodyStudentSchema,
 ) -> ResponseStudentSchema:
     """Добавление нового студента"""
+    if shard_router.enabled:
+        return await ShardedStudentRepository.add_new_student(
+            shard_router, student_data
+        )
     return await StudentRepository.add_new_student(session, student_data)
 
 
@@ -50,11 +84,17 @@ async def add_student(
     response_model=ResponseStudentsWithPaginationSchema,
     status_code=status.HTTP_200_OK,
     summary="Получить список студентов",
-    description="Возвращает список студентов с возможностью фильтрации и пагинации.",
+    description=(
+        "Возвращает список студентов с возможностью фильтрации и пагинации. "
+        f"С заголовком Accept: {COLUMNAR_MEDIA_TYPE} возвращает колоночный JSON "
+        "(массив на каждое поле, study_status и faculty_title заменены номерами "
+        f"в dictionaries), с Accept: {MSGPACK_MEDIA_TYPE} - то же в MessagePack."
+    ),
     responses={
         status.HTTP_200_OK: {
             "description": "Список студентов успешно получен",
             "model": ResponseStudentsWithPaginationSchema,
+            "content": {COLUMNAR_MEDIA_TYPE: {}, MSGPACK_MEDIA_TYPE: {}},
         },
         status.HTTP_422_UNPROCESSABLE_ENTITY: {
             "description": "Ошибка валидации данных"
@@ -64,10 +104,296 @@ async def add_student(
 async def get_students(
     session: DBSession,
     params: QueryStudentSchema = Depends(),
-) -> ResponseStudentsWithPaginationSchema:
+    accept: Optional[str] = Header(None, include_in_schema=False),
+) -> Response:
     """Получение списка студентов"""
     query_params = params.model_dump()
-    return await StudentRepository.get_students(session, query_params)
+    media_type = negotiate_media_type(accept)
+
+    async def render() -> bytes:
+        if media_type != JSON_MEDIA_TYPE:
+            if shard_router.enabled:
+                rows = StudentRows.from_schema(
+                    await ShardedStudentRepository.get_students(
+                        shard_router, query_params
+                    ),
+                    STUDENT_LIST_COLUMNS,
+                )
+            else:
+                rows = await StudentRepository.get_students_rows(session, query_params)
+            return encode_students(rows, media_type)
+        if shard_router.enabled:
+            students = await ShardedStudentRepository.get_students(
+                shard_router, query_params
+            )
+        elif settings.LIST_DB_JSON:
+            return await StudentRepository.get_students_json(session, query_params)
+        elif fragment_cache.enabled:
+            return await StudentRepository.get_students_fragments(session, query_params)
+        else:
+            students = await StudentRepository.get_students(session, query_params)
+        return students.model_dump_json().encode()
+
+    if settings.LIST_COALESCING:
+        body = await students_list_flight.run(
+            _list_key(query_params, media_type), render
+        )
+    else:
+        body = await render()
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+
+
+def _list_key(query_params: Dict[str, Any], media_type: str) -> Hashable:
+    """Ключ для объединения одинаковых запросов списка студентов"""
+    return media_type, tuple(sorted(query_params.items()))
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Подписаться на изменения студентов",
+    description=(
+        "Поток Server-Sent Events с событиями create, update и delete. "
+        "При переподключении передайте заголовок Last-Event-ID, "
+        "чтобы получить пропущенные события."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Поток событий",
+            "content": {"text/event-stream": {}},
+        },
+        status.HTTP_410_GONE: {"description": "События после указанного ID недоступны"},
+    },
+)
+async def stream_student_events(
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    since: Optional[int] = Query(
+        None, description="ID последнего полученного события (вместо заголовка)"
+    ),
+) -> StreamingResponse:
+    """Поток изменений студентов"""
+    try:
+        subscription = change_feed.subscribe(
+            last_event_id if last_event_id is not None else since
+        )
+    except FeedGap:
+        raise EventsExpiredException()
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in change_feed.stream(
+                subscription, settings.CHANGE_FEED_KEEPALIVE_SECONDS
+            ):
+                yield _format_event(event) if event else ": keep-alive\n\n"
+        except FeedOverflow:
+            # Клиент не успевает читать: закрываем поток, клиент переподключится
+            # с последним полученным ID
+            yield "event: overflow\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=StudentChangesSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Получить изменения студентов",
+    description=(
+        "Возвращает студентов, измененных или удаленных после токена синхронизации. "
+        "Без токена возвращает все записи постранично с начала."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Изменения успешно получены",
+            "model": StudentChangesSchema,
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Некорректный токен синхронизации!"
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+        status.HTTP_501_NOT_IMPLEMENTED: {
+            "description": "Синхронизация недоступна при шардировании"
+        },
+    },
+)
+async def get_student_changes(
+    session: DBSession,
+    since: Optional[str] = Query(
+        None, description="Токен синхронизации из предыдущего ответа"
+    ),
+    limit: int = Query(
+        1000, ge=1, le=10000, description="Максимальный размер страницы изменений"
+    ),
+) -> StudentChangesSchema:
+    """Получение изменений студентов"""
+    if shard_router.enabled:
+        raise ShardingNotSupportedException()
+    return await StudentRepository.get_changes(session, since, limit)
+
+
+def _format_event(event: ChangeEvent) -> str:
+    """Форматирует событие в формате Server-Sent Events"""
+    data = json.dumps(
+        {"student_id": event.student_id, "data": event.data}, ensure_ascii=False
+    )
+    return f"id: {event.id}\nevent: {event.action}\ndata: {data}\n\n"
+
+
+@router.get(
+    "/batch",
+    response_model=StudentsByIdsSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Получить студентов по списку ID",
+    description=(
+        "Возвращает студентов по списку ID, переданному через запятую. "
+        "Все ID, отсутствующие в кэше, запрашиваются одним запросом к БД."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Студенты успешно получены",
+            "model": StudentsByIdsSchema,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Некорректный список ID студентов!"
+        },
+    },
+)
+async def get_students_by_ids(
+    session: DBSession,
+    ids: str = Query(..., description="ID студентов через запятую, например 1,2,3"),
+) -> StudentsByIdsSchema:
+    """Получение студентов по списку ID"""
+    student_ids = _parse_ids(ids)
+    if shard_router.enabled:
+        students = await ShardedStudentRepository.get_students_by_ids(
+            shard_router, student_ids
+        )
+    else:
+        students = await StudentRepository.get_students_by_ids(session, student_ids)
+    found = {student.id for student in students}
+    return StudentsByIdsSchema(
+        students=students,
+        missing=[
+            student_id
+            for student_id in dict.fromkeys(student_ids)
+            if student_id not in found
+        ],
+    )
+
+
+def _parse_ids(ids: str) -> List[int]:
+    """Разбирает список ID студентов, переданный через запятую"""
+    try:
+        student_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise InvalidStudentIdsException()
+    if not student_ids or min(student_ids) < 1:
+        raise InvalidStudentIdsException()
+    if len(student_ids) > settings.STUDENT_BATCH_MAX_IDS:
+        raise InvalidStudentIdsException(
+            f"Можно запросить не более {settings.STUDENT_BATCH_MAX_IDS} студентов!"
+        )
+    return student_ids
+
+
+@router.get(
+    "/{student_id}",
+    response_model=GetStudentSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Получить студента",
+    description="Возвращает данные студента по его ID.",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Студент успешно получен",
+            "model": GetStudentSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Запрашиваемая запись не найдена!"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+    },
+)
+async def get_student(
+    session: DBSession,
+    student_id: int = Path(..., title="Student ID", description="ID студента", ge=1),
+) -> GetStudentSchema:
+    """Получение студента по ID"""
+    if shard_router.enabled:
+        return await ShardedStudentRepository.get_student(shard_router, student_id)
+    return await StudentRepository.get_student(session, student_id)
+
+
+@router.patch(
+    "/",
+    response_model=BulkUpdateStudentsResultSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Изменить многих студентов",
+    description=(
+        "Применяет изменения многих студентов одной транзакцией. У каждого студента "
+        "может меняться свой набор полей. Изменения с несуществующими студентами "
+        "или факультетами не применяются и перечисляются в ответе."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Изменения применены",
+            "model": BulkUpdateStudentsResultSchema,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+    },
+)
+async def bulk_update_students(
+    session: DBSession,
+    params: BulkUpdateStudentsSchema,
+) -> BulkUpdateStudentsResultSchema:
+    """Массовое изменение студентов"""
+    if shard_router.enabled:
+        return await ShardedStudentRepository.bulk_update_students(
+            shard_router, params.students
+        )
+    return await StudentRepository.bulk_update_students(session, params.students)
+
+
+@router.put(
+    "/",
+    response_model=UpsertStudentsResultSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Загрузить список студентов",
+    description=(
+        "Сохраняет список студентов из внешней системы одной транзакцией. Студенты "
+        "сопоставляются по внешнему ID: новые добавляются, существующие изменяются, "
+        "студенты без изменений не перезаписываются. Студенты с несуществующими "
+        "факультетами не сохраняются и перечисляются в ответе."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Список студентов сохранен",
+            "model": UpsertStudentsResultSchema,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации данных"
+        },
+        status.HTTP_501_NOT_IMPLEMENTED: {
+            "description": "Загрузка списка недоступна при шардировании"
+        },
+    },
+)
+async def upsert_students(
+    session: DBSession,
+    params: UpsertStudentsSchema,
+) -> UpsertStudentsResultSchema:
+    """Загрузка списка студентов с добавлением или изменением"""
+    if shard_router.enabled:
+        raise ShardingNotSupportedException()
+    return await StudentRepository.upsert_students(session, params.students)
 
 
 @router.patch(
@@ -93,6 +419,10 @@ async def update_student(
     student_id: int = Path(..., title="Student ID", description="ID студента", ge=1),
 ) -> ResponseStudentSchema:
     """Обновление информации о студенте"""
+    if shard_router.enabled:
+        return await ShardedStudentRepository.update_student(
+            shard_router, student_id, student_data
+        )
     return await StudentRepository.update_student(session, student_id, student_data)
 
 
@@ -118,6 +448,8 @@ async def delete_student(
     student_id: int = Path(..., ge=1),
 ) -> SuccessResponse:
     """Удаление студента"""
+    if shard_router.enabled:
+        return await ShardedStudentRepository.remove_student(shard_router, student_id)
     return await StudentRepository.remove_student(session, student_id)
 
 
@@ -144,4 +476,8 @@ async def delete_students_with_params(
 ) -> SuccessResponse:
     """Удаление студентов с параметрами"""
     query_params = params.model_dump()
+    if shard_router.enabled:
+        return await ShardedStudentRepository.remove_students_with_params(
+            shard_router, query_params
+        )
     return await StudentRepository.remove_students_with_params(session, query_params)
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.database.config import settings
+
+
+class StartProfilingSchema(BaseModel):
+    """
+    Схема для запуска сеанса профилирования.
+    """
+
+    route: Optional[str] = Field(
+        None,
+        title="Маршрут",
+        description=(
+            'Маршрут в виде "МЕТОД путь", например "GET /api/v1/students/". '
+            "Если не указан, профилируются все маршруты."
+        ),
+    )
+    requests: Optional[int] = Field(
+        None,
+        ge=1,
+        le=10000,
+        title="Количество запросов",
+        description="Сколько следующих запросов профилировать.",
+    )
+    seconds: float = Field(
+        60,
+        gt=0,
+        le=settings.PROFILER_MAX_SECONDS,
+        title="Длительность",
+        description="Максимальная длительность сеанса в секундах.",
+    )
+    interval_ms: float = Field(
+        settings.PROFILER_INTERVAL_MS,
+        ge=1,
+        le=100,
+        title="Интервал",
+        description="Интервал между снимками стека в миллисекундах.",
+    )
+
+
+class ProfilingStatusSchema(BaseModel):
+    """
+    Схема для ответа с состоянием текущего или последнего сеанса профилирования.
+    """
+
+    active: bool = Field(
+        ..., title="Активен", description="Идет ли сеанс профилирования."
+    )
+    route: Optional[str] = Field(
+        None, title="Маршрут", description="Профилируемый маршрут."
+    )
+    requests: Optional[int] = Field(
+        None,
+        title="Количество запросов",
+        description="Сколько запросов профилируется в сеансе.",
+    )
+    started_at: Optional[datetime] = Field(
+        None, title="Начало", description="Дата и время начала сеанса."
+    )
+    profiled_requests: int = Field(
+        0,
+        title="Обработано запросов",
+        description="Количество завершенных профилируемых запросов.",
+    )
+    samples: int = Field(0, title="Снимков", description="Количество снятых стеков.")
+    output: Optional[str] = Field(
+        None,
+        title="Файл",
+        description="Путь к файлу collapsed stacks (после завершения сеанса).",
+    )
+
+
+class SlowQuerySchema(BaseModel):
+    """
+    Схема для ответа со статистикой медленного запроса.
+    """
+
+    fingerprint: str = Field(
+        ..., title="Отпечаток", description="Хэш нормализованного текста запроса."
+    )
+    sql: str = Field(
+        ..., title="SQL", description="Текст запроса без значений параметров."
+    )
+    dialect: str = Field(..., title="СУБД", description="Диалект БД.")
+    count: int = Field(
+        ..., title="Количество", description="Количество медленных выполнений."
+    )
+    total_ms: float = Field(
+        ...,
+        title="Суммарное время",
+        description="Суммарная длительность медленных выполнений в миллисекундах.",
+    )
+    max_ms: float = Field(
+        ...,
+        title="Максимальное время",
+        description="Длительность самого медленного выполнения в миллисекундах.",
+    )
+    origins: Dict[str, int] = Field(
+        ...,
+        title="Источники",
+        description="Методы приложения, выполнившие запрос, и количество выполнений.",
+    )
+    params: Dict[str, str] = Field(
+        ...,
+        title="Параметры",
+        description="Типы параметров самого медленного выполнения, для limit и offset - значения.",
+    )
+    last_seen: Optional[datetime] = Field(
+        None,
+        title="Последнее выполнение",
+        description="Дата и время последнего медленного выполнения.",
+    )
+    plan: Optional[List[str]] = Field(
+        None, title="План", description="План запроса EXPLAIN, если он снят."
+    )
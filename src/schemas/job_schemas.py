@@ -0,0 +1,99 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.database.config import settings
+from src.schemas.student_schemas import (
+    BodyStudentSchema,
+    DeleteQueryStudentSchema,
+    StudentStatusEnum,
+)
+
+
+class JobStatusEnum(str, Enum):
+    """
+    Перечисление для статуса фоновой задачи.
+    """
+
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class JobSchema(BaseModel):
+    """
+    Схема для ответа с информацией о фоновой задаче.
+    """
+
+    id: int = Field(
+        ..., title="ID задачи", description="Уникальный идентификатор задачи."
+    )
+    kind: str = Field(..., title="Тип задачи", description="Тип выполняемой операции.")
+    status: JobStatusEnum = Field(
+        ..., title="Статус задачи", description="Текущий статус выполнения задачи."
+    )
+    processed: int = Field(
+        ...,
+        title="Обработано записей",
+        description="Количество записей, обработанных к текущему моменту.",
+    )
+    total: Optional[int] = Field(
+        None,
+        title="Всего записей",
+        description="Оценка общего количества записей на момент создания задачи.",
+    )
+    error: Optional[str] = Field(
+        None, title="Ошибка", description="Сообщение об ошибке, если задача упала."
+    )
+    created_at: datetime = Field(
+        ..., title="Создана", description="Дата и время создания задачи."
+    )
+    heartbeat_at: datetime = Field(
+        ...,
+        title="Последняя активность",
+        description="Дата и время последнего сохранения прогресса задачи.",
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangeStatusJobSchema(DeleteQueryStudentSchema):
+    """
+    Схема для массового изменения статуса обучения студентов по фильтрам.
+    """
+
+    new_status: StudentStatusEnum = Field(
+        ...,
+        title="Новый статус обучения",
+        description="Статус, который будет установлен найденным студентам.",
+    )
+
+
+class ImportStudentsJobSchema(BaseModel):
+    """
+    Схема для массового добавления студентов.
+    """
+
+    students: List[BodyStudentSchema] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.JOB_IMPORT_MAX_ITEMS,
+        title="Список студентов",
+        description="Данные добавляемых студентов.",
+    )
+
+
+class ArchiveStudentsJobSchema(BaseModel):
+    """
+    Схема для переноса выпускников и отчисленных студентов в архив.
+    """
+
+    older_than_days: float = Field(
+        settings.ARCHIVE_AFTER_DAYS,
+        ge=0,
+        title="Срок без изменений",
+        description="В архив переносятся студенты, не изменявшиеся указанное количество дней.",
+    )
@@ -1,9 +1,11 @@
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.database.config import settings
+
 
 class StudentStatusEnum(str, Enum):
     """
@@ -90,6 +92,64 @@ class UpdateStudentSchema(BaseModel):
     )
 
 
+class BulkUpdateStudentSchema(UpdateStudentSchema):
+    """
+    Схема для изменения одного студента в массовом изменении.
+    """
+
+    id: int = Field(
+        ..., ge=1, title="ID студента", description="ID изменяемого студента."
+    )
+
+
+class BulkUpdateStudentsSchema(BaseModel):
+    """
+    Схема для массового изменения студентов.
+    """
+
+    students: List[BulkUpdateStudentSchema] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.STUDENT_BULK_MAX_ITEMS,
+        title="Изменения",
+        description=(
+            "ID студентов и изменяемые поля. У каждого студента может меняться "
+            "свой набор полей."
+        ),
+    )
+
+
+class UpsertStudentSchema(BodyStudentSchema):
+    """
+    Схема для студента в загрузке списка студентов из внешней системы.
+    """
+
+    external_id: str = Field(
+        ...,
+        min_length=1,
+        max_length=64,
+        title="Внешний ID",
+        description="Идентификатор студента во внешней системе. Должен быть от 1 до 64 символов.",
+    )
+
+
+class UpsertStudentsSchema(BaseModel):
+    """
+    Схема для загрузки списка студентов с добавлением или изменением.
+    """
+
+    students: List[UpsertStudentSchema] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.STUDENT_BULK_MAX_ITEMS,
+        title="Студенты",
+        description=(
+            "Полные данные студентов. Студенты сопоставляются по внешнему ID: "
+            "новые добавляются, существующие изменяются."
+        ),
+    )
+
+
 class QueryStudentSchema(UpdateStudentSchema):
     """
     Схема для фильтрации студентов с параметрами пагинации.
@@ -169,8 +229,122 @@ class ResponseStudentsWithPaginationSchema(BaseModel):
         title="Лимит на странице",
         description="Количество студентов на одной странице.",
     )
-    students: List[ResponseStudentSchema] = Field(
+    students: List[GetStudentSchema] = Field(
         ...,
         title="Список студентов",
         description="Список студентов на текущей странице.",
     )
+
+
+class StudentsByIdsSchema(BaseModel):
+    """
+    Схема для ответа со студентами, запрошенными по списку ID.
+    """
+
+    students: List[GetStudentSchema] = Field(
+        ...,
+        title="Список студентов",
+        description="Найденные студенты в порядке запрошенных ID.",
+    )
+    missing: List[int] = Field(
+        ...,
+        title="Ненайденные ID",
+        description="Запрошенные ID, для которых студенты не найдены.",
+    )
+
+
+class BulkUpdateErrorSchema(BaseModel):
+    """
+    Схема для изменения, которое не удалось применить.
+    """
+
+    id: int = Field(..., title="ID студента", description="ID студента из изменения.")
+    detail: str = Field(..., title="Ошибка", description="Причина ошибки.")
+
+
+class BulkUpdateStudentsResultSchema(BaseModel):
+    """
+    Схема для ответа на массовое изменение студентов.
+    """
+
+    updated: int = Field(
+        ..., title="Изменено", description="Количество измененных студентов."
+    )
+    failed: List[BulkUpdateErrorSchema] = Field(
+        ...,
+        title="Ошибки",
+        description="Изменения, которые не удалось применить.",
+    )
+
+
+class UpsertErrorSchema(BaseModel):
+    """
+    Схема для студента из загружаемого списка, которого не удалось сохранить.
+    """
+
+    external_id: str = Field(
+        ..., title="Внешний ID", description="Внешний ID студента из списка."
+    )
+    detail: str = Field(..., title="Ошибка", description="Причина ошибки.")
+
+
+class UpsertStudentsResultSchema(BaseModel):
+    """
+    Схема для ответа на загрузку списка студентов.
+    """
+
+    inserted: int = Field(
+        ..., title="Добавлено", description="Количество добавленных студентов."
+    )
+    updated: int = Field(
+        ..., title="Изменено", description="Количество измененных студентов."
+    )
+    unchanged: int = Field(
+        ...,
+        title="Без изменений",
+        description="Количество студентов, данные которых совпали с сохраненными.",
+    )
+    failed: List[UpsertErrorSchema] = Field(
+        ...,
+        title="Ошибки",
+        description="Студенты, которых не удалось сохранить.",
+    )
+
+
+class StudentChangeSchema(GetStudentSchema):
+    """
+    Схема для измененного студента в инкрементальной синхронизации.
+    """
+
+    updated_at: datetime = Field(
+        ...,
+        title="Время изменения",
+        description="Дата и время последнего изменения студента.",
+    )
+
+
+class StudentChangesSchema(BaseModel):
+    """
+    Схема для ответа с изменениями студентов после токена синхронизации.
+    """
+
+    students: List[StudentChangeSchema] = Field(
+        ...,
+        title="Измененные студенты",
+        description="Созданные или измененные студенты в порядке изменения.",
+    )
+    deleted: List[int] = Field(
+        ...,
+        title="Удаленные студенты",
+        description="ID удаленных студентов в порядке удаления.",
+    )
+    next_token: str = Field(
+        ...,
+        title="Токен синхронизации",
+        description="Токен для следующего запроса изменений.",
+    )
+    has_more: bool = Field(
+        ...,
+        title="Есть еще изменения",
+        description="Нужно ли сразу запросить следующую страницу изменений.",
+    )
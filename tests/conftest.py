@@ -7,9 +7,12 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from src.database.config import settings
+from src.database.fragment_cache import fragment_cache
 from src.database.models import Base, Faculty
 from src.database.repository import StudentRepository
 from src.database.service import get_session
+from src.database.student_cache import student_cache
+from src.jobs.runner import job_runner
 from src.main import app
 from src.schemas.student_schemas import BodyStudentSchema, StudentStatusEnum
 
@@ -27,6 +30,7 @@ async def override_db_session():
 
 
 app.dependency_overrides[get_session] = override_db_session
+job_runner.session_factory = async_session
 
 
 async def setup_db():
@@ -39,6 +43,7 @@ async def teardown_db():
     """Удаляет тестовую базу данных."""
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    await engine_test.dispose()
     db_path = Path("test.db")
     if db_path.exists():
         db_path.unlink()
@@ -48,6 +53,9 @@ async def teardown_db():
 async def prepare_database():
     """Глобальная фикстура для настройки и удаления тестовой БД."""
     assert settings.MODE == "TEST"
+    # ID студентов повторяются в базах разных модулей
+    student_cache.clear()
+    fragment_cache.clear()
     await setup_db()
     yield
     await teardown_db()
@@ -60,6 +68,12 @@ async def db_session():
         yield session
 
 
+@pytest.fixture
+def session_factory():
+    """Фикстура с фабрикой сессий тестовой БД."""
+    return async_session
+
+
 @pytest.fixture
 async def client():
     """Фикстура для создания тестового клиента FastAPI."""
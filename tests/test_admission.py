@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.middleware.admission import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    Limiter,
+)
+
+
+def make_client(controller: AdmissionController, release: asyncio.Event):
+    """Создает клиент приложения, обработчики которого ждут события release."""
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow_read():
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/write")
+    async def write():
+        return {"ok": True}
+
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_reads_without_blocking_writes():
+    """
+    Тест на отклонение запросов при заполненной очереди.
+    Проверяет, что лишнее чтение получает 503 с Retry-After, запись проходит,
+    а запрос из очереди обслуживается после освобождения слота.
+    """
+    controller = AdmissionController(
+        read=Limiter("read", concurrency=1, queue_size=1),
+        write=Limiter("write", concurrency=1, queue_size=1),
+        read_budget_ms=5000,
+        write_budget_ms=5000,
+    )
+    release = asyncio.Event()
+
+    async with make_client(controller, release) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+
+        rejected = await client.get("/slow")
+        write = await client.post("/write")
+
+        release.set()
+        responses = await asyncio.gather(first, queued)
+
+    assert rejected.status_code == 503
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert write.status_code == 200
+    assert [response.status_code for response in responses] == [200, 200]
+    assert controller.read.rejected == 1
+    assert controller.read.active == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_respects_request_budget():
+    """
+    Тест на бюджет запроса из заголовка X-Request-Timeout-Ms.
+    Проверяет, что запрос не ждет в очереди дольше своего бюджета.
+    """
+    controller = AdmissionController(
+        read=Limiter("read", concurrency=1, queue_size=10),
+        write=Limiter("write", concurrency=1, queue_size=10),
+        read_budget_ms=5000,
+        write_budget_ms=5000,
+    )
+    release = asyncio.Event()
+
+    async with make_client(controller, release) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+
+        rejected = await client.get("/slow", headers={"X-Request-Timeout-Ms": "50"})
+
+        release.set()
+        await first
+
+    assert rejected.status_code == 503
+    assert controller.read.queued == 0
@@ -1,6 +1,10 @@
 import pytest
 from fastapi import status
 
+from src.database.config import settings
+from src.database.fragment_cache import fragment_cache
+from src.database.student_cache import student_cache
+from src.formats import COLUMNAR_MEDIA_TYPE
 from src.schemas.student_schemas import StudentStatusEnum
 
 
@@ -108,3 +112,217 @@ async def test_delete_students_with_params(
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert data["message"] == "Удалено 1 студентов!"
+
+
+@pytest.mark.asyncio
+async def test_get_student_by_id_uses_cache(client, create_student):
+    """
+    Тест на получение студента по ID и по списку ID.
+    Проверяет, что повторный запрос отдается из кэша, а изменение студента
+    сбрасывает запись кэша.
+    """
+    student_cache.clear()
+    response = await client.get(f"/api/v1/students/{create_student.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["first_name"] == "Иван"
+    assert response.json()["faculty_title"] is not None
+
+    await client.patch(
+        f"/api/v1/students/{create_student.id}", json={"first_name": "Петр"}
+    )
+    response = await client.get(
+        "/api/v1/students/batch", params={"ids": f"{create_student.id},9999"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [student["first_name"] for student in data["students"]] == ["Петр"]
+    assert data["missing"] == [9999]
+
+    await client.get(f"/api/v1/students/{create_student.id}")
+    assert student_cache.stats()["hits"] == 1
+
+    response = await client.get("/api/v1/students/9999")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = await client.get("/api/v1/students/batch", params={"ids": "1,abc"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_students(
+    client, create_faculty, create_student, create_expelled_student
+):
+    """
+    Тест на массовое изменение студентов.
+    Проверяет, что у каждого студента меняется свой набор полей, а изменения
+    с несуществующими студентами и факультетами перечисляются в ответе.
+    """
+    response = await client.patch(
+        "/api/v1/students/",
+        json={
+            "students": [
+                {"id": create_student.id, "first_name": "Петр"},
+                {
+                    "id": create_expelled_student.id,
+                    "study_status": "active",
+                    "date_of_birth": "2001-02-03",
+                },
+                {"id": create_student.id, "last_name": "Петров"},
+                {"id": 9999, "first_name": "Нет"},
+                {"id": 9998, "faculty_id": 9999},
+            ]
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["updated"] == 2
+    assert sorted(error["id"] for error in data["failed"]) == [9998, 9999]
+
+    response = await client.get(
+        "/api/v1/students/batch",
+        params={"ids": f"{create_student.id},{create_expelled_student.id}"},
+    )
+    first, second = response.json()["students"]
+    assert (first["first_name"], first["last_name"]) == ("Петр", "Петров")
+    assert (second["study_status"], second["date_of_birth"]) == ("active", "2001-02-03")
+
+
+@pytest.mark.asyncio
+async def test_upsert_students(client, create_faculty):
+    """
+    Тест на загрузку списка студентов по внешнему ID.
+    Проверяет, что новые студенты добавляются, измененные изменяются,
+    а студенты без изменений и с несуществующими факультетами подсчитываются
+    отдельно.
+    """
+    roster = [
+        {
+            "external_id": "R-1",
+            "first_name": "Иван",
+            "last_name": "Иванов",
+            "date_of_birth": "2000-01-01",
+            "faculty_id": create_faculty.id,
+        },
+        {
+            "external_id": "R-2",
+            "first_name": "Мария",
+            "last_name": "Петрова",
+            "date_of_birth": "2001-02-03",
+        },
+        {
+            "external_id": "R-3",
+            "first_name": "Олег",
+            "last_name": "Сидоров",
+            "date_of_birth": "2002-03-04",
+            "faculty_id": 9999,
+        },
+    ]
+    response = await client.put("/api/v1/students/", json={"students": roster})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["unchanged"]) == (2, 0, 0)
+    assert [error["external_id"] for error in data["failed"]] == ["R-3"]
+
+    roster[1]["study_status"] = "academic_leave"
+    roster[2]["faculty_id"] = create_faculty.id
+    response = await client.put("/api/v1/students/", json={"students": roster})
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["unchanged"]) == (1, 1, 1)
+    assert data["failed"] == []
+
+    response = await client.get(
+        "/api/v1/students/", params={"study_status": "academic_leave"}
+    )
+    students = response.json()["students"]
+    assert [student["last_name"] for student in students] == ["Петрова"]
+
+
+@pytest.mark.asyncio
+async def test_get_students_rendered_by_database(
+    client, monkeypatch, create_student, create_expelled_student
+):
+    """
+    Тест на построение JSON списка студентов запросом к БД.
+    Проверяет, что ответ совпадает с ответом, построенным в Python.
+    """
+    queries = [
+        {},
+        {"study_status": "expelled"},
+        {"limit": 1, "page": 2},
+        {"first_name": "Нет такого"},
+    ]
+    monkeypatch.setattr(fragment_cache, "max_bytes", 0)
+    expected = [
+        (await client.get("/api/v1/students/", params=query)).json()
+        for query in queries
+    ]
+    monkeypatch.setattr(settings, "LIST_DB_JSON", True)
+    for query, python_rendered in zip(queries, expected):
+        response = await client.get("/api/v1/students/", params=query)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == python_rendered
+    assert expected[0]["students"][0]["faculty_title"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_students_from_fragment_cache(
+    client, monkeypatch, create_student, create_expelled_student
+):
+    """
+    Тест на сборку списка студентов из кэша фрагментов JSON.
+    Проверяет, что ответ совпадает с ответом, построенным в Python, повторный
+    запрос берет студентов из кэша, а изменение студента сбрасывает его фрагмент.
+    """
+    queries = [{}, {"study_status": "expelled"}, {"limit": 1, "page": 2}]
+    monkeypatch.setattr(fragment_cache, "max_bytes", 0)
+    expected = [
+        (await client.get("/api/v1/students/", params=query)).content
+        for query in queries
+    ]
+    monkeypatch.setattr(fragment_cache, "max_bytes", 2**20)
+    fragment_cache.clear()
+    for _ in range(2):
+        for query, python_rendered in zip(queries, expected):
+            response = await client.get("/api/v1/students/", params=query)
+            assert response.content == python_rendered
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    response = await client.get(
+        "/api/v1/admin/caches", headers={"X-Admin-Token": "secret"}
+    )
+    assert response.json()["fragments"]["hits"] >= 2
+
+    await client.patch(
+        f"/api/v1/students/{create_student.id}", json={"first_name": "Петр"}
+    )
+    response = await client.get("/api/v1/students/")
+    first_names = [student["first_name"] for student in response.json()["students"]]
+    assert "Петр" in first_names
+
+
+@pytest.mark.asyncio
+async def test_get_students_columnar(client, create_student, create_expelled_student):
+    """
+    Тест на колоночный формат списка студентов.
+    Проверяет, что формат выбирается по заголовку Accept и что после раскрытия
+    словарей колонки совпадают с обычным ответом.
+    """
+    for query in [{}, {"study_status": "expelled"}, {"limit": 1, "page": 2}]:
+        expected = (await client.get("/api/v1/students/", params=query)).json()
+        response = await client.get(
+            "/api/v1/students/",
+            params=query,
+            headers={"Accept": f"{COLUMNAR_MEDIA_TYPE}, application/json;q=0.5"},
+        )
+        assert response.headers["Content-Type"] == COLUMNAR_MEDIA_TYPE
+        body = response.json()
+        assert {key: body[key] for key in ("total", "page", "limit")} == {
+            key: expected[key] for key in ("total", "page", "limit")
+        }
+        assert body["count"] == len(expected["students"])
+
+        columns = body["columns"]
+        for name, dictionary in body["dictionaries"].items():
+            columns[name] = [
+                None if code is None else dictionary[code] for code in columns[name]
+            ]
+        students = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        assert students == expected["students"]
@@ -0,0 +1,156 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import status
+
+from src.database.change_feed import ChangeFeed, FeedGap, FeedOverflow, change_feed
+from src.database.config import settings
+from src.database.repository import StudentRepository
+
+
+@pytest.mark.asyncio
+async def test_change_feed_publishes_after_commit(client, create_faculty):
+    """
+    Тест на публикацию событий после commit.
+    Проверяет, что создание, изменение и удаление студента попадают в ленту
+    изменений, а подписка с Last-Event-ID получает пропущенные события.
+    """
+    subscription = change_feed.subscribe()
+    student_data = {
+        "first_name": "Иван",
+        "last_name": "Иванов",
+        "date_of_birth": "2000-01-01",
+        "faculty_id": create_faculty.id,
+    }
+    response = await client.post("/api/v1/students/", json=student_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    student_id = response.json()["id"]
+    await client.patch(f"/api/v1/students/{student_id}", json={"first_name": "Петр"})
+    await client.delete(f"/api/v1/students/{student_id}")
+
+    events = [await subscription.get(timeout=1) for _ in range(3)]
+    change_feed.unsubscribe(subscription)
+
+    assert [event.action for event in events] == ["create", "update", "delete"]
+    assert all(event.student_id == student_id for event in events)
+    assert events[1].data["first_name"] == "Петр"
+
+    resumed = change_feed.subscribe(last_event_id=events[0].id)
+    replayed = [await resumed.get(timeout=1) for _ in range(2)]
+    change_feed.unsubscribe(resumed)
+    assert [event.id for event in replayed] == [event.id for event in events[1:]]
+
+
+@pytest.mark.asyncio
+async def test_change_feed_backpressure(db_session):
+    """
+    Тест на ограничение буфера подписчика и истории событий.
+    Проверяет, что переполненная подписка закрывается, а продолжение
+    с вытесненного из истории события невозможно.
+    """
+    feed = ChangeFeed(channel="test", history_size=2, buffer_size=1)
+    subscription = feed.subscribe()
+    for student_id in range(3):
+        feed.stage(db_session, "delete", student_id)
+    feed.after_commit(db_session)
+
+    first = await subscription.get(timeout=0.1)
+    assert first.student_id == 0
+    with pytest.raises(FeedOverflow):
+        await subscription.get(timeout=0.1)
+    with pytest.raises(FeedGap):
+        feed.subscribe(last_event_id=first.id - 1)
+
+
+@pytest.mark.asyncio
+async def test_change_feed_ids_follow_commit_order(session_factory):
+    """
+    Тест на ID событий конкурентных транзакций.
+    Проверяет, что событие транзакции, которая подготовила его раньше, а
+    завершилась позже, получает больший ID из счетчика в БД, не пропускается
+    при продолжении с Last-Event-ID и передается другим процессам с тем же ID.
+    """
+    subscription = change_feed.subscribe()
+    async with session_factory() as first, session_factory() as second:
+        change_feed.stage(first, "update", 1)
+        change_feed.stage(second, "update", 2)
+        await StudentRepository._secure_commit(second)
+        await StudentRepository._secure_commit(first)
+
+    second_event, first_event = [await subscription.get(timeout=1) for _ in range(2)]
+    change_feed.unsubscribe(subscription)
+    assert (second_event.student_id, first_event.student_id) == (2, 1)
+    assert first_event.id > second_event.id
+
+    resumed = change_feed.subscribe(last_event_id=second_event.id)
+    assert (await resumed.get(timeout=1)).id == first_event.id
+    change_feed.unsubscribe(resumed)
+
+    (payload,) = change_feed._notify_payloads([first_event])
+    assert json.loads(payload)[0]["id"] == first_event.id
+
+
+@pytest.mark.asyncio
+async def test_change_feed_rejects_ids_before_start(session_factory):
+    """
+    Тест на продолжение потока в процессе, запущенном позже события.
+    Проверяет, что ID, выданный до запуска ленты, отклоняется (FeedGap), а
+    не приводит к молчаливому пропуску событий.
+    """
+    async with session_factory() as session:
+        change_feed.stage(session, "update", 1)
+        await StudentRepository._secure_commit(session)
+        engine = session.bind
+
+    feed = ChangeFeed(channel="test", history_size=10, buffer_size=10)
+    await feed.start_listener(engine)
+    with pytest.raises(FeedGap):
+        feed.subscribe(last_event_id=0)
+
+
+@pytest.mark.asyncio
+async def test_change_feed_relistens_after_disconnect(monkeypatch):
+    """
+    Тест на восстановление LISTEN после разрыва соединения.
+    Проверяет повтор неудачной попытки, вызов обработчиков восстановления и
+    сдвиг начала истории: события за время разрыва могли быть пропущены.
+    """
+
+    class DroppedConnection:
+        async def invalidate(self):
+            pass
+
+    feed = ChangeFeed(channel="test", history_size=10, buffer_size=10)
+    engine = SimpleNamespace(url="postgresql+asyncpg://db/students")
+    attempts = []
+
+    async def listen(engine):
+        attempts.append(engine)
+        if len(attempts) == 1:
+            raise OSError("connection refused")
+        feed._listen_connections[engine.url] = DroppedConnection()
+
+    async def mark_history_start(engine):
+        feed._evicted_id = 42
+
+    reconnected = asyncio.Event()
+
+    async def on_reconnect():
+        reconnected.set()
+
+    monkeypatch.setattr(feed, "_listen", listen)
+    monkeypatch.setattr(feed, "_mark_history_start", mark_history_start)
+    monkeypatch.setattr(settings, "CHANGE_FEED_RECONNECT_MIN_SECONDS", 0)
+    feed.add_reconnect_hook(on_reconnect)
+    feed._listen_connections[engine.url] = DroppedConnection()
+
+    feed._on_terminated(engine, None)
+    assert not feed.listening
+    await asyncio.wait_for(reconnected.wait(), timeout=1)
+
+    assert len(attempts) == 2
+    assert feed.listens_to(engine)
+    with pytest.raises(FeedGap):
+        feed.subscribe(last_event_id=41)
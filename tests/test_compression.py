@@ -0,0 +1,154 @@
+import asyncio
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import Response
+
+from src.middleware.compression import (
+    CompressionMiddleware,
+    GzipCompressor,
+    negotiate,
+)
+
+# Ответ списка студентов с повторяющимися ключами
+BODY = b'{"students":[' + b",".join([b'{"faculty_title":"Physics"}'] * 500) + b"]}"
+
+
+def create_app(**kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return Response(content=BODY, media_type="application/json")
+
+    @app.get("/small")
+    async def small():
+        return Response(content=b'{"ok":true}', media_type="application/json")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for number in range(3):
+                yield f"data: {number}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, **kwargs)
+    return app
+
+
+def test_negotiate_encoding():
+    """
+    Тест на выбор кодировки по заголовку Accept-Encoding.
+    Проверяет веса q, запрет кодировки через q=0 и порядок предпочтения сервера.
+    """
+    supported = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, deflate, br", supported) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert negotiate("*, zstd;q=0", supported) == "br"
+    assert negotiate("identity", supported) is None
+    assert negotiate("", supported) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("thread_min_size", [1024 * 1024, 1])
+async def test_compression_middleware(thread_min_size):
+    """
+    Тест на сжатие ответов.
+    Проверяет, что большой ответ сжимается (в том числе в пуле потоков),
+    маленький передается как есть, а потоковый ответ сжимается по фрагментам,
+    каждый из которых распаковывается сразу после получения.
+    """
+    app = create_app(
+        min_size=1024,
+        thread_min_size=thread_min_size,
+        encodings={"gzip": lambda: GzipCompressor(6)},
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) < len(BODY) // 10
+        assert response.content == BODY
+
+        response = await client.get("/large", headers={"Accept-Encoding": "br"})
+        assert "Content-Encoding" not in response.headers
+        assert response.content == BODY
+
+        response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    # Потоковый ответ проверяется без клиента: ASGITransport собирает тело
+    # целиком, а нужно видеть каждое отправленное сообщение
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+        "server": ("test", 80),
+        "client": ("test", 1),
+        "http_version": "1.1",
+    }
+    await app(scope, receive, send)
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decompressor = zlib.decompressobj(31)
+    events = [decompressor.decompress(message["body"]) for message in messages[1:]]
+    assert events[:3] == [f"data: {number}\n\n".encode() for number in range(3)]
+    assert decompressor.eof
+
+
+@pytest.mark.asyncio
+async def test_compression_passes_start_before_other_messages():
+    """
+    Тест на сообщения ответа, отличные от тела.
+    Проверяет, что задержанное начало ответа отправляется раньше сообщения
+    другого типа (http.response.pathsend), а ответ не сжимается.
+    """
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.pathsend", "path": "/tmp/students.json"})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = CompressionMiddleware(
+        app, encodings={"gzip": lambda: GzipCompressor(6)}
+    )
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await middleware(scope, None, send)
+
+    assert [message["type"] for message in messages] == [
+        "http.response.start",
+        "http.response.pathsend",
+    ]
+    assert b"content-encoding" not in dict(messages[0]["headers"])
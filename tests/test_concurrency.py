@@ -0,0 +1,163 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import func, insert, select, text
+
+from src.database.config import settings
+from src.database.models import Base, Faculty, Student
+from src.database.repository import StudentRepository
+from src.database.service import make_engines
+from src.database.singleflight import SingleFlight
+from src.database.write_batcher import WriteBatcher
+from src.handlers.custom_exceptions import RowNotFoundException
+from src.schemas.student_schemas import BodyStudentSchema, ResponseStudentSchema
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result():
+    """
+    Тест на объединение одновременных одинаковых вызовов.
+    Проверяет, что работа выполняется один раз, а результат получают все вызовы.
+    """
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.run("key", work) for _ in range(10)))
+
+    assert results == [42] * 10
+    assert calls == 1
+    assert flight.shared == 9
+
+
+@pytest.mark.asyncio
+async def test_write_batcher_groups_creates(session_factory, create_faculty):
+    """
+    Тест на групповую запись добавлений студентов.
+    Проверяет, что одновременные добавления записываются одним пакетом,
+    а ошибка с несуществующим факультетом достается только своему вызову.
+    """
+    batcher: WriteBatcher[BodyStudentSchema, ResponseStudentSchema] = WriteBatcher(
+        StudentRepository._insert_students_batch, window_ms=50, max_size=10
+    )
+
+    async def create(faculty_id: int) -> ResponseStudentSchema:
+        student_data = BodyStudentSchema(
+            first_name="Иван",
+            last_name="Иванов",
+            date_of_birth=date(2000, 1, 1),
+            faculty_id=faculty_id,
+        )
+        async with session_factory() as session:
+            return await batcher.submit(
+                session,
+                student_data,
+                fallback=lambda: StudentRepository._insert_student(
+                    session, student_data
+                ),
+            )
+
+    faculty_ids = [create_faculty.id] * 4 + [9999]
+    results = await asyncio.gather(
+        *(create(faculty_id) for faculty_id in faculty_ids), return_exceptions=True
+    )
+
+    assert batcher.batches == 1
+    assert len({result.id for result in results[:4]}) == 4
+    assert isinstance(results[4], RowNotFoundException)
+
+
+@pytest.mark.asyncio
+async def test_write_batcher_skips_cancelled_follower():
+    """
+    Тест на отмену вызова во время записи пакета.
+    Проверяет, что отмененный вызов (например, по сроку выполнения) не мешает
+    раздаче результатов остальным вызовам пакета.
+    """
+    writing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def flush(session, items):
+        writing.set()
+        await release.wait()
+        return [item * 10 for item in items]
+
+    batcher: WriteBatcher[int, int] = WriteBatcher(flush, window_ms=50, max_size=10)
+
+    async def fallback() -> int:
+        raise AssertionError("ведущий вызов не отменялся")
+
+    calls = [
+        asyncio.create_task(batcher.submit(None, item, fallback)) for item in range(4)
+    ]
+    await writing.wait()
+    calls[1].cancel()
+    release.set()
+    async with asyncio.timeout(5):
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert [results[0], *results[2:]] == [0, 20, 30]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_writer_queue(tmp_path):
+    """
+    Тест на запись в SQLite через очередь движка записи.
+    Проверяет, что соединения настроены на WAL, а одновременные транзакции,
+    которые сначала читают, а затем пишут, не получают database is locked.
+    """
+    write_engine, read_engine = make_engines(
+        f"sqlite+aiosqlite:///{tmp_path / 'students.db'}"
+    )
+    async with write_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(Faculty).values(id=1, name="Физический"))
+
+    async def write(number: int) -> None:
+        async with write_engine.begin() as connection:
+            await connection.scalar(select(func.count()).select_from(Student))
+            await asyncio.sleep(0)
+            await connection.execute(
+                insert(Student).values(
+                    first_name=f"Иван{number}",
+                    last_name="Иванов",
+                    date_of_birth=date(2000, 1, 1),
+                    faculty_id=1,
+                )
+            )
+
+    async def read() -> int:
+        async with read_engine.connect() as connection:
+            return await connection.scalar(select(func.count()).select_from(Student))
+
+    await asyncio.gather(*(write(number) for number in range(20)), read(), read())
+
+    async with read_engine.connect() as connection:
+        assert await connection.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert await connection.scalar(text("PRAGMA foreign_keys")) == 1
+    assert await read() == 20
+    await write_engine.dispose()
+    await read_engine.dispose()
+
+
+def test_create_batching_defaults_to_sqlite(monkeypatch):
+    """
+    Тест на окно групповой записи добавлений по умолчанию.
+    Проверяет, что без явной настройки групповая запись включена для SQLite и
+    выключена для Postgres, а явное значение (в том числе 0) имеет приоритет.
+    """
+    monkeypatch.setattr(settings, "CREATE_BATCH_WINDOW_MS", None)
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    assert settings.create_batch_window_ms() == settings.SQLITE_CREATE_BATCH_WINDOW_MS
+    monkeypatch.setattr(settings, "CREATE_BATCH_WINDOW_MS", 0)
+    assert settings.create_batch_window_ms() == 0
+    monkeypatch.setattr(settings, "DB_BACKEND", "postgresql")
+    monkeypatch.setattr(settings, "CREATE_BATCH_WINDOW_MS", None)
+    assert settings.create_batch_window_ms() == 0
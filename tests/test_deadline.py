@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.database.deadline import deadline_scope, is_deadline_error
+from src.middleware.deadline import DeadlineMiddleware
+
+# Запрос, выполняющийся в SQLite несколько секунд
+SLOW_QUERY = text(
+    "WITH RECURSIVE numbers(n) AS "
+    "(SELECT 1 UNION ALL SELECT n + 1 FROM numbers WHERE n < 100000000) "
+    "SELECT SUM(n) FROM numbers"
+)
+
+
+@pytest.mark.asyncio
+async def test_deadline_interrupts_sqlite_query(session_factory):
+    """
+    Тест на прерывание запроса к БД по истечении срока.
+    Проверяет, что долгий запрос прерывается, а соединение остается рабочим.
+    """
+    async with session_factory() as session:
+        with deadline_scope(0.1):
+            with pytest.raises(OperationalError) as exc_info:
+                await session.execute(SLOW_QUERY)
+            assert is_deadline_error(exc_info.value)
+        await session.rollback()
+
+        assert await session.scalar(text("SELECT 1")) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_middleware_returns_504():
+    """
+    Тест на срок выполнения запроса из заголовка X-Request-Timeout-Ms.
+    Проверяет, что зависший обработчик отменяется и клиент получает 504.
+    """
+    app = FastAPI()
+    cancelled = asyncio.Event()
+
+    @app.get("/slow")
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    app.add_middleware(DeadlineMiddleware, read_ms=5000, max_ms=5000)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/slow", headers={"X-Request-Timeout-Ms": "50"})
+
+    assert response.status_code == 504
+    assert response.json()["timeout_ms"] == 50
+    assert cancelled.is_set()
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+
+from src.database.config import settings
+from src.database.models import Job, JobStatus, Student
+from src.handlers.custom_exceptions import JobClaimLostException
+from src.jobs.runner import job_runner
+from src.jobs.tasks import IMPORT_STUDENTS, import_students_chunk
+
+
+async def wait_for_job(client, job_id: int) -> dict:
+    """Ожидает завершения фоновой задачи и возвращает ее состояние."""
+    for _ in range(100):
+        response = await client.get(f"/api/v1/jobs/{job_id}")
+        job = response.json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("Фоновая задача не завершилась")
+
+
+@pytest.mark.asyncio
+async def test_import_and_delete_jobs(client, create_faculty):
+    """
+    Тест на фоновый импорт и фоновое удаление студентов.
+    Проверяет, что задачи принимаются с кодом 202 и выполняются до конца.
+    """
+    students = [
+        {
+            "first_name": f"Студент{index}",
+            "last_name": "Фоновый",
+            "date_of_birth": "2001-02-03",
+            "study_status": "graduated",
+            "faculty_id": create_faculty.id,
+        }
+        for index in range(5)
+    ]
+    response = await client.post(
+        "/api/v1/jobs/students/import", json={"students": students}
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = await wait_for_job(client, response.json()["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 5
+
+    response = await client.post(
+        "/api/v1/jobs/students/delete", json={"study_status": "graduated"}
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = await wait_for_job(client, response.json()["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_import_job_size_limit(client):
+    """
+    Тест на ограничение размера задачи импорта.
+    Проверяет, что импорт больше JOB_IMPORT_MAX_ITEMS студентов отклоняется
+    с кодом 422 без создания задачи.
+    """
+    student = {
+        "first_name": "Студент",
+        "last_name": "Фоновый",
+        "date_of_birth": "2001-02-03",
+    }
+    response = await client.post(
+        "/api/v1/jobs/students/import",
+        json={"students": [student] * (settings.JOB_IMPORT_MAX_ITEMS + 1)},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_get_nonexistent_job(client):
+    """
+    Тест на получение несуществующей задачи.
+    Ожидается ошибка 404.
+    """
+    response = await client.get("/api/v1/jobs/9999")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_archive_students_job(
+    client, create_faculty, create_student, create_expelled_student
+):
+    """
+    Тест на перенос отчисленных студентов в архив.
+    Проверяет, что архив не попадает в список по умолчанию, добавляется при
+    фильтре по архивному статусу, а смена статуса на active возвращает студента.
+    """
+    expelled_id = create_expelled_student.id
+    response = await client.post(
+        "/api/v1/jobs/students/archive", json={"older_than_days": 0}
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = await wait_for_job(client, response.json()["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 1
+
+    response = await client.get("/api/v1/students/")
+    ids = [student["id"] for student in response.json()["students"]]
+    assert create_student.id in ids
+    assert expelled_id not in ids
+
+    response = await client.get("/api/v1/students/?study_status=expelled")
+    assert response.json()["total"] == 1
+    assert response.json()["students"][0]["id"] == expelled_id
+
+    response = await client.get(f"/api/v1/students/{expelled_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["faculty_title"] == create_faculty.name
+
+    response = await client.patch(
+        f"/api/v1/students/{expelled_id}", json={"study_status": "active"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = await client.get("/api/v1/students/?study_status=active")
+    assert expelled_id in [student["id"] for student in response.json()["students"]]
+
+    response = await client.post(
+        "/api/v1/jobs/students/archive", json={"older_than_days": 0}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_cannot_commit_chunk(session_factory, create_faculty):
+    """
+    Тест на порцию задачи, которую перехватил другой процесс.
+    Проверяет, что процесс, потерявший задачу, не сохраняет ни порцию, ни
+    контрольную точку.
+    """
+    student = {
+        "first_name": "Студент",
+        "last_name": "Перехваченный",
+        "date_of_birth": "2001-02-03",
+        "faculty_id": create_faculty.id,
+    }
+    async with session_factory() as session:
+        job = Job(
+            kind=IMPORT_STUDENTS,
+            params={"students": [student]},
+            status=JobStatus.running,
+            worker_id="other-worker",
+        )
+        session.add(job)
+        await session.commit()
+        job_id = job.id
+
+    async with session_factory() as session:
+        job = await session.get(Job, job_id)
+        with pytest.raises(JobClaimLostException):
+            await import_students_chunk(session, job, job_runner.chunk_size)
+
+    async with session_factory() as session:
+        job = await session.get(Job, job_id)
+        assert job.checkpoint == 0
+        assert job.worker_id == "other-worker"
+        imported = await session.scalar(
+            select(func.count())
+            .select_from(Student)
+            .where(Student.last_name == "Перехваченный")
+        )
+        assert imported == 0
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from src.database.migration_helpers import (
+    LOCK_NOT_AVAILABLE,
+    backfill,
+    create_index_concurrently,
+    with_lock_retries,
+)
+
+
+class LockNotAvailable(Exception):
+    """Ошибка драйвера Postgres при истечении lock_timeout."""
+
+    pgcode = LOCK_NOT_AVAILABLE
+
+
+@pytest.fixture
+def migration_connection(tmp_path):
+    """Фикстура с соединением, в котором доступны операции Alembic."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.connect() as connection:
+        connection.execute(
+            text("CREATE TABLE items (id INTEGER PRIMARY KEY, a INT, b INT)")
+        )
+        connection.execute(
+            text("INSERT INTO items (id, a) VALUES (:id, :id)"),
+            [{"id": index} for index in range(1, 11)],
+        )
+        connection.commit()
+
+        context = MigrationContext.configure(
+            connection, opts={"transactional_ddl": True}
+        )
+        with Operations.context(context), context.begin_transaction():
+            yield connection
+    engine.dispose()
+
+
+def test_backfill_is_batched_and_resumable(migration_connection):
+    """
+    Тест на пакетное заполнение данных.
+    Проверяет, что заполняются все строки, а повторный запуск ничего не меняет.
+    """
+    migration_connection.execute(text("UPDATE items SET b = 0 WHERE id <= 3"))
+
+    updated = backfill("items", "b = a * 2", "b IS NULL", batch_size=3, pause_ms=0)
+
+    assert updated == 7
+    assert migration_connection.scalar(text("SELECT SUM(b) FROM items")) == 2 * (55 - 6)
+    assert backfill("items", "b = a * 2", "b IS NULL", batch_size=3, pause_ms=0) == 0
+
+    create_index_concurrently("ix_items_b", "items", ["b"])
+    indexes = inspect(migration_connection).get_indexes("items")
+    assert [index["name"] for index in indexes] == ["ix_items_b"]
+
+
+def test_with_lock_retries(migration_connection):
+    """
+    Тест на повтор операции при истечении lock_timeout.
+    Проверяет, что операция повторяется, а другие ошибки не перехватываются.
+    """
+    attempts = 0
+
+    def operation() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise DBAPIError("ALTER TABLE items", {}, LockNotAvailable())
+        return "done"
+
+    assert with_lock_retries(operation, attempts=3, backoff_ms=0) == "done"
+    assert attempts == 3
+
+    with pytest.raises(DBAPIError):
+        with_lock_retries(
+            lambda: migration_connection.execute(text("SELECT * FROM missing")),
+            attempts=3,
+            backoff_ms=0,
+        )
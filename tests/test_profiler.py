@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import status
+
+from src.admin.profiler import SamplingProfiler, profiler
+from src.database.config import settings
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+async def wait_finished(sampler: SamplingProfiler) -> None:
+    """Ожидает завершения сеанса профилирования."""
+    for _ in range(100):
+        if sampler.capture is None:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Сеанс профилирования не завершился")
+
+
+@pytest.mark.asyncio
+async def test_profiling_next_requests_of_route(
+    client, create_student, monkeypatch, tmp_path
+):
+    """
+    Тест на профилирование следующих запросов маршрута через API администратора.
+    Проверяет доступ по токену, учет только запросов выбранного маршрута и
+    запись результата в папку логов.
+    """
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(profiler, "output_dir", tmp_path)
+
+    response = await client.post("/api/v1/admin/profiling", json={"requests": 1})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = await client.post(
+        "/api/v1/admin/profiling",
+        json={"route": "GET /api/v1/students/missing"},
+        headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await client.post(
+        "/api/v1/admin/profiling",
+        json={"route": "GET /api/v1/students/", "requests": 2, "interval_ms": 1},
+        headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["active"] is True
+
+    await client.get(f"/api/v1/students/{create_student.id}")
+    for _ in range(3):
+        await client.get("/api/v1/students/")
+    await wait_finished(profiler)
+
+    response = await client.get("/api/v1/admin/profiling", headers=ADMIN_HEADERS)
+    data = response.json()
+    assert data["active"] is False
+    assert data["profiled_requests"] == 2
+    assert data["output"].startswith(str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_profiler_samples_only_profiled_task(tmp_path):
+    """
+    Тест на снятие стеков профилировщиком.
+    Проверяет, что стеки профилируемой задачи записываются в формате
+    collapsed stacks, а стеки других задач не учитываются.
+    """
+    sampler = SamplingProfiler(output_dir=tmp_path)
+
+    def busy_wait(seconds: float) -> None:
+        until = time.monotonic() + seconds
+        while time.monotonic() < until:
+            pass
+
+    async def profiled_request() -> None:
+        assert sampler.enter("GET /")
+        busy_wait(0.05)
+        sampler.leave()
+
+    async def other_request() -> None:
+        busy_wait(0.05)
+
+    sampler.start("GET /", requests=1, seconds=5, interval_ms=1)
+    await other_request()
+    await asyncio.create_task(profiled_request())
+    await wait_finished(sampler)
+
+    capture = sampler.last_capture
+    assert capture is not None and capture.output is not None
+    lines = capture.output.read_text().splitlines()
+    assert lines and capture.samples > 0
+    assert all("profiled_request" in line for line in lines)
+    assert all("other_request" not in line for line in lines)
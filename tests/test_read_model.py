@@ -0,0 +1,110 @@
+from datetime import date
+
+import pytest
+
+from src.database.change_feed import ChangeEvent, change_feed
+from src.database.read_model import StudentReadModel
+from src.database.repository import StudentRepository
+from src.schemas.student_schemas import (
+    BodyStudentSchema,
+    StudentStatusEnum,
+    UpdateStudentSchema,
+)
+
+FILTERS = [
+    {"page": 1, "limit": 10},
+    {"page": 2, "limit": 2},
+    {"page": 1, "limit": 10, "last_name": "Петров"},
+    {"page": 1, "limit": 10, "first_name": "Неизвестный"},
+    {"page": 1, "limit": 10, "study_status": StudentStatusEnum.expelled},
+    {"page": 1, "limit": 10, "date_of_birth": date(2001, 1, 1)},
+]
+
+
+@pytest.fixture
+def read_model(monkeypatch):
+    """Фикстура с хранилищем, подписанным на ленту изменений."""
+    model = StudentReadModel(capacity=2)
+    monkeypatch.setattr(change_feed, "_hooks", [model.apply])
+    return model
+
+
+async def assert_same_as_db(model: StudentReadModel, session, faculty_id: int):
+    """Проверяет, что хранилище отдает те же страницы, что и БД."""
+    for filters in FILTERS + [{"page": 1, "limit": 10, "faculty_id": faculty_id}]:
+        expected = await StudentRepository.get_students(session, filters)
+        assert model.get_students(filters) == expected, filters
+
+
+@pytest.mark.asyncio
+async def test_read_model_matches_database(db_session, create_faculty, read_model):
+    """
+    Тест на колоночное хранилище студентов.
+    Проверяет, что после загрузки и после изменений через репозиторий хранилище
+    отдает те же списки и количества, что и запросы к БД.
+    """
+    for index in range(5):
+        await StudentRepository.add_new_student(
+            db_session,
+            BodyStudentSchema(
+                first_name="Иван",
+                last_name="Петров" if index % 2 else "Иванов",
+                date_of_birth=date(2000 + index, 1, 1),
+                faculty_id=create_faculty.id,
+            ),
+        )
+    await read_model.load(db_session)
+    await assert_same_as_db(read_model, db_session, create_faculty.id)
+
+    created = await StudentRepository.add_new_student(
+        db_session,
+        BodyStudentSchema(
+            first_name="Мария",
+            last_name="Петрова",
+            date_of_birth=date(2002, 5, 5),
+            faculty_id=create_faculty.id,
+        ),
+    )
+    await StudentRepository.update_student(
+        db_session,
+        created.id,
+        UpdateStudentSchema(study_status=StudentStatusEnum.expelled),
+    )
+    page = await StudentRepository.get_students(db_session, {"page": 1, "limit": 1})
+    await StudentRepository.remove_student(db_session, page.students[0].id)
+
+    await assert_same_as_db(read_model, db_session, create_faculty.id)
+    assert read_model.nbytes() > 0
+
+
+def test_read_model_ignores_partial_update_of_deleted_student():
+    """
+    Тест на неполное событие об удаленном студенте.
+    Проверяет, что такое событие не восстанавливает студента и не сбивает счет
+    удаленных строк, поэтому список без фильтров не возвращает удаленного.
+    """
+    model = StudentReadModel(capacity=2)
+    model.extend(
+        {
+            "id": student_id,
+            "first_name": "Иван",
+            "last_name": "Иванов",
+            "date_of_birth": date(2000, 1, 1),
+            "study_status": StudentStatusEnum.active,
+            "faculty_id": None,
+        }
+        # Студентов достаточно, чтобы удаление не вызвало уплотнение
+        for student_id in range(1, 11)
+    )
+    model.apply(ChangeEvent(action="delete", student_id=1, data=None, origin=""))
+    model.apply(
+        ChangeEvent(
+            action="update", student_id=1, data={"first_name": "Петр"}, origin=""
+        )
+    )
+
+    assert len(model) == 9
+    page = model.get_students({"page": 1, "limit": 10})
+    assert page is not None
+    assert page.total == 9
+    assert [student.id for student in page.students] == list(range(2, 11))
@@ -0,0 +1,28 @@
+import pytest
+
+from src.database.repository import StudentRepository
+from src.database.statement_cache import statement_cache
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_reuses_queries(db_session, create_student):
+    """
+    Тест на повторное использование запросов из кэша.
+    Проверяет, что для одинакового набора фильтров запрос строится один раз,
+    а значения фильтров передаются как параметры.
+    """
+    statement_cache.clear()
+
+    first = await StudentRepository.get_students(
+        db_session, {"first_name": "Иван", "page": 1, "limit": 10}
+    )
+    misses = statement_cache.misses
+
+    second = await StudentRepository.get_students(
+        db_session, {"first_name": "Несуществующий", "page": 1, "limit": 10}
+    )
+
+    assert first.total > 0
+    assert second.total == 0
+    assert statement_cache.misses == misses
+    assert statement_cache.stats()["hits"] >= 2
@@ -0,0 +1,87 @@
+import sqlite3
+from datetime import date
+
+from sqlalchemy.engine import make_url
+
+from src.seed import Seeder, SeedPlan, generate_chunk, main
+
+
+def test_generate_chunk_is_deterministic():
+    """
+    Тест на детерминированность генератора.
+    Проверяет, что порция зависит только от seed и номера порции.
+    """
+    plan = SeedPlan(
+        seed=7,
+        students=2000,
+        chunk_size=1000,
+        first_id=1,
+        faculty_ids=(1, 2, 3),
+        zipf_exponent=1.1,
+        reference_date=date(2026, 9, 1),
+    )
+
+    assert generate_chunk(plan, 1) == generate_chunk(plan, 1)
+    assert generate_chunk(plan, 0) != generate_chunk(plan, 1)
+    assert generate_chunk(plan, 1)[0][0] == 1001
+
+
+def test_seed_sqlite(tmp_path):
+    """
+    Тест на заполнение SQLite синтетическими данными в несколько процессов.
+    Проверяет количество студентов и неравномерность размеров факультетов.
+    """
+    db_path = tmp_path / "seed.db"
+    main(
+        [
+            "--database-url",
+            f"sqlite:///{db_path}",
+            "--create-schema",
+            "--students",
+            "3000",
+            "--faculties",
+            "5",
+            "--chunk-size",
+            "1000",
+            "--workers",
+            "2",
+        ]
+    )
+
+    connection = sqlite3.connect(db_path)
+    sizes = [
+        count
+        for (count,) in connection.execute(
+            "SELECT COUNT(*) FROM students WHERE faculty_id IS NOT NULL "
+            "GROUP BY faculty_id ORDER BY COUNT(*) DESC"
+        )
+    ]
+    total = connection.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+    connection.close()
+
+    assert total == 3000
+    assert sizes[0] > 2 * sizes[-1]
+
+
+def test_seed_skips_archived_ids(tmp_path):
+    """
+    Тест на выбор первого ID студента при заполнении.
+    Проверяет, что ID студентов архива не выдаются повторно, а --truncate
+    удаляет и архив.
+    """
+    db_path = tmp_path / "seed.db"
+    seeder = Seeder(make_url(f"sqlite:///{db_path}"))
+    seeder.create_schema()
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "INSERT INTO students_archive (id, first_name, last_name, date_of_birth, "
+        "study_status, updated_at, archived_at) VALUES (100, 'Иван', 'Иванов', "
+        "'2000-01-01', 'GRADUATED', '2026-01-01', '2026-01-01')"
+    )
+    connection.commit()
+
+    assert seeder.prepare(2, 42, truncate=False)[1] == 101
+    assert seeder.prepare(2, 42, truncate=True)[1] == 1
+    archived = connection.execute("SELECT COUNT(*) FROM students_archive").fetchone()
+    connection.close()
+    assert archived[0] == 0
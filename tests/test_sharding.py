@@ -0,0 +1,233 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from src.database import sharding
+from src.database.change_feed import change_feed
+from src.database.config import settings
+from src.database.models import Base, Faculty, Student
+from src.database.repository import StudentRepository
+from src.database.sharding import ShardedStudentRepository, ShardRouter
+from src.schemas.student_schemas import BodyStudentSchema, UpdateStudentSchema
+
+
+@pytest.fixture
+async def shard_router(tmp_path):
+    """Фикстура с тремя шардами SQLite и одинаковым справочником факультетов."""
+    router = ShardRouter.from_urls(
+        [f"sqlite+aiosqlite:///{tmp_path / f'shard_{index}.db'}" for index in range(3)],
+        faculty_shards={1: 0, 2: 1, 3: 2},
+    )
+    for shard in range(router.count):
+        async with router.engine(shard).begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with router.session(shard) as session:
+            session.add_all(
+                Faculty(id=index, name=f"Факультет {index}") for index in (1, 2, 3)
+            )
+            await session.commit()
+    yield router
+    await router.dispose()
+
+
+async def shard_sizes(router: ShardRouter) -> list:
+    """Количество студентов в каждом шарде."""
+    sizes = []
+    for shard in range(router.count):
+        async with router.session(shard) as session:
+            sizes.append(
+                await session.scalar(select(func.count()).select_from(Student))
+            )
+    return sizes
+
+
+@pytest.mark.asyncio
+async def test_sharded_students(shard_router):
+    """
+    Тест на шардирование студентов по факультетам.
+    Проверяет размещение студентов, уникальность ID, сбор списка со всех шардов
+    с общим порядком и количеством, перенос при смене факультета и удаление.
+    """
+    created = []
+    for index in range(9):
+        student_data = BodyStudentSchema(
+            first_name="Иван",
+            last_name=f"Иванов{index}",
+            date_of_birth=date(2000, 1, 1),
+            faculty_id=index % 3 + 1,
+        )
+        created.append(
+            await ShardedStudentRepository.add_new_student(shard_router, student_data)
+        )
+
+    assert await shard_sizes(shard_router) == [3, 3, 3]
+    assert len({student.id for student in created}) == 9
+
+    page = await ShardedStudentRepository.get_students(
+        shard_router, {"page": 2, "limit": 4}
+    )
+    all_ids = sorted(student.id for student in created)
+    assert page.total == 9
+    assert [student.id for student in page.students] == all_ids[4:8]
+
+    faculty_page = await ShardedStudentRepository.get_students(
+        shard_router, {"page": 1, "limit": 10, "faculty_id": 2}
+    )
+    assert faculty_page.total == 3
+
+    moved = await ShardedStudentRepository.update_student(
+        shard_router, created[0].id, UpdateStudentSchema(faculty_id=3)
+    )
+    assert moved.id == created[0].id
+    assert await shard_router.locate(created[0].id) == 2
+    assert await shard_sizes(shard_router) == [2, 3, 4]
+
+    await ShardedStudentRepository.remove_student(shard_router, created[0].id)
+    response = await ShardedStudentRepository.remove_students_with_params(
+        shard_router, {"faculty_id": 2}
+    )
+    assert response.message == "Удалено 3 студентов!"
+    page = await ShardedStudentRepository.get_students(
+        shard_router, {"page": 1, "limit": 10}
+    )
+    assert page.total == 5
+
+
+@pytest.mark.asyncio
+async def test_shard_move_recovers_failed_delete(shard_router, monkeypatch):
+    """
+    Тест на перенос студента между шардами при ошибках удаления.
+    Проверяет повтор удаления из прежнего шарда, ошибку после всех попыток
+    (студент остается в обоих шардах) и завершение переноса повтором запроса.
+    """
+    monkeypatch.setattr(settings, "SHARD_MOVE_DELETE_BACKOFF_MS", 0)
+    student = await ShardedStudentRepository.add_new_student(
+        shard_router,
+        BodyStudentSchema(
+            first_name="Иван",
+            last_name="Иванов",
+            date_of_birth=date(2000, 1, 1),
+            faculty_id=1,
+        ),
+    )
+    remove_moved_student = StudentRepository.remove_moved_student
+    failures = {"left": 1}
+
+    async def flaky_remove(session, student_id):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise OperationalError("DELETE", {}, Exception("connection lost"))
+        return await remove_moved_student(session, student_id)
+
+    monkeypatch.setattr(StudentRepository, "remove_moved_student", flaky_remove)
+    await ShardedStudentRepository.update_student(
+        shard_router, student.id, UpdateStudentSchema(faculty_id=2)
+    )
+    assert await shard_sizes(shard_router) == [0, 1, 0]
+
+    failures["left"] = settings.SHARD_MOVE_DELETE_RETRIES
+    with pytest.raises(OperationalError):
+        await ShardedStudentRepository.update_student(
+            shard_router, student.id, UpdateStudentSchema(faculty_id=3)
+        )
+    assert await shard_sizes(shard_router) == [0, 1, 1]
+
+    updated = await ShardedStudentRepository.update_student(
+        shard_router,
+        student.id,
+        UpdateStudentSchema(faculty_id=3, first_name="Петр"),
+    )
+    assert updated.first_name == "Петр"
+    assert await shard_sizes(shard_router) == [0, 0, 1]
+    assert await shard_router.locate(student.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_shard_events_delivered_without_shard_listener(shard_router, monkeypatch):
+    """
+    Тест на доставку событий шарда, который не слушается через LISTEN.
+    Проверяет, что событие commit в шарде раздается подписчикам процесса,
+    даже если лента изменений слушает другую БД.
+    """
+    monkeypatch.setitem(
+        change_feed._listen_connections, "postgresql+asyncpg://main/students", None
+    )
+    assert change_feed.listening
+    subscription = change_feed.subscribe()
+    student = await ShardedStudentRepository.add_new_student(
+        shard_router,
+        BodyStudentSchema(
+            first_name="Иван",
+            last_name="Иванов",
+            date_of_birth=date(2000, 1, 1),
+            faculty_id=2,
+        ),
+    )
+    event = await subscription.get(timeout=1)
+    change_feed.unsubscribe(subscription)
+    assert event is not None
+    assert (event.action, event.student_id) == ("create", student.id)
+
+
+@pytest.mark.asyncio
+async def test_sharded_concurrent_creates(shard_router):
+    """
+    Тест на одновременное добавление студентов в один шард SQLite.
+    Проверяет, что все добавления успешны и получают разные ID своего шарда.
+    """
+    created = await asyncio.gather(
+        *(
+            ShardedStudentRepository.add_new_student(
+                shard_router,
+                BodyStudentSchema(
+                    first_name="Иван",
+                    last_name=f"Иванов{index}",
+                    date_of_birth=date(2000, 1, 1),
+                    faculty_id=2,
+                ),
+            )
+            for index in range(20)
+        )
+    )
+
+    ids = {student.id for student in created}
+    assert len(ids) == 20
+    assert {shard_router.home_shard(student_id) for student_id in ids} == {1}
+    assert await shard_sizes(shard_router) == [0, 20, 0]
+
+
+@pytest.mark.asyncio
+async def test_primary_only_routes_rejected_when_sharded(client, monkeypatch):
+    """
+    Тест на маршруты, работающие только с основной базой данных.
+    Проверяет, что при шардировании фоновые задачи и синхронизация отвечают
+    501, а не выполняются над пустой основной базой.
+    """
+    monkeypatch.setattr(sharding.shard_router, "session_factories", [object()])
+    requests = [
+        ("/api/v1/jobs/students/delete", {"study_status": "graduated"}),
+        ("/api/v1/jobs/students/change-status", {"new_status": "expelled"}),
+        (
+            "/api/v1/jobs/students/import",
+            {
+                "students": [
+                    {
+                        "first_name": "Иван",
+                        "last_name": "Иванов",
+                        "date_of_birth": "2000-01-01",
+                    }
+                ]
+            },
+        ),
+        ("/api/v1/jobs/students/archive", {}),
+    ]
+    for url, body in requests:
+        response = await client.post(url, json=body)
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED, url
+
+    response = await client.get("/api/v1/students/changes")
+    assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
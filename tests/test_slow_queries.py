@@ -0,0 +1,64 @@
+import pytest
+from fastapi import status
+
+from src.database.config import settings
+from src.database.repository import StudentRepository
+from src.database.slow_queries import normalize_sql, slow_query_log
+
+
+@pytest.fixture
+def record_all_queries(monkeypatch):
+    """Фикстура, записывающая в журнал все запросы."""
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+def test_normalize_sql():
+    """
+    Тест на нормализацию текста запроса.
+    Проверяет, что запросы с разными значениями и количеством параметров
+    получают одинаковый текст.
+    """
+    assert normalize_sql(
+        "SELECT * FROM students\n WHERE id IN ($1, $2, $3) AND name = 'Иван' LIMIT 10"
+    ) == normalize_sql("SELECT * FROM students WHERE id IN (?, ?) AND name = ? LIMIT ?")
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log(
+    client, db_session, create_student, record_all_queries, monkeypatch
+):
+    """
+    Тест на журнал медленных запросов.
+    Проверяет отпечаток, метод репозитория, форму параметров, план EXPLAIN и
+    маршрут администратора со списком самых медленных запросов.
+    """
+    await StudentRepository.get_students(
+        db_session, {"page": 3, "limit": 5, "last_name": "Иванов"}
+    )
+
+    page_query = next(
+        query
+        for query in record_all_queries.top(100)
+        if "LIMIT" in query.sql and "students.last_name" in query.sql
+    )
+    assert page_query.origins == {
+        "src.database.repository.StudentRepository.get_students": 1
+    }
+    assert page_query.params["filter_last_name"] == "str"
+    assert page_query.params["offset"] == "int=10"
+    assert await record_all_queries.explain(page_query)
+
+    response = await client.get("/api/v1/admin/slow-queries")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    response = await client.get(
+        "/api/v1/admin/slow-queries",
+        params={"limit": 500},
+        headers={"X-Admin-Token": "secret"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert page_query.fingerprint in {query["fingerprint"] for query in response.json()}
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import status
+
+from src.database.change_feed import change_feed
+from src.database.models import Student, utc_now
+from src.database.repository import StudentRepository
+
+
+@pytest.mark.asyncio
+async def test_incremental_changes(client, create_student):
+    """
+    Тест на инкрементальную синхронизацию.
+    Проверяет, что после токена возвращаются только измененные и удаленные студенты.
+    """
+    response = await client.get("/api/v1/students/changes")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert create_student.id in [student["id"] for student in data["students"]]
+    token = data["next_token"]
+
+    response = await client.get("/api/v1/students/changes", params={"since": token})
+    assert response.json()["students"] == []
+
+    await client.patch(
+        f"/api/v1/students/{create_student.id}", json={"last_name": "Сидоров"}
+    )
+    response = await client.get("/api/v1/students/changes", params={"since": token})
+    data = response.json()
+    assert [student["last_name"] for student in data["students"]] == ["Сидоров"]
+    token = data["next_token"]
+
+    await client.delete(f"/api/v1/students/{create_student.id}")
+    response = await client.get("/api/v1/students/changes", params={"since": token})
+    data = response.json()
+    assert data["students"] == []
+    assert data["deleted"] == [create_student.id]
+
+
+@pytest.mark.asyncio
+async def test_invalid_sync_token(client):
+    """
+    Тест на некорректный токен синхронизации.
+    Ожидается ошибка 400.
+    """
+    response = await client.get("/api/v1/students/changes", params={"since": "мусор"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_late_commit_is_not_skipped(client, session_factory, create_student):
+    """
+    Тест на изменение, которое завершилось позже, чем началось.
+    Проверяет, что студент, измененный в транзакции, начатой до получения токена
+    (updated_at раньше позиции курсора), возвращается после ее commit.
+    """
+    response = await client.get("/api/v1/students/changes")
+    token = response.json()["next_token"]
+
+    async with session_factory() as session:
+        student = await session.get(Student, create_student.id)
+        student.last_name = "Долгов"
+        student.updated_at = utc_now() - timedelta(hours=1)
+        change_feed.stage(session, "update", student.id)
+        await StudentRepository._secure_commit(session)
+
+    response = await client.get("/api/v1/students/changes", params={"since": token})
+    assert [student["last_name"] for student in response.json()["students"]] == [
+        "Долгов"
+    ]